@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Local stand-in for the ATS and job APIs, for exercising the fetch scripts.
+
+Usage:
+    python3 bench/ats-stand-in.py --port 8000 --jobs 50 --latency 0.2 --fail-rate 0.1
+    python3 scripts/fetch-scans.py --base-url http://127.0.0.1:8000 --out-dir /tmp/scans \\
+        --api remotive:product,remoteok:design,themuse:0
+
+Answers the Greenhouse (board listings with and without content=true, and
+single jobs), Ashby, Lever, Workable, Remotive, RemoteOK, Jobicy,
+Himalayas and The Muse endpoints with seeded synthetic listings, over
+keep-alive HTTP/1.1. --latency delays every response and --fail-rate answers
+that share of requests with 503, to exercise retries. Responses carry an
+ETag and a Last-Modified date and answer matching If-None-Match or
+If-Modified-Since headers with 304, to exercise the response cache. Prints
+request, connection and 304 counts to stderr on exit.
+"""
+
+import argparse
+import json
+import random
+import re
+import signal
+import sys
+import threading
+import time
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+TITLES = ["Senior Product Designer", "Staff Software Engineer", "Data Scientist, Climate",
+          "Director of Product", "Machine Learning Engineer", "Engineering Manager, Payments",
+          "UX Researcher", "Product Manager, Health"]
+LOCATIONS = ["Remote", "New York, NY", "San Francisco, CA", "Remote, US", "London (Hybrid)"]
+
+
+def description(rng, paragraphs=4):
+    words = "we build product design data climate payments health platform teams customers".split()
+    return "".join(f"<p>{' '.join(rng.choice(words) for _ in range(30))}</p>" for _ in range(paragraphs))
+
+
+def listings(kind, key, count):
+    """Seeded synthetic listings shaped like each source's API response."""
+    rng = random.Random(f"{kind}:{key}")
+    jobs = []
+    for i in range(count):
+        title, location = rng.choice(TITLES), rng.choice(LOCATIONS)
+        ident = f"{key}-{i}"
+        if kind == "greenhouse":
+            jobs.append({"id": zlib.crc32(ident.encode()), "title": title, "location": {"name": location},
+                         "departments": [{"name": "Design"}], "updated_at": "2026-10-01T00:00:00Z",
+                         "content": description(rng), "absolute_url": f"https://boards.example/{ident}"})
+        elif kind == "ashby":
+            jobs.append({"id": ident, "title": title, "location": location, "isRemote": "Remote" in location,
+                         "department": "Product", "publishedAt": "2026-10-01T00:00:00Z",
+                         "descriptionHtml": description(rng), "jobUrl": f"https://jobs.example/{ident}"})
+        elif kind == "lever":
+            jobs.append({"id": ident, "text": title, "categories": {"location": location, "team": "Design"},
+                         "createdAt": 1790000000000, "description": description(rng),
+                         "lists": [{"text": "Requirements", "content": "<li>Figma</li>"}],
+                         "hostedUrl": f"https://jobs.example/{ident}"})
+        elif kind == "themuse":
+            jobs.append({"id": i, "name": title, "company": {"name": key}, "locations": [{"name": location}],
+                         "levels": [{"name": "Senior Level"}], "publication_date": "2026-10-01T00:00:00Z",
+                         "contents": description(rng), "refs": {"landing_page": f"https://muse.example/{ident}"}})
+        else:
+            jobs.append({"id": ident, "title": title, "position": title, "company_name": f"Co {i}",
+                         "company": f"Co {i}", "candidate_required_location": location, "location": location,
+                         "publication_date": "2026-10-01", "date": "2026-10-01", "description": description(rng),
+                         "url": f"https://api.example/{ident}"})
+    return jobs
+
+
+def greenhouse_board(slug, query, count):
+    """A Greenhouse board listing; content and departments only with content=true."""
+    jobs = listings("greenhouse", slug, count)
+    if query.get("content") != "true":
+        jobs = [{k: v for k, v in job.items() if k not in ("content", "departments")} for job in jobs]
+    return {"jobs": jobs, "meta": {"total": len(jobs)}}
+
+
+@lru_cache(maxsize=64)
+def greenhouse_jobs_by_id(slug, count):
+    return {str(job["id"]): json.dumps(job) for job in listings("greenhouse", slug, count)}
+
+
+def greenhouse_job(slug, job_id, count):
+    """One Greenhouse job with its content, or None if the board has no such id."""
+    job = greenhouse_jobs_by_id(slug, count).get(job_id)
+    return json.loads(job) if job is not None else None
+
+
+def payload(path, query, count):
+    """Return the JSON body for an API path, or None for unknown paths."""
+    routes = [
+        (r"/v1/boards/([^/]+)/jobs", lambda m: greenhouse_board(m[1], query, count)),
+        (r"/v1/boards/([^/]+)/jobs/([^/]+)", lambda m: greenhouse_job(m[1], m[2], count)),
+        (r"/posting-api/job-board/([^/]+)", lambda m: {"jobs": listings("ashby", m[1], count)}),
+        (r"/v0/postings/([^/]+)", lambda m: listings("lever", m[1], count)),
+        (r"/api/v1/widget/accounts/([^/]+)", lambda m: {"jobs": listings("workable", m[1], count)}),
+        (r"/api/remote-jobs", lambda m: {"jobs": listings("remotive", query.get("category", ""), count)}),
+        (r"/api", lambda m: [{"legal": "metadata"}] + listings("remoteok", query.get("tag", ""), count)),
+        (r"/api/v2/remote-jobs", lambda m: {"jobs": listings("jobicy", query.get("tag", ""), count)}),
+        (r"/jobs/api", lambda m: {"jobs": listings("himalayas", "all", count)}),
+        (r"/api/public/jobs", lambda m: {"results": listings("themuse", query.get("page", "0"), count)}),
+    ]
+    for pattern, build in routes:
+        match = re.fullmatch(pattern, path)
+        if match:
+            return build(match)
+    return None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    stats = {"requests": 0, "connections": 0, "failures": 0, "not_modified": 0}
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            self.stats["connections"] += 1
+
+    def respond(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        with self.lock:
+            self.stats["requests"] += 1
+            fail = server.rng.random() < server.fail_rate
+            if fail:
+                self.stats["failures"] += 1
+        time.sleep(server.latency)
+        data = None if fail else payload(parts.path, query, server.jobs)
+        status = 503 if fail else 200 if data is not None else 404
+        body = json.dumps(data if data is not None else {"error": "not found"}).encode()
+        etag = f'"{zlib.crc32(body):08x}"'
+        if status == 200 and self.not_modified(etag):
+            with self.lock:
+                self.stats["not_modified"] += 1
+            status, body = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status in (200, 304):
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", formatdate(server.started, usegmt=True))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def not_modified(self, etag):
+        """Whether the request's validators match the response about to be sent."""
+        if self.headers.get("If-None-Match") is not None:
+            return etag in [tag.strip() for tag in self.headers["If-None-Match"].split(",")]
+        since = self.headers.get("If-Modified-Since")
+        if since:
+            try:
+                return parsedate_to_datetime(since).timestamp() >= int(self.server.started)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    do_GET = respond
+    do_POST = respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic ATS/API responses locally")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--jobs", type=int, default=50, help="Listings per response")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StandInHandler)
+    server.daemon_threads = True
+    server.jobs, server.latency, server.fail_rate = args.jobs, args.latency, args.fail_rate
+    server.rng = random.Random(args.seed)
+    server.started = time.time()
+    print(f"Serving on http://127.0.0.1:{args.port}", file=sys.stderr)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Stand-in stats: {json.dumps(StandInHandler.stats)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Check the memoized title/company classifiers against the originals and time both.
+
+Usage:
+    python3 bench/bench-classifiers.py
+    python3 bench/bench-classifiers.py --calls 500000 --distinct 2000
+    python3 bench/bench-classifiers.py --input data/merged-results.json
+
+Runs infer_seniority() and infer_work_mode() from normalize-jobs.py and
+normalize_title() and normalize_company() from deduplicate-jobs.py over a
+stream of titles, locations and company names drawn from a pool of
+--distinct values (or the values in --input, in order), plus random strings
+built from the words the classifiers look for. Reports the legacy
+any()/re.sub versions, the new ones with an empty cache, and the new ones
+again with the cache warm. Exits non-zero if any result differs.
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from payloads import LEVELS, LOCATIONS, ROLES, TEAMS, company_name, variant
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+from loader import load_script  # noqa: E402
+
+normalize_jobs = load_script("normalize-jobs")
+deduplicate_jobs = load_script("deduplicate-jobs")
+
+FRAGMENTS = ["chief", "cto", "ceo", "cfo", "coo", "c-suite", "vp ", "vice president", "director",
+             "head of", "head,", "principal", "senior", "sr.", "sr ", "lead", "staff", "manager",
+             "junior", "jr.", "jr ", "entry", "associate", "intern", "graduate", "remote", "hybrid",
+             "onsite", "office", "full-time", "part time", "contract", "(", ")", " inc", " inc.",
+             " llc", " ltd.", " gmbh", " corp", " corporation", " limited", " co.", "&", ",", "-",
+             "  ", "\t", "Design", "REMOTE", "Café", "DirectOR", "x"]
+
+
+def legacy_infer_seniority(title):
+    title_lower = (title or "").lower()
+    if any(w in title_lower for w in ["chief", "cto", "ceo", "cfo", "coo", "c-suite", "vp ", "vice president"]):
+        return "executive"
+    if any(w in title_lower for w in ["director", "head of", "head,", "principal"]):
+        return "director"
+    if any(w in title_lower for w in ["senior", "sr.", "sr ", "lead", "staff", "manager"]):
+        return "senior"
+    if any(w in title_lower for w in ["junior", "jr.", "jr ", "entry", "associate", "intern", "graduate"]):
+        return "junior"
+    return "mid"
+
+
+def legacy_infer_work_mode(location_str, remote_flag=None):
+    if remote_flag is True:
+        return "remote"
+    loc = (location_str or "").lower()
+    if "remote" in loc and ("hybrid" in loc or "onsite" in loc or "office" in loc):
+        return "hybrid"
+    if "remote" in loc:
+        return "remote"
+    if "hybrid" in loc:
+        return "hybrid"
+    return "onsite"
+
+
+def legacy_normalize_company(name):
+    name = (name or "").lower().strip()
+    for suffix in [" inc", " inc.", " llc", " ltd", " ltd.", " gmbh", " pty", " co.", " corp", " corporation", " limited"]:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    name = re.sub(r'[^a-z0-9\s]', '', name)
+    return name.strip()
+
+
+def legacy_normalize_title(title):
+    title = (title or "").lower().strip()
+    title = re.sub(r'\([^)]*\)', '', title)
+    title = re.sub(r'\b(remote|hybrid|onsite|full.?time|part.?time|contract)\b', '', title)
+    title = re.sub(r'\s+', ' ', title).strip()
+    return title
+
+
+CHECKS = [
+    ("infer_seniority", "titles", legacy_infer_seniority, normalize_jobs.infer_seniority,
+     [normalize_jobs.infer_seniority]),
+    ("infer_work_mode", "locations", legacy_infer_work_mode, normalize_jobs.infer_work_mode,
+     [normalize_jobs.location_work_mode]),
+    ("normalize_title", "titles", legacy_normalize_title, deduplicate_jobs.normalize_title,
+     [deduplicate_jobs.normalize_title]),
+    ("normalize_company", "companies", legacy_normalize_company, deduplicate_jobs.normalize_company,
+     [deduplicate_jobs.normalize_company]),
+]
+
+
+def synthetic_values(calls, distinct, seed):
+    """Titles, locations and companies: calls draws from distinct values each."""
+    rng = random.Random(seed)
+    titles = [variant(f"{rng.choice(LEVELS)}{rng.choice(ROLES)}{rng.choice(TEAMS)}", rng)
+              for _ in range(distinct)]
+    locations = [rng.choice(LOCATIONS) + rng.choice(["", " (Office)", " / Remote", ", Onsite"])
+                 for _ in range(distinct)]
+    companies = [company_name(i) for i in range(distinct)]
+    return {name: [rng.choice(pool) for _ in range(calls)]
+            for name, pool in (("titles", titles), ("locations", locations), ("companies", companies))}
+
+
+def input_values(path):
+    """Titles, locations and companies of a normalized job list, in order."""
+    with open(path) as fh:
+        jobs = [job for job in json.load(fh) if isinstance(job, dict)]
+    return {
+        "titles": [job.get("title") or "" for job in jobs],
+        "locations": [job.get("location") or "" for job in jobs],
+        "companies": [job.get("company") or "" for job in jobs],
+    }
+
+
+def fuzz_values(count, seed):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 6))) for _ in range(count)]
+
+
+def timed(function, values):
+    start = time.perf_counter()
+    results = [function(value) for value in values]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the memoized classifiers with the originals")
+    parser.add_argument("--input", default="", help="Normalized job list JSON (default: synthetic)")
+    parser.add_argument("--calls", type=int, default=200000, help="Synthetic calls per function")
+    parser.add_argument("--distinct", type=int, default=5000, help="Distinct synthetic values per kind")
+    parser.add_argument("--fuzz", type=int, default=20000, help="Random strings to check")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    values = input_values(args.input) if args.input else synthetic_values(args.calls, args.distinct, args.seed)
+    fuzz = fuzz_values(args.fuzz, args.seed)
+
+    failed = False
+    for name, kind, legacy, current, caches in CHECKS:
+        sample = values[kind]
+        expected, legacy_time = timed(legacy, sample)
+        for cache in caches:
+            cache.cache_clear()
+        results, cold_time = timed(current, sample)
+        _, warm_time = timed(current, sample)
+        fuzz_differ = [value for value in fuzz if legacy(value) != current(value)]
+        differ = sum(1 for x, y in zip(expected, results) if x != y) + len(fuzz_differ)
+        print(f"{name}: {len(sample)} calls, {len(set(sample))} distinct, legacy {legacy_time:.3f}s, "
+              f"cold {cold_time:.3f}s ({legacy_time / cold_time if cold_time else 0:.1f}x), "
+              f"warm {warm_time:.3f}s ({legacy_time / warm_time if warm_time else 0:.1f}x), "
+              f"{differ} results differ")
+        for value in fuzz_differ[:5]:
+            print(f"  differs: {value!r}")
+        failed = failed or bool(differ)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
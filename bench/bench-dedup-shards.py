@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Check deduplicate-jobs.py --workers against the single-process dedup and time both.
+
+Usage:
+    python3 bench/bench-dedup-shards.py
+    python3 bench/bench-dedup-shards.py --jobs 20000 --workers 2,4 --metric ratio,jaccard
+    python3 bench/bench-dedup-shards.py --input data/merged-results.json
+
+Builds jobs (from --input, or seeded synthetic ones) in which some company
+names carry a typo in their first characters ("Harbor" / "Hrabor"), so their
+coarse shard keys differ while the names still fuzzy-match, and some
+descriptions are reposted under another company. For each metric, with and
+without --simhash, it runs deduplicate() and deduplicate_sharded() and
+compares the ranked output. It also runs the sharded dedup without the
+shard_groups() reconciliation, to show that the inputs do straddle shard
+boundaries. Exits non-zero if a reconciled run differs.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from payloads import LEVELS, ROLES, SOURCES, TEAMS, WORDS, company_name, variant
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+from loader import load_script  # noqa: E402
+from simhash import simhash_hex  # noqa: E402
+
+deduplicate_jobs = load_script("deduplicate-jobs")
+
+
+class Counts(dict):
+    """The count() half of RunStats, for reading the dedup counters."""
+
+    def count(self, key, n=1):
+        self[key] = self.get(key, 0) + n
+
+
+def typo(name, rng):
+    """Swap two of the first four characters, keeping the name a fuzzy match."""
+    i = rng.randrange(min(3, len(name) - 1))
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def synthetic_jobs(count, companies, typo_rate, repost_rate, seed):
+    rng = random.Random(seed)
+    descriptions = []
+    jobs = []
+    for n in range(count):
+        company = company_name(rng.randrange(companies))
+        if rng.random() < typo_rate:
+            company = typo(company, rng)
+        if descriptions and rng.random() < repost_rate:
+            description = rng.choice(descriptions)
+        else:
+            description = " ".join(rng.choice(WORDS) for _ in range(60))
+            descriptions.append(description)
+        source = rng.choice(SOURCES)
+        jobs.append({
+            "id": f"{source}-{n}",
+            "source": "rss" if source == "atom" else source,
+            "company": company,
+            "title": variant(f"{rng.choice(LEVELS)}{rng.choice(ROLES)}{rng.choice(TEAMS)}", rng),
+            "description_text": description,
+            "description_simhash": simhash_hex(description),
+            "url": f"https://jobs.example/{n}",
+            "tags": [rng.choice(WORDS)],
+            "preliminary_relevance_score": rng.randrange(0, 100, 5),
+        })
+    return jobs
+
+
+def without_reconciliation(companies, fingerprints=None, metric="ratio", max_distance=None):
+    """shard_groups() minus the joins: every coarse key is its own group."""
+    return {company: deduplicate_jobs.coarse_key(company) for company in set(companies)}, 0
+
+
+def run(text, workers, metric, max_distance):
+    """Ranked dedup output as JSON, with seconds and counters; jobs parsed afresh each run."""
+    jobs = json.loads(text)
+    counts = Counts()
+    start = time.perf_counter()
+    if workers > 1:
+        unique, _, sizes = deduplicate_jobs.deduplicate_sharded(jobs, workers, metric, counts, max_distance)
+        counts["shard_sizes"] = sizes
+    else:
+        unique, _ = deduplicate_jobs.deduplicate(jobs, metric, counts, max_distance)
+    seconds = time.perf_counter() - start
+    return json.dumps(deduplicate_jobs.ranked(unique), default=str), seconds, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sharded dedup with the single-process dedup")
+    parser.add_argument("--input", default="", help="Normalized job list JSON (default: synthetic)")
+    parser.add_argument("--jobs", type=int, default=5000, help="Synthetic jobs")
+    parser.add_argument("--companies", type=int, default=400, help="Distinct synthetic companies")
+    parser.add_argument("--typo-rate", type=float, default=0.1, help="Share of company names with a typo")
+    parser.add_argument("--repost-rate", type=float, default=0.05,
+                        help="Share of descriptions reused from an earlier job")
+    parser.add_argument("--workers", default="2,4", help="Comma-separated worker counts")
+    parser.add_argument("--metric", default="ratio", help="Comma-separated metrics")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input) as fh:
+            jobs = json.load(fh)
+    else:
+        jobs = synthetic_jobs(args.jobs, args.companies, args.typo_rate, args.repost_rate, args.seed)
+    text = json.dumps(jobs)
+    workers = [int(w) for w in args.workers.split(",") if w.strip()]
+
+    failed = False
+    for metric in args.metric.split(","):
+        for max_distance in (None, 3):
+            label = f"{metric}{' --simhash' if max_distance is not None else ''}"
+            expected, seconds, counts = run(text, 1, metric, max_distance)
+            print(f"{label}: {len(jobs)} jobs, {len(json.loads(expected))} unique, "
+                  f"1 process {seconds:.3f}s, {counts.get('comparisons', 0)} comparisons")
+            for n in workers:
+                result, sharded_seconds, counts = run(text, n, metric, max_distance)
+                original = deduplicate_jobs.shard_groups
+                deduplicate_jobs.shard_groups = without_reconciliation
+                try:
+                    unreconciled, _, _ = run(text, n, metric, max_distance)
+                finally:
+                    deduplicate_jobs.shard_groups = original
+                same = result == expected
+                print(f"  --workers {n}: {sharded_seconds:.3f}s "
+                      f"({seconds / sharded_seconds if sharded_seconds else 0:.2f}x), "
+                      f"shards {counts['shard_sizes']}, {counts.get('shard_joins', 0)} coarse keys joined, "
+                      f"{'same output' if same else 'OUTPUT DIFFERS'}; "
+                      f"without joins {'same' if unreconciled == expected else 'differs'}")
+                failed = failed or not same
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
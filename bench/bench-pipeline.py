@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Time each pipeline stage on synthetic payloads and check for regressions.
+
+Usage:
+    python3 bench/bench-pipeline.py
+    python3 bench/bench-pipeline.py --jobs 100000 --desc-length 4000 --dup-rate 0.2 \\
+        --sources greenhouse,remoteok,rss --save /tmp/bench.json
+    python3 bench/bench-pipeline.py --baseline bench/baseline.json
+
+Writes a seeded payload of --jobs listings per source (see payloads.py),
+then runs the real scripts on them as separate processes, the way the skill
+does: parse-rss.py for the XML feeds, normalize-jobs.py for every source,
+then filter-jobs.py and deduplicate-jobs.py over all normalized jobs. Each
+stage reports wall time, jobs in/out, jobs/sec and the peak RSS of its
+process. With --repeat N each stage runs N times and the fastest run counts,
+which keeps the short stages from flagging noise.
+
+--save writes the results as JSON. --baseline compares against saved
+results and exits non-zero if any stage's jobs/sec fell, or its peak RSS
+grew, by more than --tolerance. Results are only comparable for the same
+size options on the same machine; bench/baseline.json holds the default run.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from payloads import SOURCES, XML_SOURCES, ATS_SOURCES, Postings, board_company, write_payload
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+KEYWORDS = "product,design,data,engineer,climate,payments,figma"
+# Peak RSS differences below this are noise from allocator behaviour
+RSS_SLACK_MB = 5
+# Linux carries a parent's peak RSS over into a forked child's ru_maxrss, so
+# stages are started from this small launcher rather than from the bench
+# process, whose own memory grows with the payloads. It appends the child's
+# peak RSS (KB) to stderr.
+LAUNCHER = ("import os, subprocess, sys\n"
+            "proc = subprocess.Popen(sys.argv[1:])\n"
+            "_, status, usage = os.wait4(proc.pid, 0)\n"
+            "proc.returncode = os.waitstatus_to_exitcode(status)\n"
+            "sys.stderr.write(f'\\n{usage.ru_maxrss}\\n')\n"
+            "sys.exit(proc.returncode)\n")
+
+
+def run_stage(args, stdin_path, stdout_path, repeat=1):
+    """Run one script repeat times; return (best seconds, peak RSS in MB, stderr text)."""
+    runs = [run_once(args, stdin_path, stdout_path) for _ in range(repeat)]
+    return min(r[0] for r in runs), max(r[1] for r in runs), runs[-1][2]
+
+
+def run_once(args, stdin_path, stdout_path):
+    with open(stdin_path, "rb") as fin, open(stdout_path, "wb") as fout:
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", LAUNCHER, sys.executable, *args],
+                              stdin=fin, stdout=fout, stderr=subprocess.PIPE)
+        elapsed = time.perf_counter() - start
+    errors, _, maxrss = proc.stderr.decode(errors="replace").rstrip("\n").rpartition("\n")
+    if proc.returncode:
+        print(f"Error: {' '.join(args)} exited with {proc.returncode}:\n{errors}", file=sys.stderr)
+        sys.exit(1)
+    # ru_maxrss is in kilobytes on Linux
+    return elapsed, int(maxrss) / 1024, errors
+
+
+def count_jobs(path, fmt):
+    """Number of jobs in a JSON array or NDJSON file."""
+    with open(path) as fh:
+        if fmt == "ndjson":
+            return sum(1 for line in fh if line.strip())
+        return len(json.load(fh))
+
+
+def concat_jobs(paths, out_path, fmt):
+    """Combine job files into one, one input file in memory at a time."""
+    with open(out_path, "w") as out:
+        if fmt == "ndjson":
+            for path in paths:
+                with open(path) as fh:
+                    out.writelines(fh)
+            return
+        out.write("[")
+        first = True
+        for path in paths:
+            with open(path) as fh:
+                for job in json.load(fh):
+                    out.write(("" if first else ",\n") + json.dumps(job))
+                    first = False
+        out.write("]")
+
+
+def stage_result(seconds, jobs_in, jobs_out, peak_mb):
+    return {
+        "seconds": round(seconds, 3),
+        "jobs_in": jobs_in,
+        "jobs_out": jobs_out,
+        "jobs_per_sec": round(jobs_in / seconds, 1) if seconds else 0,
+        "peak_rss_mb": round(peak_mb, 1),
+    }
+
+
+def run_suite(args, work):
+    """Generate payloads, run every stage and return the stage results."""
+    sources = args.sources
+    postings = Postings(args.jobs * len(sources), args.dup_rate, args.seed)
+    stages = {}
+    normalized = []
+    fmt = ["--format", args.format]
+    for source in sources:
+        suffix = "xml" if source in XML_SOURCES else "json"
+        raw = work / f"{source}.{suffix}"
+        start = time.perf_counter()
+        write_payload(raw, source, args.jobs, args.desc_length, postings, args.seed)
+        print(f"Generated {source}: {args.jobs} listings, {raw.stat().st_size / 1e6:.1f} MB "
+              f"in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+        if source in XML_SOURCES:
+            items = work / f"{source}.items.json"
+            seconds, peak, _ = run_stage([str(SCRIPTS / "parse-rss.py")], raw, items, args.repeat)
+            stages[f"parse-rss:{source}"] = stage_result(seconds, args.jobs, args.jobs, peak)
+            raw, norm_source = items, "rss"
+        else:
+            norm_source = source
+        out = work / f"{source}.normalized.{args.format}"
+        cmd = [str(SCRIPTS / "normalize-jobs.py"), "--source", norm_source, *fmt]
+        if source in ATS_SOURCES:
+            cmd += ["--company", board_company(source)]
+        seconds, peak, _ = run_stage(cmd, raw, out, args.repeat)
+        stages[f"normalize:{source}"] = stage_result(seconds, args.jobs, count_jobs(out, args.format), peak)
+        normalized.append(out)
+
+    combined = work / f"combined.{args.format}"
+    concat_jobs(normalized, combined, args.format)
+    total = args.jobs * len(sources)
+    filtered = work / f"filtered.{args.format}"
+    seconds, peak, _ = run_stage([str(SCRIPTS / "filter-jobs.py"), "--keywords", args.keywords, *fmt],
+                                 combined, filtered, args.repeat)
+    kept = count_jobs(filtered, args.format)
+    stages["filter"] = stage_result(seconds, total, kept, peak)
+
+    deduped = work / f"deduped.{args.format}"
+    seconds, peak, _ = run_stage([str(SCRIPTS / "deduplicate-jobs.py"), *fmt], filtered, deduped,
+                                 args.repeat)
+    stages["dedup"] = stage_result(seconds, kept, count_jobs(deduped, args.format), peak)
+    return stages
+
+
+def compare(results, baseline, tolerance):
+    """Print stage-by-stage changes; return the list of regressions."""
+    if baseline.get("config") != results["config"]:
+        print(f"Warning: baseline config {baseline.get('config')} differs from this run; "
+              "numbers may not be comparable", file=sys.stderr)
+    regressions = []
+    for name, stage in results["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base:
+            continue
+        speed = stage["jobs_per_sec"] / base["jobs_per_sec"] if base["jobs_per_sec"] else 1
+        memory = stage["peak_rss_mb"] - base["peak_rss_mb"]
+        flags = []
+        if speed < 1 - tolerance:
+            flags.append("slower")
+        if memory > max(RSS_SLACK_MB, base["peak_rss_mb"] * tolerance):
+            flags.append("more memory")
+        print(f"  {name:22} {speed:6.2f}x jobs/sec  {memory:+8.1f} MB peak  {' '.join(flags)}")
+        if flags:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline scripts on synthetic payloads")
+    parser.add_argument("--jobs", type=int, default=1000, help="Listings per source")
+    parser.add_argument("--desc-length", type=int, default=2000, help="Description HTML length in characters")
+    parser.add_argument("--dup-rate", type=float, default=0.1, help="Share of listings repeating an earlier one")
+    parser.add_argument("--sources", default=",".join(SOURCES),
+                        help=f"Comma-separated sources (default: all of {', '.join(SOURCES)})")
+    parser.add_argument("--keywords", default=KEYWORDS, help="filter-jobs.py --keywords")
+    parser.add_argument("--format", default="json", choices=("json", "ndjson"),
+                        help="Format passed to the scripts")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--work-dir", default="", help="Keep payloads and outputs here (default: temp dir)")
+    parser.add_argument("--save", default="", help="Write results JSON to this file")
+    parser.add_argument("--baseline", default="", help="Compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed fractional drop in jobs/sec or rise in peak RSS")
+    args = parser.parse_args()
+
+    args.sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    unknown = [s for s in args.sources if s not in SOURCES]
+    if unknown:
+        print(f"Error: unknown sources {', '.join(unknown)} (expected: {', '.join(SOURCES)})", file=sys.stderr)
+        sys.exit(1)
+
+    config = {"jobs": args.jobs, "desc_length": args.desc_length, "dup_rate": args.dup_rate,
+              "sources": args.sources, "keywords": args.keywords, "format": args.format, "seed": args.seed}
+    if args.work_dir:
+        work = Path(args.work_dir)
+        work.mkdir(parents=True, exist_ok=True)
+        stages = run_suite(args, work)
+    else:
+        with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as tmp:
+            stages = run_suite(args, Path(tmp))
+    results = {"config": config, "python": platform.python_version(), "machine": platform.machine(),
+               "stages": stages}
+
+    print(f"{'stage':24} {'seconds':>8} {'jobs in':>9} {'jobs out':>9} {'jobs/sec':>10} {'peak MB':>8}")
+    for name, stage in stages.items():
+        print(f"{name:24} {stage['seconds']:8.2f} {stage['jobs_in']:9} {stage['jobs_out']:9} "
+              f"{stage['jobs_per_sec']:10.0f} {stage['peak_rss_mb']:8.1f}")
+
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump(results, fh, indent=2)
+            fh.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        print(f"Against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
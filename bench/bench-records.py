@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Measure the memory normalized jobs take as dicts and as jobrecord.Job records.
+
+Usage:
+    python3 bench/bench-records.py
+    python3 bench/bench-records.py --jobs 100000 --desc-length 0
+    python3 bench/bench-records.py --input data/merged-results.json
+
+Parses a JSON array of normalized jobs (from --input, or synthetic jobs from
+payloads.py run through normalize-jobs.py) the way read_jobs() does, and
+reports the traced size of the batch as parsed dicts, then after converting
+it to Job records. Descriptions are the same string objects either way, so
+--desc-length 0 shows the per-job overhead on its own.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from payloads import SOURCES, XML_SOURCES, ATS_SOURCES, Postings, board_company, listing
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+from jobrecord import job_record  # noqa: E402
+from jobstream import release_each  # noqa: E402
+from loader import load_script  # noqa: E402
+
+
+def synthetic_text(count, desc_length, seed):
+    """JSON array text of count normalized jobs spread over every source."""
+    normalize_jobs = load_script("normalize-jobs")
+    sources = [s for s in SOURCES if s not in XML_SOURCES]
+    postings = Postings(count, 0.1, seed)
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        source = sources[i % len(sources)]
+        company = board_company(source) if source in ATS_SOURCES else None
+        posting_company, title = postings.next(company)
+        raw = listing(source, i, posting_company, title, rng, desc_length)
+        data = [{"legal": ""}, raw] if source == "remoteok" else [raw]
+        for job in normalize_jobs.NORMALIZERS[source](data):
+            if not job["company"]:
+                job["company"] = posting_company
+            jobs.append(job.to_dict())
+    return json.dumps(jobs)
+
+
+def traced():
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dict and Job memory for a batch of jobs")
+    parser.add_argument("--input", default="", help="Normalized job list JSON (default: synthetic)")
+    parser.add_argument("--jobs", type=int, default=20000, help="Synthetic job count")
+    parser.add_argument("--desc-length", type=int, default=2000, help="Synthetic description HTML length")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.input:
+        text = Path(args.input).read_text()
+    else:
+        text = synthetic_text(args.jobs, args.desc_length, args.seed)
+
+    tracemalloc.start()
+    base = traced()
+    dicts = json.loads(text)
+    as_dicts = traced() - base
+    count = len(dicts)
+    start = time.perf_counter()
+    records = [job_record(job) for job in release_each(dicts)]
+    seconds = time.perf_counter() - start
+    del dicts
+    as_records = traced() - base
+    tracemalloc.stop()
+
+    converted = sum(1 for job in records if not isinstance(job, dict))
+    print(f"jobs: {count} ({converted} as Job records)")
+    print(f"dicts:   {as_dicts / 1e6:9.1f} MB  {as_dicts / max(count, 1):8.0f} bytes/job")
+    print(f"records: {as_records / 1e6:9.1f} MB  {as_records / max(count, 1):8.0f} bytes/job")
+    print(f"saved:   {(as_dicts - as_records) / 1e6:9.1f} MB  {1 - as_records / max(as_dicts, 1):8.1%}")
+    print(f"convert: {seconds:9.3f} s   {count / seconds if seconds else 0:8.0f} jobs/sec")
+
+
+if __name__ == "__main__":
+    main()
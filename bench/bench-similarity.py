@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Check similar() against difflib and time both on the same string pairs.
+
+Usage:
+    python3 bench/bench-similarity.py
+    python3 bench/bench-similarity.py --input data/merged-results.json
+
+Builds every pair of distinct normalized companies and titles (from --input,
+or a seeded synthetic set), then compares the yes/no decision of
+SequenceMatcher.ratio() >= threshold with similar() at the dedup thresholds.
+Exits non-zero if the ratio metric disagrees with difflib on any pair.
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+from loader import load_script  # noqa: E402
+from similarity import METRICS, similar  # noqa: E402
+
+
+def synthetic_jobs(count, seed):
+    """Generate job-like company/title pairs with realistic near-variants."""
+    rng = random.Random(seed)
+    roles = ["Product Designer", "Software Engineer", "Data Analyst", "Product Manager",
+             "Machine Learning Engineer", "UX Researcher", "Engineering Manager",
+             "Director of Product", "Head of Design", "Climate Data Scientist"]
+    prefixes = ["", "Senior ", "Sr. ", "Staff ", "Lead ", "Principal "]
+    suffixes = ["", " II", " (Remote)", ", Payments", " - Growth", " (NYC)", " Platform"]
+    companies = ["Stripe", "Stripe, Inc.", "Ramp", "Watershed", "Planet Labs", "Planet",
+                 "Flatiron Health", "Zocdoc", "Anthropic", "Notion Labs", "GitLab Inc"]
+    jobs = []
+    for _ in range(count):
+        title = rng.choice(prefixes) + rng.choice(roles) + rng.choice(suffixes)
+        if rng.random() < 0.1:
+            i = rng.randrange(len(title) - 1)
+            title = title[:i] + title[i + 1] + title[i] + title[i + 2:]
+        jobs.append({"company": rng.choice(companies), "title": title})
+    return jobs
+
+
+def time_decisions(pairs, decide):
+    start = time.perf_counter()
+    decisions = [decide(a, b) for a, b in pairs]
+    return decisions, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare similar() with difflib")
+    parser.add_argument("--input", default="", help="Job list JSON (default: synthetic)")
+    parser.add_argument("--count", type=int, default=400, help="Synthetic job count")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    dedup = load_script("deduplicate-jobs")
+    if args.input:
+        with open(args.input) as fh:
+            jobs = json.load(fh)
+    else:
+        jobs = synthetic_jobs(args.count, args.seed)
+
+    fields = [
+        ("company", dedup.normalize_company, dedup.COMPANY_THRESHOLD),
+        ("title", dedup.normalize_title, dedup.TITLE_THRESHOLD),
+    ]
+    failed = False
+    for field, normalize, threshold in fields:
+        values = sorted({normalize(job.get(field, "")) for job in jobs})
+        pairs = list(itertools.permutations(values, 2))
+        baseline, base_time = time_decisions(
+            pairs, lambda a, b: bool(a and b) and SequenceMatcher(None, a, b).ratio() >= threshold)
+        print(f"{field}: {len(values)} distinct, {len(pairs)} pairs, "
+              f"threshold {threshold}, difflib {base_time:.3f}s")
+        for metric in METRICS:
+            decisions, metric_time = time_decisions(
+                pairs, lambda a, b: similar(a, b, threshold, metric))
+            differ = sum(1 for x, y in zip(baseline, decisions) if x != y)
+            print(f"  {metric:8s} {metric_time:.3f}s "
+                  f"({base_time / metric_time if metric_time else 0:.1f}x), "
+                  f"{differ} decisions differ from difflib")
+            if metric == "ratio" and differ:
+                failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Check strip_html() against the HTMLStripper implementation and time both.
+
+Usage:
+    python3 bench/bench-strip-html.py
+    python3 bench/bench-strip-html.py --input data/tmp-scans/greenhouse-stripe.json
+    python3 bench/bench-strip-html.py --fuzz 20000 --max-length 2000
+
+Strips every description (from the HTML strings in --input, or a seeded
+synthetic set of ATS-style descriptions) with both implementations and
+reports the speedup. --fuzz adds random fragments of awkward markup to
+exercise the fallback rules. Exits non-zero if any output differs.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+from loader import load_script  # noqa: E402
+
+normalize_jobs = load_script("normalize-jobs")
+
+PARAGRAPHS = [
+    "We&#39;re building the financial infrastructure for the internet.",
+    "You&rsquo;ll partner with design, research &amp; engineering to ship features.",
+    "Experience with Python, SQL &amp; data pipelines &mdash; or a strong desire to learn.",
+    "Compensation: $180,000 &ndash; $240,000 + equity &amp; benefits.",
+    "We value diverse perspectives &#x2014; please apply even if you don&#x27;t meet every requirement.",
+    "Own the roadmap for our payments platform across 40+ countries.",
+]
+BULLETS = ["5+ years of product design experience", "Fluency in Figma &amp; prototyping",
+           "Comfort with ambiguity", "Experience in B2B SaaS", "Strong written communication"]
+FRAGMENTS = ["<", ">", "&", "&amp", "&amp;", "&#", "&#39", "&#x27;", "&nbsp;", "&notanentity;",
+             "<p>", "</p>", "<br/>", "<br />", "<a href='x'>", '<a href="a>b">', "<a href=x/>",
+             "<div class=\"c\" data-x=1>", "</div >", "< p>", "<3", "a < b", "<!-- c -->",
+             "<!-- c --!>", "<!DOCTYPE html>", "<![CDATA[x]]>", "<?xml?>", "<script>1<2</script>",
+             "<style>p{}</style>", "<SCRIPT>x</SCRIPT>", "</>", "</ p>", "<p\x0bclass=x>",
+             "<img src=\"a.png\" alt='A &amp; B'>", "<b>", "</b", "<p", "R&D", "Q&A ",
+             "\n", "  ", "\t", "text", "café", "&lt;b&gt;", "<a b='c'd='e'>", "<a =x>"]
+
+
+def legacy_strip_html(html_string):
+    """strip_html() as it was: a new HTMLStripper for every call."""
+    if not html_string:
+        return ""
+    stripper = normalize_jobs.HTMLStripper()
+    try:
+        stripper.feed(str(html_string))
+    except Exception:
+        return str(html_string)
+    return stripper.get_text()
+
+
+def synthetic_descriptions(count, paragraphs, seed):
+    """Generate Greenhouse-style HTML descriptions of roughly N paragraphs."""
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(count):
+        parts = ['<div class="content-intro"><p><strong>About us</strong></p>']
+        for _ in range(paragraphs):
+            parts.append(f"<p>{rng.choice(PARAGRAPHS)}</p>\n")
+            if rng.random() < 0.3:
+                items = "".join(f"<li>{rng.choice(BULLETS)}</li>" for _ in range(4))
+                parts.append(f"<h3>What you&#39;ll do</h3><ul>{items}</ul>\n")
+        parts.append('<p><a href="https://example.com/apply?ref=board&amp;src=gh">Apply</a></p></div>')
+        docs.append("".join(parts))
+    return docs
+
+
+def fuzz_descriptions(count, seed):
+    """Generate short strings of random markup fragments."""
+    rng = random.Random(seed)
+    return ["".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+def html_strings(value):
+    """Yield every string containing markup or entities in a parsed JSON value."""
+    if isinstance(value, str):
+        if "<" in value or "&" in value:
+            yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from html_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from html_strings(item)
+
+
+def time_strip(docs, strip):
+    start = time.perf_counter()
+    results = [strip(doc) for doc in docs]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare strip_html() with HTMLStripper")
+    parser.add_argument("--input", nargs="*", default=[], help="Raw API response JSON files")
+    parser.add_argument("--count", type=int, default=2000, help="Synthetic description count")
+    parser.add_argument("--paragraphs", type=int, default=20, help="Paragraphs per description")
+    parser.add_argument("--fuzz", type=int, default=5000, help="Random markup strings to check")
+    parser.add_argument("--max-length", type=int, default=0,
+                        help="Also time strip_html() with this output cap")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.input:
+        docs = []
+        for path in args.input:
+            with open(path) as fh:
+                docs.extend(html_strings(json.load(fh)))
+    else:
+        docs = synthetic_descriptions(args.count, args.paragraphs, args.seed)
+    fuzz = fuzz_descriptions(args.fuzz, args.seed)
+
+    failed = False
+    for label, sample in (("descriptions", docs), ("fuzz", fuzz)):
+        if not sample:
+            continue
+        expected, base_time = time_strip(sample, legacy_strip_html)
+        results, fast_time = time_strip(sample, lambda doc: normalize_jobs.strip_html(doc, 0))
+        differ = [doc for doc, x, y in zip(sample, expected, results) if x != y]
+        size = sum(len(doc) for doc in sample) / 1e6
+        print(f"{label}: {len(sample)} strings, {size:.1f} MB, HTMLStripper {base_time:.3f}s, "
+              f"strip_html {fast_time:.3f}s ({base_time / fast_time if fast_time else 0:.1f}x), "
+              f"{len(differ)} outputs differ")
+        for doc in differ[:5]:
+            print(f"  differs: {doc!r}")
+        failed = failed or bool(differ)
+
+    if args.max_length and docs:
+        expected, _ = time_strip(docs, legacy_strip_html)
+        results, capped_time = time_strip(
+            docs, lambda doc: normalize_jobs.strip_html(doc, args.max_length))
+        wrong = sum(1 for x, y in zip(expected, results)
+                    if y != x[:args.max_length].rstrip())
+        print(f"max-length {args.max_length}: strip_html {capped_time:.3f}s, "
+              f"{wrong} outputs differ from the truncated full text")
+        failed = failed or bool(wrong)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Seeded synthetic API payloads for every normalize-jobs.py source.
+
+write_payload() streams one response file shaped like the real API:
+Greenhouse jobs with HTML content, Lever postings with lists, RemoteOK's
+metadata-first array, The Muse results, RSS 2.0 or Atom XML, and so on.
+Files are written a listing at a time, so sizes up to a million jobs do not
+need the payload in memory.
+
+A share of listings (dup_rate) repeats the company and title of an earlier
+listing, from any source, with the small variations real boards show
+("Sr." for "Senior", a location suffix, different case), so dedup has work
+to do.
+"""
+
+import json
+import random
+from xml.sax.saxutils import escape
+
+SOURCES = ("greenhouse", "lever", "workable", "ashby", "remotive", "remoteok",
+           "jobicy", "himalayas", "themuse", "rss", "atom")
+# Sources written as XML; they go through parse-rss.py and normalize as "rss"
+XML_SOURCES = ("rss", "atom")
+ATS_SOURCES = ("greenhouse", "lever", "workable", "ashby")
+
+ROLES = ["Product Designer", "Software Engineer", "Data Analyst", "Product Manager",
+         "Machine Learning Engineer", "UX Researcher", "Engineering Manager", "Data Scientist",
+         "Director of Product", "Head of Design", "Frontend Engineer", "Platform Engineer",
+         "Customer Success Manager", "Account Executive", "Technical Writer", "Designer"]
+LEVELS = ["", "Senior ", "Staff ", "Lead ", "Principal ", "Junior ", "Associate "]
+TEAMS = ["", ", Payments", ", Growth", ", Climate", ", Health", " - Platform", ", Data",
+         ", Infrastructure", ", Marketplace", ", Identity"]
+LOCATIONS = ["Remote", "Remote, US", "New York, NY", "San Francisco, CA", "London (Hybrid)",
+             "Berlin, Germany", "Toronto, Canada", "Anywhere", "Hybrid - Austin, TX"]
+COMPANY_WORDS = ["North", "Blue", "Signal", "Harbor", "Atlas", "Ember", "Cedar", "Vector",
+                 "Lumen", "Quarry", "Orbit", "Meadow", "Pilot", "Ridge", "Tidal", "Juniper"]
+COMPANY_SUFFIXES = ["", " Labs", " Health", " AI", ", Inc.", " Energy", " Systems", " Co"]
+WORDS = ("we build product design data climate payments health platform teams customers "
+         "engineering python sql figma research roadmap strategy growth users analytics "
+         "remote collaborate ship experiments infrastructure reliable scale mission").split()
+
+
+def company_name(i):
+    word = COMPANY_WORDS[i % len(COMPANY_WORDS)]
+    return f"{word}{i // len(COMPANY_WORDS) or ''}{COMPANY_SUFFIXES[i % len(COMPANY_SUFFIXES)]}"
+
+
+def variant(title, rng):
+    """A near-duplicate of title, as another board might list it."""
+    choice = rng.randrange(4)
+    if choice == 0 and title.startswith("Senior "):
+        return "Sr. " + title[len("Senior "):]
+    if choice == 1:
+        return f"{title} ({rng.choice(['Remote', 'US', 'NYC'])})"
+    if choice == 2:
+        return title.lower()
+    return title
+
+
+class Postings:
+    """Company/title generator shared across sources, with a controlled duplicate rate.
+
+    Keeps a bounded reservoir of earlier postings to duplicate from.
+    """
+
+    RESERVOIR = 10000
+
+    def __init__(self, total, dup_rate, seed):
+        self.rng = random.Random(seed)
+        self.companies = max(100, total // 5)
+        self.dup_rate = dup_rate
+        self.seen = []
+
+    def next(self, company=None):
+        """Return (company, title); company is fixed for ATS boards."""
+        rng = self.rng
+        if self.seen and rng.random() < self.dup_rate:
+            prev_company, prev_title = rng.choice(self.seen)
+            return company or prev_company, variant(prev_title, rng)
+        posting = (company or company_name(rng.randrange(self.companies)),
+                   rng.choice(LEVELS) + rng.choice(ROLES) + rng.choice(TEAMS))
+        if len(self.seen) < self.RESERVOIR:
+            self.seen.append(posting)
+        else:
+            self.seen[rng.randrange(self.RESERVOIR)] = posting
+        return posting
+
+
+def description_html(rng, length):
+    """HTML of roughly length characters: paragraphs, a list, entities."""
+    parts = []
+    size = 0
+    while size < length:
+        if rng.random() < 0.2:
+            items = "".join(f"<li>{' '.join(rng.choices(WORDS, k=6))}</li>" for _ in range(4))
+            part = f"<h3>What you&#39;ll do</h3><ul>{items}</ul>\n"
+        else:
+            part = f"<p>{' '.join(rng.choices(WORDS, k=25))} &amp; more.</p>\n"
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def listing(source, i, company, title, rng, desc_length):
+    """One raw listing in the source's API shape."""
+    location = rng.choice(LOCATIONS)
+    desc = description_html(rng, desc_length)
+    ident = f"{source}-{i}"
+    url = f"https://jobs.example/{ident}"
+    date = f"2026-{rng.randint(1, 10):02d}-{rng.randint(1, 28):02d}"
+    if source == "greenhouse":
+        return {"id": 4000000 + i, "title": title, "location": {"name": location},
+                "departments": [{"name": "Product"}], "updated_at": f"{date}T12:00:00-04:00",
+                "content": desc, "absolute_url": url}
+    if source == "lever":
+        lists = [{"text": "Requirements", "content": description_html(rng, desc_length // 4)},
+                 {"text": "Benefits", "content": "<li>Health</li><li>Equity</li>"}]
+        return {"id": ident, "text": title, "categories": {"location": location, "team": "Design",
+                "commitment": "Full-time", "department": "Product", "allLocations": location},
+                "createdAt": 1790000000000 + i * 1000, "description": desc, "lists": lists,
+                "hostedUrl": url, "applyUrl": url + "/apply"}
+    if source == "workable":
+        return {"shortcode": f"W{i:07d}", "title": title, "city": location.split(",")[0],
+                "country": "United States", "telecommuting": "Remote" in location,
+                "published_on": date, "description": desc, "url": url, "department": "Design",
+                "employment_type": "Full-time"}
+    if source == "ashby":
+        return {"id": ident, "title": title, "location": location, "isRemote": "Remote" in location,
+                "department": {"name": "Product"}, "publishedDate": date, "employmentType": "FullTime",
+                "descriptionHtml": desc, "jobUrl": url, "applyUrl": url + "/application",
+                "compensation": {"currency": "USD", "range": {"min": 120000, "max": 180000}}}
+    if source == "remotive":
+        return {"id": i, "title": title, "company_name": company, "candidate_required_location": location,
+                "job_type": "full_time", "publication_date": f"{date}T00:00:00", "description": desc,
+                "url": url, "category": "Design", "tags": ["figma", "ux"]}
+    if source == "remoteok":
+        return {"id": str(i), "position": title, "company": company, "location": location,
+                "salary_min": 90000, "salary_max": 150000, "date": f"{date}T00:00:00+00:00",
+                "description": desc, "url": url, "apply_url": url + "/apply", "tags": ["design", "saas"]}
+    if source == "jobicy":
+        return {"id": i, "jobTitle": title, "companyName": company, "jobGeo": location,
+                "jobType": ["full-time"], "annualSalaryMin": "100000", "annualSalaryMax": "160000",
+                "salaryCurrency": "USD", "pubDate": f"{date} 10:00:00", "jobDescription": desc,
+                "url": url, "jobIndustry": ["Design & Creative"]}
+    if source == "himalayas":
+        return {"id": ident, "slug": ident, "title": title, "companyName": company,
+                "locationRestrictions": location, "type": "Full Time", "minSalary": 110000,
+                "maxSalary": 170000, "pubDate": date, "description": desc, "applicationUrl": url,
+                "category": "Design", "tags": ["product"]}
+    if source == "themuse":
+        return {"id": i, "name": title, "company": {"name": company}, "locations": [{"name": location}],
+                "levels": [{"name": "Senior Level"}], "categories": [{"name": "Design and UX"}],
+                "publication_date": f"{date}T00:00:00Z", "contents": desc, "refs": {"landing_page": url}}
+    if source == "rss":
+        return (f"<item><title>{escape(title)} at {escape(company)}</title><link>{url}</link>"
+                f"<pubDate>{date}</pubDate><description><![CDATA[{desc}]]></description>"
+                f"<category>Design</category><region>{escape(location)}</region></item>\n")
+    if source == "atom":
+        return (f"<entry><title>{escape(title)} at {escape(company)}</title><link href=\"{url}\"/>"
+                f"<published>{date}T00:00:00Z</published><summary type=\"html\">{escape(desc)}</summary>"
+                f"<category term=\"Design\"/><author><name>{escape(company)}</name></author></entry>\n")
+    raise ValueError(f"unknown source '{source}'")
+
+
+# source -> (text before the listings, separator, text after)
+FRAMES = {
+    "lever": ("[", ",", "]"),
+    "remoteok": ('[{"legal": "API terms: link back to RemoteOK"},', ",", "]"),
+    "themuse": ('{"page": 0, "page_count": 1, "results": [', ",", "]}"),
+    "rss": ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+            "<title>Synthetic jobs</title><link>https://jobs.example/</link>\n", "", "</channel></rss>\n"),
+    "atom": ('<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">'
+             "<title>Synthetic jobs</title>\n", "", "</feed>\n"),
+}
+DEFAULT_FRAME = ('{"jobs": [', ",", "]}")
+
+
+def board_company(source):
+    """Company name of the synthetic board for an ATS source."""
+    return company_name(ATS_SOURCES.index(source))
+
+
+def write_payload(path, source, count, desc_length, postings, seed=1):
+    """Write a count-listing payload for source to path. Returns the listing count."""
+    rng = random.Random(f"{seed}:{source}")
+    company = board_company(source) if source in ATS_SOURCES else None
+    head, sep, tail = FRAMES.get(source, DEFAULT_FRAME)
+    with open(path, "w") as fh:
+        fh.write(head)
+        for i in range(count):
+            posting_company, title = postings.next(company)
+            item = listing(source, i, posting_company, title, rng, desc_length)
+            if i:
+                fh.write(sep)
+            fh.write(item if isinstance(item, str) else json.dumps(item))
+        fh.write(tail)
+    return count
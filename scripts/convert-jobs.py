@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Convert job lists between JSON, NDJSON and the binary columns format.
+
+Usage:
+    python3 convert-jobs.py --to columns < data/merged-results.json > data/merged-results.columns
+    python3 convert-jobs.py --from columns < data/merged-results.columns > data/merged-results.json
+    python3 convert-jobs.py --from ndjson --to json < jobs.ndjson > jobs.json
+
+The columns format (see jobcolumns.py) stores small fields as fixed-width
+columns and text in a heap, so a stage run with --format columns maps the
+file and decodes descriptions only if it reads them. Converting back gives
+the same JSON the stages would have written.
+"""
+
+import argparse
+import sys
+
+from jobstream import FORMATS, read_jobs, write_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert job lists between formats")
+    parser.add_argument("--from", dest="source", default="json", choices=FORMATS,
+                        help="Input format (default: json)")
+    parser.add_argument("--to", dest="target", default="json", choices=FORMATS,
+                        help="Output format (default: json)")
+    args = parser.parse_args()
+    write_jobs(read_jobs(sys.stdin, args.source), sys.stdout, args.target)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,46 @@
 Usage:
     cat merged.json | python3 deduplicate-jobs.py
     python3 deduplicate-jobs.py < merged.json
+    python3 deduplicate-jobs.py --metric jaccard < merged.json
+    cat *.ndjson | python3 deduplicate-jobs.py --format ndjson
+    python3 deduplicate-jobs.py --simhash [--max-distance 3] < merged.json
+    python3 deduplicate-jobs.py --top-k 50 < merged.json
+    python3 deduplicate-jobs.py --workers 4 < merged.json
+
+With --simhash, a job whose company and title match no kept job is also
+merged into the first kept job whose description SimHash (the
+description_simhash field normalize-jobs.py adds) is within --max-distance
+bits, catching reposts under a reworded title or a recruiter's name.
+
+With --top-k K, only the K best unique jobs are ranked and written. Every
+job still has to be indexed, since a later duplicate can replace a kept
+record and its score.
+
+With --workers N, jobs are split into N shards by a coarse company key and
+each shard is deduplicated in its own process (see deduplicate_sharded()).
+The output is the same as with one process.
 
 When duplicates are found, prefers ATS sources (greenhouse, lever, workable, ashby)
 over API sources, and API sources over RSS/unverified.
 
 Reads normalized JSON from stdin, writes deduplicated JSON to stdout.
+With --format ndjson, reads and writes one job per line.
 """
 
+import argparse
+import heapq
 import json
 import re
 import sys
-from difflib import SequenceMatcher
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from jobstream import FORMATS, read_jobs, write_jobs
+from runstats import RunStats
+from similarity import METRICS, similar, token_set
+from simhash import DEFAULT_MAX_DISTANCE, MAX_DISTANCE, SimHashIndex, distance, fingerprint, parse_hex
 
 
 # Source priority — lower number = higher priority (preferred when deduplicating)
@@ -32,61 +61,317 @@ SOURCE_PRIORITY = {
 }
 
 
+# Distinct company names and titles memoized per process
+NORMALIZE_CACHE_SIZE = 16384
+COMPANY_SUFFIXES = (" inc", " inc.", " llc", " ltd", " ltd.", " gmbh", " pty", " co.", " corp", " corporation",
+                    " limited")
+COMPANY_PUNCT_RE = re.compile(r'[^a-z0-9\s]')
+TITLE_PARENS_RE = re.compile(r'\([^)]*\)')
+TITLE_WORDS_RE = re.compile(r'\b(remote|hybrid|onsite|full.?time|part.?time|contract)\b')
+SPACES_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_company(name):
     """Normalize company name for comparison."""
     name = (name or "").lower().strip()
     # Remove common suffixes
-    for suffix in [" inc", " inc.", " llc", " ltd", " ltd.", " gmbh", " pty", " co.", " corp", " corporation", " limited"]:
+    for suffix in COMPANY_SUFFIXES:
         if name.endswith(suffix):
             name = name[:-len(suffix)]
     # Remove punctuation
-    name = re.sub(r'[^a-z0-9\s]', '', name)
+    name = COMPANY_PUNCT_RE.sub('', name)
     return name.strip()
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_title(title):
     """Normalize job title for comparison."""
     title = (title or "").lower().strip()
     # Remove location info in parentheses
-    title = re.sub(r'\([^)]*\)', '', title)
+    title = TITLE_PARENS_RE.sub('', title)
     # Remove common prefixes/suffixes
-    title = re.sub(r'\b(remote|hybrid|onsite|full.?time|part.?time|contract)\b', '', title)
+    title = TITLE_WORDS_RE.sub('', title)
     # Collapse whitespace
-    title = re.sub(r'\s+', ' ', title).strip()
+    title = SPACES_RE.sub(' ', title).strip()
     return title
 
 
-def fuzzy_match(a, b, threshold=0.75):
+def fuzzy_match(a, b, threshold=0.75, metric="ratio"):
     """Check if two strings are similar enough to be considered the same."""
-    if not a or not b:
-        return False
-    return SequenceMatcher(None, a, b).ratio() >= threshold
+    return similar(a, b, threshold, metric)
 
 
-def is_duplicate(job_a, job_b):
-    """Determine if two jobs are likely duplicates."""
-    comp_a = normalize_company(job_a.get("company", ""))
-    comp_b = normalize_company(job_b.get("company", ""))
-    title_a = normalize_title(job_a.get("title", ""))
-    title_b = normalize_title(job_b.get("title", ""))
+COMPANY_THRESHOLD = 0.8
+TITLE_THRESHOLD = 0.75
+
 
+def dedup_key(job):
+    """Return the normalized (company, title) pair used for duplicate checks."""
+    return (normalize_company(job.get("company", "")),
+            normalize_title(job.get("title", "")))
+
+
+def keys_match(key_a, key_b, metric="ratio"):
+    """Compare two dedup keys with the same rules as is_duplicate()."""
     # Company must match (fuzzy)
-    if not fuzzy_match(comp_a, comp_b, 0.8):
+    if not fuzzy_match(key_a[0], key_b[0], COMPANY_THRESHOLD, metric):
         return False
 
     # Title must match (fuzzy)
-    if not fuzzy_match(title_a, title_b, 0.75):
+    if not fuzzy_match(key_a[1], key_b[1], TITLE_THRESHOLD, metric):
         return False
 
     return True
 
 
+def is_duplicate(job_a, job_b, metric="ratio"):
+    """Determine if two jobs are likely duplicates."""
+    return keys_match(dedup_key(job_a), dedup_key(job_b), metric)
+
+
+def description_fingerprint(job):
+    """The job's description SimHash as an int, computed if the field is missing."""
+    if "description_simhash" in job:
+        return parse_hex(job.get("description_simhash"))
+    return fingerprint(job.get("description_text", ""))
+
+
+def bigrams(text):
+    """Count the character bigrams in a string."""
+    return Counter(text[i:i + 2] for i in range(len(text) - 1))
+
+
+class GramIndex:
+    """Bigram count filter that never drops a pair the ratio or lcs metric accepts.
+
+    Every matching block of length L that SequenceMatcher finds shares L - 1
+    bigrams, and consecutive blocks are separated by at least one unmatched
+    character, so ratio >= t implies the two strings share at least
+    (1.5 * t - 1) * (len_a + len_b) - 1 bigrams. Strings short enough for that
+    bound to reach zero are kept in a by-length list and always returned.
+    Survivors must also share t * (len_a + len_b) / 2 characters, the bound
+    SequenceMatcher.quick_ratio() uses.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.slope = 1.5 * threshold - 1
+        self._postings = defaultdict(list)
+        self._lengths = {}
+        self._chars = {}
+        self._short = defaultdict(list)
+
+    def add(self, item_id, text):
+        self._lengths[item_id] = len(text)
+        self._chars[item_id] = Counter(text)
+        for gram, count in bigrams(text).items():
+            self._postings[gram].append((item_id, count))
+        if self.slope <= 0 or len(text) * self.slope <= 1 + 1e-9:
+            self._short[len(text)].append(item_id)
+
+    def candidates(self, text):
+        """Return ids of indexed strings that may reach the threshold against text."""
+        if self.slope <= 0:
+            return list(self._lengths)
+        length = len(text)
+        shared = defaultdict(int)
+        for gram, count in bigrams(text).items():
+            for item_id, other in self._postings.get(gram, ()):
+                shared[item_id] += min(count, other)
+        for other_length, ids in self._short.items():
+            if (length + other_length) * self.slope <= 1 + 1e-9:
+                for item_id in ids:
+                    shared.setdefault(item_id, 0)
+        chars = Counter(text)
+        result = []
+        for item_id, count in shared.items():
+            other_length = self._lengths[item_id]
+            total = length + other_length
+            needed = self.threshold * total / 2 - 1e-9
+            # Upper bound on ratio from the shorter string's length
+            if min(length, other_length) < needed:
+                continue
+            if count < self.slope * total - 1 - 1e-9:
+                continue
+            if sum((chars & self._chars[item_id]).values()) < needed:
+                continue
+            result.append(item_id)
+        return result
+
+
+class TokenIndex:
+    """Token count filter that never drops a pair the jaccard metric accepts.
+
+    Jaccard >= t needs at least t * (n_a + n_b) / (1 + t) shared tokens.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self._postings = defaultdict(list)
+        self._sizes = {}
+
+    def add(self, item_id, text):
+        tokens = token_set(text)
+        self._sizes[item_id] = len(tokens)
+        for token in tokens:
+            self._postings[token].append(item_id)
+
+    def candidates(self, text):
+        """Return ids of indexed strings that may reach the threshold against text."""
+        if self.threshold <= 0:
+            return list(self._sizes)
+        tokens = token_set(text)
+        shared = defaultdict(int)
+        for token in tokens:
+            for item_id in self._postings.get(token, ()):
+                shared[item_id] += 1
+        bound = self.threshold / (1 + self.threshold)
+        return [item_id for item_id, count in shared.items()
+                if count >= bound * (len(tokens) + self._sizes[item_id]) - 1e-9]
+
+
+class DedupIndex:
+    """Blocked duplicate search over the unique jobs kept so far.
+
+    Produces the same result as comparing each incoming job against every
+    kept job in order with is_duplicate(): candidates are gathered per fuzzy
+    company block and bigram-filtered on title, then checked in index order.
+    With max_distance set, a job no kept key matches falls back to the first
+    kept job whose description fingerprint is within that many bits.
+    """
+
+    def __init__(self, metric="ratio", max_distance=None):
+        self.metric = metric
+        # Fuzzy company and title comparisons made, for --stats
+        self.comparisons = 0
+        # Jobs merged on description fingerprint alone
+        self.near_duplicates = 0
+        self._simhash = SimHashIndex(max_distance) if max_distance is not None else None
+        self._fingerprints = []
+        self._index_class = TokenIndex if metric == "jaccard" else GramIndex
+        self.unique = []
+        self._keys = []
+        # (company, title) -> index the last job with that exact key resolved to
+        self._resolved = {}
+        # Company names that own a title block, and every name looked up so far
+        self._company_names = []
+        self._company_grams = self._index_class(COMPANY_THRESHOLD)
+        self._queried_names = []
+        self._queried_grams = self._index_class(COMPANY_THRESHOLD)
+        self._company_titles = {}
+        self._company_matches = {}
+
+    def _matching_companies(self, company):
+        """Return the indexed company names that fuzzy-match company."""
+        matches = self._company_matches.get(company)
+        if matches is None:
+            matches = []
+            slots = self._company_grams.candidates(company)
+            self.comparisons += len(slots)
+            for slot in slots:
+                other = self._company_names[slot]
+                if fuzzy_match(company, other, COMPANY_THRESHOLD, self.metric):
+                    matches.append(other)
+            self._company_matches[company] = matches
+            self._queried_grams.add(len(self._queried_names), company)
+            self._queried_names.append(company)
+        return matches
+
+    def _index(self, i, key):
+        company, title = key
+        if company not in self._company_titles:
+            self._company_grams.add(len(self._company_names), company)
+            self._company_names.append(company)
+            self._company_titles[company] = self._index_class(TITLE_THRESHOLD)
+            # Keep earlier lookups complete now that a new block exists
+            slots = self._queried_grams.candidates(company)
+            self.comparisons += len(slots)
+            for slot in slots:
+                other = self._queried_names[slot]
+                if fuzzy_match(other, company, COMPANY_THRESHOLD, self.metric):
+                    self._company_matches[other].append(company)
+        self._company_titles[company].add(i, title)
+
+    def find(self, key):
+        """Return the index of the first kept job matching key, or None."""
+        if key in self._resolved:
+            return self._resolved[key]
+        company, title = key
+        if not company or not title:
+            return None
+        candidates = []
+        for other in self._matching_companies(company):
+            candidates.extend(self._company_titles[other].candidates(title))
+        for i in sorted(candidates):
+            self.comparisons += 1
+            if keys_match(key, self._keys[i], self.metric):
+                return i
+        return None
+
+    def find_similar(self, value):
+        """Return the index of the first kept job whose fingerprint is near value, or None."""
+        if value is None:
+            return None
+        for i in self._simhash.matches(value):
+            # Skip postings left by a description the kept record no longer has
+            current = self._fingerprints[i]
+            if current is not None and distance(value, current) <= self._simhash.max_distance:
+                return i
+        return None
+
+    def add(self, job):
+        """Merge job into its first duplicate, or keep it as a new unique job."""
+        key = dedup_key(job)
+        value = description_fingerprint(job) if self._simhash is not None else None
+        i = self.find(key)
+        by_key = i is not None
+        if i is None and self._simhash is not None:
+            i = self.find_similar(value)
+            if i is not None:
+                self.near_duplicates += 1
+        if i is None:
+            i = len(self.unique)
+            self.unique.append(job)
+            self._keys.append(key)
+            if key[0] and key[1]:
+                self._index(i, key)
+                self._resolved[key] = i
+            if self._simhash is not None:
+                self._fingerprints.append(value)
+                if value is not None:
+                    self._simhash.add(i, value)
+            return i
+
+        existing = self.unique[i]
+        # Merge — keep the one with higher priority (lower number)
+        if get_priority(job) < get_priority(existing):
+            self.unique[i] = merge_jobs(job, existing)
+            if key != self._keys[i]:
+                # The kept record changed identity: index the new key and drop
+                # shortcuts that assumed the old one. Stale postings only add
+                # candidates, which keys_match() rejects.
+                self._keys[i] = key
+                self._index(i, key)
+                self._resolved.clear()
+            if self._simhash is not None and value != self._fingerprints[i]:
+                self._fingerprints[i] = value
+                if value is not None:
+                    self._simhash.add(i, value)
+        else:
+            self.unique[i] = merge_jobs(existing, job)
+        if by_key or key == self._keys[i]:
+            # A description match says nothing about other jobs with this key
+            self._resolved[key] = i
+        return i
+
+
 def merge_jobs(preferred, other):
     """Merge two duplicate job records, preferring the higher-priority source.
 
     Fills in missing fields from the lower-priority record.
     """
-    merged = dict(preferred)
+    merged = preferred.copy()
     # Fill in missing fields from the other record
     for key in ["salary_min", "salary_max", "salary_currency", "posted_date", "employment_type"]:
         if not merged.get(key) and other.get(key):
@@ -112,51 +397,243 @@ def get_priority(job):
     return SOURCE_PRIORITY.get(job.get("source", ""), 99)
 
 
-def main():
-    raw = sys.stdin.read()
-    if not raw.strip():
-        json.dump([], sys.stdout, indent=2)
-        return
+def rank_key(job):
+    """Output order: relevance score descending, then source priority."""
+    return (-job.get("preliminary_relevance_score", 0), get_priority(job))
 
-    try:
-        jobs = json.loads(raw)
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON: {e}", file=sys.stderr)
-        sys.exit(1)
 
-    if not jobs:
-        json.dump([], sys.stdout, indent=2)
-        return
+def ranked(jobs, top_k=0):
+    """Jobs in output order; with top_k, only the first top_k, same as sort-then-truncate."""
+    if top_k > 0:
+        return heapq.nsmallest(top_k, jobs, key=rank_key)
+    return sorted(jobs, key=rank_key)
 
-    # Sort by source priority so preferred sources are processed first
-    jobs.sort(key=lambda j: get_priority(j))
 
-    unique = []
+def deduplicate(jobs, metric="ratio", stats=None, max_distance=None):
+    """Deduplicate an iterable of jobs. Returns (unique_jobs, input_count).
+
+    Same result as a stable sort by source priority followed by
+    DedupIndex.add() per job. Top-priority (ATS) jobs are indexed as they
+    arrive; the rest are held until the input ends, because a later ATS job
+    still has to be seen before them. max_distance enables the description
+    SimHash fallback (see DedupIndex).
+    """
+    index = DedupIndex(metric, max_distance)
+    top = min(SOURCE_PRIORITY.values())
+    held = defaultdict(list)
+    total = 0
     for job in jobs:
-        found_dup = False
-        for i, existing in enumerate(unique):
-            if is_duplicate(job, existing):
-                # Merge — keep the one with higher priority (lower number)
-                if get_priority(job) < get_priority(existing):
-                    unique[i] = merge_jobs(job, existing)
-                else:
-                    unique[i] = merge_jobs(existing, job)
-                found_dup = True
-                break
-        if not found_dup:
-            unique.append(job)
+        total += 1
+        priority = get_priority(job)
+        if priority == top:
+            index.add(job)
+        else:
+            held[priority].append(job)
+    for priority in sorted(held):
+        for job in held[priority]:
+            index.add(job)
+    if stats is not None:
+        stats.count("comparisons", index.comparisons)
+        if max_distance is not None:
+            stats.count("near_duplicates", index.near_duplicates)
+    return index.unique, total
+
+
+# Leading characters of the space-free normalized company that pick its shard
+COARSE_KEY_LENGTH = 4
+
+
+def coarse_key(company):
+    """Shard key of a normalized company name."""
+    return company.replace(" ", "")[:COARSE_KEY_LENGTH]
+
+
+def shard_groups(companies, fingerprints=None, metric="ratio", max_distance=None):
+    """Join coarse keys that the dedup could compare across. Returns ({company: group}, joins).
+
+    Reconciliation step for --workers: a job is only ever compared with
+    kept jobs whose company fuzzy-matches its own or, with max_distance,
+    whose description fingerprint is within max_distance bits. Coarse keys
+    split some of those pairs ("acme" / "the acme", "stripe" / "stirpe"), so
+    every such pair among the distinct companies (and, with max_distance,
+    among the fingerprints) is found here through the same candidate
+    filters DedupIndex uses. Its two coarse keys are then joined, and the
+    group is named by its smallest key. Shards built from groups never
+    split a pair, so each shard dedups exactly as one process would. With
+    max_distance, a description reposted across companies joins their
+    groups too, so heavy cross-company reposting leaves fewer, larger shards.
+    """
+    parent = {}
+
+    def root(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    joins = 0
+
+    def join(a, b):
+        nonlocal joins
+        a, b = root(a), root(b)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+            joins += 1
+
+    names = []
+    grams = (TokenIndex if metric == "jaccard" else GramIndex)(COMPANY_THRESHOLD)
+    for company in sorted(set(companies)):
+        key = root(coarse_key(company))
+        if not company:
+            continue
+        for slot in grams.candidates(company):
+            other = names[slot]
+            if root(coarse_key(other)) != key and (fuzzy_match(company, other, COMPANY_THRESHOLD, metric)
+                                                   or fuzzy_match(other, company, COMPANY_THRESHOLD, metric)):
+                join(coarse_key(other), key)
+                key = root(key)
+        grams.add(len(names), company)
+        names.append(company)
+
+    if fingerprints is not None and max_distance is not None:
+        index = SimHashIndex(max_distance)
+        owners = {}
+        for company, value in zip(companies, fingerprints):
+            if value is None:
+                continue
+            if value in owners:
+                join(coarse_key(owners[value]), coarse_key(company))
+                continue
+            for other in index.matches(value):
+                join(coarse_key(owners[other]), coarse_key(company))
+            owners[value] = company
+            index.add(value, value)
+    return {company: root(coarse_key(company)) for company in set(companies)}, joins
+
+
+def dedup_shard(task):
+    """Worker: dedup one shard of (position, key fields) pairs.
+
+    Returns the kept jobs as lists of input positions, in the order the
+    jobs were merged into them, plus the index's comparison counts.
+    """
+    stubs, metric, max_distance = task
+    index = DedupIndex(metric, max_distance)
+    slots = []
+    # Stable sort by source priority, as deduplicate() processes jobs
+    for position, stub in sorted(stubs, key=lambda item: (get_priority(item[1]), item[0])):
+        i = index.add(stub)
+        if i == len(slots):
+            slots.append([position])
+        else:
+            slots[i].append(position)
+    return slots, index.comparisons, index.near_duplicates
+
+
+def deduplicate_sharded(jobs, workers, metric="ratio", stats=None, max_distance=None):
+    """deduplicate() with the matching spread over worker processes. Same result.
+
+    Jobs are hash-partitioned by their shard_groups() group. Workers get only
+    company, title, source and fingerprint, and return which input jobs
+    were merged into each kept job, in order. The merges are then replayed
+    here with merge_jobs() on the full records, kept jobs ordered by source
+    priority and input position as in a single pass. Returns
+    (unique_jobs, input_count, shard_sizes).
+    """
+    jobs = list(jobs)
+    companies = [normalize_company(job.get("company", "")) for job in jobs]
+    fingerprints = [description_fingerprint(job) for job in jobs] if max_distance is not None else None
+    groups, joins = shard_groups(companies, fingerprints, metric, max_distance)
+
+    shards = [[] for _ in range(workers)]
+    for position, job in enumerate(jobs):
+        stub = {"company": job.get("company", ""), "title": job.get("title", ""), "source": job.get("source", "")}
+        if fingerprints is not None:
+            value = fingerprints[position]
+            stub["description_simhash"] = None if value is None else format(value, "016x")
+        shards[zlib.crc32(groups[companies[position]].encode()) % workers].append((position, stub))
+    tasks = [(shard, metric, max_distance) for shard in shards if shard]
+    if len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+            outcomes = list(pool.map(dedup_shard, tasks))
+    else:
+        outcomes = [dedup_shard(task) for task in tasks]
+
+    slots = [slot for shard_slots, _, _ in outcomes for slot in shard_slots]
+    slots.sort(key=lambda slot: (get_priority(jobs[slot[0]]), slot[0]))
+    unique = []
+    for slot in slots:
+        kept = jobs[slot[0]]
+        for position in slot[1:]:
+            job = jobs[position]
+            # Same choice as DedupIndex.add()
+            kept = merge_jobs(job, kept) if get_priority(job) < get_priority(kept) else merge_jobs(kept, job)
+        unique.append(kept)
+    if stats is not None:
+        stats.count("comparisons", sum(comparisons for _, comparisons, _ in outcomes))
+        stats.count("shard_joins", joins)
+        if max_distance is not None:
+            stats.count("near_duplicates", sum(near for _, _, near in outcomes))
+    return unique, len(jobs), [len(shard) for shard in shards]
 
-    # Re-sort by relevance score if available, then by source priority
-    unique.sort(key=lambda j: (-j.get("preliminary_relevance_score", 0), get_priority(j)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate job listings")
+    parser.add_argument("--metric", default="ratio", choices=METRICS,
+                        help="String similarity for company/title matching "
+                             "(ratio = difflib-compatible, lcs, jaccard = token sets)")
+    parser.add_argument("--format", default="json", choices=FORMATS,
+                        help="Input/output format: JSON array (default), one job per line, or a binary columns file")
+    parser.add_argument("--simhash", action="store_true",
+                        help="Also merge jobs whose descriptions are near-duplicates by SimHash")
+    parser.add_argument("--max-distance", type=int, default=DEFAULT_MAX_DISTANCE,
+                        help=f"Most differing SimHash bits for --simhash (default: {DEFAULT_MAX_DISTANCE})")
+    parser.add_argument("--top-k", type=int, default=0,
+                        help="Write only the K best unique jobs by score, then source priority")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Dedup shards of the input in this many processes (same output)")
+    RunStats.add_arguments(parser)
+    args = parser.parse_args()
+    if not 0 <= args.max_distance <= MAX_DISTANCE:
+        print(f"Error: --max-distance must be between 0 and {MAX_DISTANCE}", file=sys.stderr)
+        sys.exit(1)
+    if args.workers < 1:
+        print("Error: --workers must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    run_stats = RunStats.from_args("deduplicate-jobs", args)
+    max_distance = args.max_distance if args.simhash else None
+
+    shard_sizes = None
+    with run_stats.phase("transform"):
+        jobs = read_jobs(sys.stdin, args.format, run_stats)
+        if args.workers > 1:
+            unique, total, shard_sizes = deduplicate_sharded(jobs, args.workers, args.metric, run_stats,
+                                                             max_distance)
+        else:
+            unique, total = deduplicate(jobs, args.metric, run_stats, max_distance)
+    if not total:
+        write_jobs([], sys.stdout, args.format, run_stats)
+        run_stats.report()
+        return
 
     stats = {
-        "total_input": len(jobs),
+        "total_input": total,
         "total_output": len(unique),
-        "duplicates_removed": len(jobs) - len(unique),
+        "duplicates_removed": total - len(unique),
     }
+    if args.top_k > 0:
+        stats["written"] = min(args.top_k, len(unique))
+    if shard_sizes is not None:
+        stats["shard_sizes"] = shard_sizes
     print(f"Dedup stats: {json.dumps(stats)}", file=sys.stderr)
 
-    json.dump(unique, sys.stdout, indent=2, default=str)
+    # Re-sort by relevance score if available, then by source priority
+    with run_stats.phase("transform"):
+        unique = ranked(unique, args.top_k)
+
+    write_jobs(unique, sys.stdout, args.format, run_stats)
+    run_stats.report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Fetch ATS boards and job APIs concurrently into data/tmp-scans/.
+
+Usage:
+    python3 scripts/fetch-scans.py
+    python3 scripts/fetch-scans.py --sectors "climate_agtech,finance" \\
+        --api remotive:product,remotive:design,remoteok:design,himalayas,themuse:0,themuse:1 \\
+        --themuse-level "Senior Level" --themuse-category "Design and UX"
+    python3 scripts/fetch-scans.py --base-url http://127.0.0.1:8000 --out-dir /tmp/scans
+
+Reads the companies in data/target-companies.local.json (or
+target-companies.json) and fetches every board, plus any --api sources, in a
+thread pool over keep-alive connections. Writes the raw responses under the
+file names the skill uses (greenhouse-{slug}.json, api-remotive-{cat}.json,
+...) and a manifest.json that run-pipeline.py reads. A board that cannot be
+fetched gets the same empty payload the scan-*.sh scripts print.
+
+Responses are kept in data/http-cache/ (see httpcache.py): within its
+source type's TTL a board is not requested again, and after that it is
+revalidated, so an unchanged board costs a 304. --no-http-cache fetches
+everything afresh.
+
+--api takes comma-separated SOURCE[:PARAM] specs: remotive:CATEGORY,
+remoteok:TAG, jobicy:TAG, himalayas, themuse:PAGE.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote, urlencode
+
+from httpcache import add_cache_arguments, cache_from_args
+from httppool import HTTPPool
+from loader import SCRIPTS_DIR
+
+DATA_DIR = SCRIPTS_DIR.parent / "data"
+
+# ats -> (method, URL template, payload written when the fetch fails)
+ATS_ENDPOINTS = {
+    "greenhouse": ("GET", "https://boards-api.greenhouse.io/v1/boards/{slug}/jobs?content=true", '{"jobs": []}'),
+    "ashby": ("GET", "https://api.ashbyhq.com/posting-api/job-board/{slug}", '{"jobs": []}'),
+    "lever": ("GET", "https://api.lever.co/v0/postings/{slug}", "[]"),
+    "workable": ("POST", "https://apply.workable.com/api/v1/widget/accounts/{slug}", '{"jobs": []}'),
+}
+API_SOURCES = ("remotive", "remoteok", "jobicy", "himalayas", "themuse")
+
+
+def load_companies(data_dir=DATA_DIR):
+    """Return the companies from target-companies(.local).json."""
+    for name in ("target-companies.local.json", "target-companies.json"):
+        path = data_dir / name
+        if path.exists():
+            with open(path) as fh:
+                return json.load(fh).get("companies", [])
+    return []
+
+
+def ats_target(company):
+    """Build a fetch target for one company, or None if its ATS is not supported."""
+    endpoint = ATS_ENDPOINTS.get(company.get("ats", ""))
+    slug = company.get("slug", "")
+    if not endpoint or not slug:
+        return None
+    method, url, empty = endpoint
+    ats = company["ats"]
+    return {
+        "url": url.format(slug=quote(slug)),
+        "method": method,
+        "body": "{}" if method == "POST" else None,
+        "empty": empty,
+        "path": f"{ats}-{slug}.json",
+        "section": "ats_files",
+        "entry": {"path": f"{ats}-{slug}.json", "source": ats, "slug": slug,
+                  "company": company.get("name", "")},
+    }
+
+
+def api_target(spec, themuse_params):
+    """Build a fetch target from a SOURCE[:PARAM] spec; raises ValueError if unknown."""
+    source, _, param = spec.partition(":")
+    if source == "remotive":
+        query = {"category": param} if param else {}
+        url, name, empty = "https://remotive.com/api/remote-jobs", param or "all", '{"jobs": []}'
+    elif source == "remoteok":
+        query = {"tag": param} if param else {}
+        url, name, empty = "https://remoteok.com/api", param or "all", "[]"
+    elif source == "jobicy":
+        query = dict(count=50, **({"tag": param} if param else {}))
+        url, name, empty = "https://jobicy.com/api/v2/remote-jobs", param or "all", '{"jobs": []}'
+    elif source == "himalayas":
+        query = {"limit": param or 200}
+        url, name, empty = "https://himalayas.app/jobs/api", "all", '{"jobs": []}'
+    elif source == "themuse":
+        page = param or "0"
+        query = dict(page=page, **themuse_params)
+        url, name, empty = "https://www.themuse.com/api/public/jobs", f"p{page}", '{"results": []}'
+    else:
+        raise ValueError(f"unknown API source '{source}' (expected one of {', '.join(API_SOURCES)})")
+    params = urlencode(query)
+    return {
+        "url": f"{url}?{params}" if params else url,
+        "method": "GET",
+        "body": None,
+        "empty": empty,
+        "path": f"api-{source}-{name}.json",
+        "section": "api_files",
+        "entry": {"path": f"api-{source}-{name}.json", "source": source, "params": params},
+    }
+
+
+def write_atomic(path, data):
+    """Write bytes to path via a temporary file, so readers never see half a file."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def fetch_target(pool, target, out_dir):
+    """Fetch one target and save it. Returns (target, ok, message)."""
+    response = pool.request(target["url"], target["method"], target["body"],
+                            {"Content-Type": "application/json"} if target["body"] else None)
+    if response.status == 200:
+        write_atomic(out_dir / target["path"], response.body)
+        return target, True, ""
+    write_atomic(out_dir / target["path"], target["empty"].encode())
+    reason = f"HTTP {response.status}" if response.status else response.error
+    return target, False, reason
+
+
+def select_companies(companies, sectors, only):
+    """Keep companies in any of sectors and, if given, named in only (slug or name)."""
+    chosen = []
+    for company in companies:
+        if sectors and not set(company.get("sectors", [])) & set(sectors):
+            continue
+        if only and company.get("slug") not in only and company.get("name") not in only:
+            continue
+        chosen.append(company)
+    return chosen
+
+
+def split_list(value):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch ATS boards and job APIs concurrently")
+    parser.add_argument("--out-dir", default="data/tmp-scans", help="Where to write the scan files")
+    parser.add_argument("--sectors", default="", help="Only companies in these comma-separated sectors")
+    parser.add_argument("--companies", default="", help="Only these comma-separated slugs or names")
+    parser.add_argument("--no-ats", action="store_true", help="Skip the target company boards")
+    parser.add_argument("--api", default="", help="Comma-separated API specs, e.g. remotive:product,himalayas")
+    parser.add_argument("--themuse-level", default="", help="The Muse level filter (e.g., 'Senior Level')")
+    parser.add_argument("--themuse-category", default="", help="The Muse category filter")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent requests overall")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests per host")
+    parser.add_argument("--timeout", type=float, default=20, help="Socket timeout in seconds")
+    parser.add_argument("--retries", type=int, default=3, help="Retries for errors, 429 and 5xx")
+    parser.add_argument("--backoff", type=float, default=0.5, help="First retry delay in seconds")
+    parser.add_argument("--base-url", default="",
+                        help="Send every request to this server instead (e.g., a local stand-in)")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    try:
+        cache = cache_from_args(args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    targets = []
+    if not args.no_ats:
+        companies = select_companies(load_companies(), split_list(args.sectors), split_list(args.companies))
+        for company in companies:
+            target = ats_target(company)
+            if target is None:
+                print(f"Skipping {company.get('name', '?')}: unsupported ATS '{company.get('ats', '')}'",
+                      file=sys.stderr)
+                continue
+            targets.append(target)
+    themuse_params = {k: v for k, v in (("level", args.themuse_level),
+                                         ("category", args.themuse_category)) if v}
+    for spec in split_list(args.api):
+        try:
+            targets.append(api_target(spec, themuse_params))
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    if not targets:
+        print("Nothing to fetch", file=sys.stderr)
+        sys.exit(1)
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pool = HTTPPool(args.per_host, args.timeout, args.retries, args.backoff, args.base_url, cache=cache)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        outcomes = list(executor.map(lambda t: fetch_target(pool, t, out_dir), targets))
+    elapsed = time.perf_counter() - start
+    pool.close()
+    if cache is not None:
+        cache.close()
+
+    manifest = {"mode": "prefetched", "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "ats_files": [], "api_files": [], "rss_files": []}
+    failed = 0
+    for target, ok, message in outcomes:
+        manifest[target["section"]].append(target["entry"])
+        if not ok:
+            failed += 1
+            print(f"{target['path']}: {message}", file=sys.stderr)
+    write_atomic(out_dir / "manifest.json", json.dumps(manifest, indent=2).encode())
+
+    stats = {
+        "targets": len(targets),
+        "ok": len(targets) - failed,
+        "failed": failed,
+        "retries": pool.stats["retries"],
+        "connections": pool.stats["connections"],
+        "bytes": pool.stats["bytes"],
+        "seconds": round(elapsed, 3),
+    }
+    if cache is not None:
+        stats["cache"] = cache.summary()
+    print(f"Fetch stats: {json.dumps(stats)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,132 +4,640 @@
 Usage:
     cat normalized.json | python3 filter-jobs.py --keywords "product,design,director" --seniority "senior,director" --remote-only
     python3 filter-jobs.py --keywords "data,ML,machine learning" --exclude-keywords "intern,junior" < jobs.json
+    python3 normalize-jobs.py --source lever --format ndjson < postings.json | python3 filter-jobs.py --keywords "design" --format ndjson
+    python3 filter-jobs.py --keywords "climate,data,ML" --rank bm25 --top-k 50 < jobs.json
+    python3 filter-jobs.py --profiles candidates.json --output-dir data/by-candidate < jobs.json
 
 Reads normalized JSON from stdin, writes filtered + scored JSON to stdout.
+With --format ndjson, reads and writes one job per line; matches are written
+as they are scored, in input order, instead of sorted by score.
+
+--top-k K keeps only the K best-scoring matches, best first in every format.
+Matches stream through a K-sized heap, so with NDJSON or columns input
+memory stays bounded by K rather than the number of matches.
+
+--rank bm25 scores the batch with BM25F over title, description, departments
+and tags, so rare terms count for more than common ones and long
+descriptions do not win on length alone. Only jobs containing at least one
+keyword term are returned, best first, in either format.
+
+--profiles FILE scores the batch for many candidates at once. Every job's
+text is scanned once for the keywords of all profiles together, into a job
+x keyword hit matrix; each profile's scores, seniority, remote and exclude
+filters are then read off the matrix. Each profile gets the jobs, scores and
+order that filter-jobs.py with its options would give as a JSON array.
 """
 
 import argparse
+import heapq
 import json
+import math
 import re
 import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from jobrecord import json_default
+from jobstream import FORMATS, read_jobs, write_jobs
+from runstats import RunStats
+
+
+RANKERS = ("keyword", "bm25")
+WORD_RE = re.compile(r'\b[a-z][a-z0-9+#.-]{1,}\b')
+
+# BM25F (weight, length normalization b) per indexed field. Title weight
+# follows the 3x title bonus of the keyword score.
+BM25F_FIELDS = {
+    "title": (3.0, 0.5),
+    "description_text": (1.0, 0.75),
+    "departments": (1.5, 0.5),
+    "tags": (1.5, 0.5),
+}
+BM25_K1 = 1.2
+# Profile names become file names with --output-dir
+PROFILE_NAME_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def words(text):
+    """Split text into lowercase words, in order and with repeats."""
+    return WORD_RE.findall((text or "").lower())
 
 
 def tokenize(text):
     """Split text into lowercase words for matching."""
-    return set(re.findall(r'\b[a-z][a-z0-9+#.-]{1,}\b', (text or "").lower()))
+    return set(words(text))
 
 
-def keyword_score(job, keywords, exclude_keywords):
-    """Score a job based on keyword matches in title and description.
+# Below this many distinct keywords, one C-level substring search per keyword
+# beats a regex scan that stops at every keyword occurrence
+TRIE_MIN_PATTERNS = 100
 
-    Title matches are weighted 3x higher than description matches.
-    Returns a score from 0-100 and the list of matched keywords.
-    """
-    if not keywords:
-        return 50, []  # neutral score if no keywords specified
 
+def trie_pattern(words):
+    """Regex source matching the longest of words at a position, built as a trie."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy, so the longest word wins where one word is a prefix of another
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+def job_texts(job):
+    """Return the lowercased title and the full text keywords are matched in.
+
+    The full text starts with the title.
+    """
     title = (job.get("title") or "").lower()
     desc = (job.get("description_text") or "").lower()
     company = (job.get("company") or "").lower()
     departments = " ".join(str(d) for d in (job.get("departments") or [])).lower()
     tags = " ".join(str(t) for t in (job.get("tags") or [])).lower()
-    full_text = f"{title} {desc} {company} {departments} {tags}"
+    return title, f"{title} {desc} {company} {departments} {tags}"
 
-    # Check exclusions first
-    if exclude_keywords:
-        for kw in exclude_keywords:
-            if kw.lower() in title:
-                return -1, []  # hard exclude if keyword is in title
 
-    matched = []
-    title_hits = 0
-    desc_hits = 0
+class KeywordMatcher:
+    """Keyword, exclude and seniority sets compiled once for scoring many jobs.
 
-    for kw in keywords:
-        kw_lower = kw.lower().strip()
-        if not kw_lower:
-            continue
-        if kw_lower in title:
-            title_hits += 1
-            matched.append(kw)
-        elif kw_lower in full_text:
-            desc_hits += 1
-            matched.append(kw)
+    Matching is plain substring search on lowercased text, as it has always
+    been. Large keyword sets are compiled into a single trie-shaped regex, so
+    each text is scanned once however many keywords there are.
+    """
 
-    if not matched:
-        return 0, []
+    def __init__(self, keywords, exclude_keywords=(), seniorities=()):
+        self.keywords = list(keywords)
+        self.patterns = [kw.lower().strip() for kw in self.keywords]
+        self.distinct = {p for p in self.patterns if p}
+        # Exclusions are not stripped; an empty one matches every title
+        self.excludes = {kw.lower() for kw in exclude_keywords or ()}
+        self.seniorities = {s.lower() for s in seniorities or ()}
 
-    # Title hits worth 3x description hits
-    total_kw = len(keywords)
-    raw_score = ((title_hits * 3) + desc_hits) / (total_kw * 3) * 100
-    return min(round(raw_score, 1), 100), matched
+        self.regex = None
+        if len(self.distinct) >= TRIE_MIN_PATTERNS:
+            self.regex = re.compile(trie_pattern(self.distinct))
+            # A match is the longest keyword at its position; shorter keywords
+            # that are prefixes of it occur there too
+            self.prefixes = {p: [q for q in self.distinct if p.startswith(q)] for p in self.distinct}
+        self.exclude_regex = None
+        if len(self.excludes) >= TRIE_MIN_PATTERNS and "" not in self.excludes:
+            self.exclude_regex = re.compile(trie_pattern(self.excludes))
 
+    def excluded(self, title):
+        """Check whether any exclude keyword occurs in the lowercased title."""
+        if self.exclude_regex is not None:
+            return self.exclude_regex.search(title) is not None
+        return any(kw in title for kw in self.excludes)
 
-def seniority_match(job_seniority, target_seniorities):
-    """Check if job seniority matches any of the target levels."""
-    if not target_seniorities:
-        return True
-    return (job_seniority or "").lower() in [s.lower() for s in target_seniorities]
+    def hits(self, title, full_text):
+        """Scan full_text once with the trie regex.
 
+        Returns (keywords found in title, keywords found anywhere) as sets;
+        full_text must start with title, as score() builds it.
+        """
+        in_title = set()
+        found = set()
+        title_len = len(title)
+        search = self.regex.search
+        match = search(full_text)
+        while match:
+            start = match.start()
+            for p in self.prefixes[match.group()]:
+                found.add(p)
+                if start + len(p) <= title_len:
+                    in_title.add(p)
+            match = search(full_text, start + 1)
+        return in_title, found
 
-def main():
-    parser = argparse.ArgumentParser(description="Filter and score job listings")
-    parser.add_argument("--keywords", default="",
-                        help="Comma-separated keywords to match (e.g., 'product,design,UX')")
-    parser.add_argument("--seniority", default="",
-                        help="Comma-separated seniority levels to include (e.g., 'senior,director')")
-    parser.add_argument("--remote-only", action="store_true",
-                        help="Only include remote positions")
-    parser.add_argument("--exclude-keywords", default="",
-                        help="Comma-separated keywords to exclude")
-    parser.add_argument("--min-score", type=float, default=0,
-                        help="Minimum relevance score to include (0-100)")
-    args = parser.parse_args()
+    def score(self, job):
+        """Score a job based on keyword matches in title and description.
 
-    keywords = [k.strip() for k in args.keywords.split(",") if k.strip()] if args.keywords else []
-    seniorities = [s.strip() for s in args.seniority.split(",") if s.strip()] if args.seniority else []
-    exclude_kw = [k.strip() for k in args.exclude_keywords.split(",") if k.strip()] if args.exclude_keywords else []
+        Title matches are weighted 3x higher than description matches.
+        Returns a score from 0-100 and the list of matched keywords.
+        """
+        if not self.keywords:
+            return 50, []  # neutral score if no keywords specified
 
-    raw = sys.stdin.read()
-    if not raw.strip():
-        json.dump([], sys.stdout, indent=2)
-        return
+        title, full_text = job_texts(job)
 
-    try:
-        jobs = json.loads(raw)
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON: {e}", file=sys.stderr)
-        sys.exit(1)
+        # Check exclusions first
+        if self.excludes and self.excluded(title):
+            return -1, []  # hard exclude if keyword is in title
 
-    results = []
+        if self.regex is None:
+            # Few keywords: search the strings themselves, one keyword at a time
+            in_title, found = title, full_text
+        else:
+            in_title, found = self.hits(title, full_text)
+        matched = []
+        title_hits = 0
+        desc_hits = 0
+
+        for kw, pattern in zip(self.keywords, self.patterns):
+            if not pattern:
+                continue
+            if pattern in in_title:
+                title_hits += 1
+                matched.append(kw)
+            elif pattern in found:
+                desc_hits += 1
+                matched.append(kw)
+
+        if not matched:
+            return 0, []
+
+        # Title hits worth 3x description hits
+        total_kw = len(self.keywords)
+        raw_score = ((title_hits * 3) + desc_hits) / (total_kw * 3) * 100
+        return min(round(raw_score, 1), 100), matched
+
+    def best_score(self, job):
+        """Highest score() the job could get, knowing only its title.
+
+        Assumes every keyword not in the title turns up in the description;
+        -1 if the title is excluded, as in score().
+        """
+        if not self.keywords:
+            return 50
+        title = (job.get("title") or "").lower()
+        if self.excludes and self.excluded(title):
+            return -1
+        title_hits = sum(1 for p in self.patterns if p and p in title)
+        other_hits = sum(1 for p in self.patterns if p) - title_hits
+        raw_score = ((title_hits * 3) + other_hits) / (len(self.keywords) * 3) * 100
+        return min(round(raw_score, 1), 100)
+
+    def seniority_ok(self, job_seniority):
+        """Check if job seniority matches any of the target levels."""
+        if not self.seniorities:
+            return True
+        return (job_seniority or "").lower() in self.seniorities
+
+
+def keyword_score(job, keywords, exclude_keywords):
+    """Score one job; see KeywordMatcher.score(). Compile a matcher for many jobs."""
+    return KeywordMatcher(keywords, exclude_keywords).score(job)
+
+
+def seniority_match(job_seniority, target_seniorities):
+    """Check if job seniority matches any of the target levels."""
+    return KeywordMatcher((), (), target_seniorities).seniority_ok(job_seniority)
+
+
+def filter_jobs(jobs, keywords, seniorities, exclude_kw, remote_only=False, min_score=0):
+    """Yield the jobs that pass the filters, annotated with their score."""
+    matcher = KeywordMatcher(keywords, exclude_kw, seniorities)
     for job in jobs:
         # Filter by remote
-        if args.remote_only and not job.get("remote", False):
+        if remote_only and not job.get("remote", False):
             continue
 
         # Filter by seniority
-        if seniorities and not seniority_match(job.get("seniority", ""), seniorities):
+        if seniorities and not matcher.seniority_ok(job.get("seniority", "")):
             continue
 
         # Score by keywords
-        score, matched_kw = keyword_score(job, keywords, exclude_kw)
+        score, matched_kw = matcher.score(job)
 
         # Skip excluded jobs
         if score < 0:
             continue
 
         # Skip low-scoring jobs
-        if score < args.min_score:
+        if score < min_score:
             continue
 
         job["preliminary_relevance_score"] = score
         job["matched_keywords"] = matched_kw
+        yield job
+
+
+def title_prefilter(jobs, keywords, seniorities, exclude_kw, remote_only=False, min_score=0):
+    """Yield the jobs filter_jobs() could still keep once their descriptions are known.
+
+    Needs only what a board listing has without content: the remote flag,
+    seniority and title. A job is dropped only if filter_jobs() would drop it
+    whatever its description says.
+    """
+    matcher = KeywordMatcher(keywords, exclude_kw, seniorities)
+    for job in jobs:
+        if remote_only and not job.get("remote", False):
+            continue
+        if seniorities and not matcher.seniority_ok(job.get("seniority", "")):
+            continue
+        score = matcher.best_score(job)
+        if score < 0 or score < min_score:
+            continue
+        yield job
+
+
+class BM25Index:
+    """Inverted index over a batch of jobs, scored with BM25F.
+
+    Each posting holds one job's field-weighted, length-normalized term
+    frequency, so a query only walks the postings of its own terms.
+    """
+
+    def __init__(self, jobs, fields=BM25F_FIELDS, k1=BM25_K1):
+        self.jobs = list(jobs)
+        self.k1 = k1
+        counts = []
+        lengths = {field: [] for field in fields}
+        for job in self.jobs:
+            per_field = {}
+            for field in fields:
+                value = job.get(field) or ""
+                if isinstance(value, list):
+                    value = " ".join(str(v) for v in value)
+                tokens = words(value)
+                per_field[field] = Counter(tokens)
+                lengths[field].append(len(tokens))
+            counts.append(per_field)
+        average = {field: (sum(n) / len(n) if n else 0) or 1 for field, n in lengths.items()}
+
+        self.postings = defaultdict(list)
+        for doc, per_field in enumerate(counts):
+            tf = defaultdict(float)
+            for field, (weight, b) in fields.items():
+                norm = 1 - b + b * lengths[field][doc] / average[field]
+                for term, n in per_field[field].items():
+                    tf[term] += weight * n / norm
+            for term, value in tf.items():
+                self.postings[term].append((doc, value))
+
+    def idf(self, term):
+        """Inverse document frequency; terms absent from the batch score highest."""
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.jobs) - df + 0.5) / (df + 0.5))
+
+    def search(self, terms, k=0):
+        """Return [(doc, score, matched_terms)] for docs with any of terms, best first.
+
+        Scores accumulate term-at-a-time over each term's postings; with k,
+        only the k best are kept. Ties keep batch order.
+        """
+        scores = defaultdict(float)
+        matched = defaultdict(set)
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc, tf in postings:
+                scores[doc] += idf * tf / (self.k1 + tf)
+                matched[doc].add(term)
+        key = lambda item: (item[1], -item[0])  # noqa: E731
+        ranked = heapq.nlargest(k, scores.items(), key=key) if k else sorted(scores.items(), key=key, reverse=True)
+        return [(doc, score, matched[doc]) for doc, score in ranked]
+
+
+def rank_bm25(jobs, keywords, seniorities, exclude_kw, remote_only=False, min_score=0, top_k=0):
+    """Return the jobs that pass the filters, ranked by BM25F relevance.
+
+    Scores are scaled to 0-100 against a job that saturates every keyword term.
+    """
+    matcher = KeywordMatcher(keywords, exclude_kw, seniorities)
+    candidates = []
+    for job in jobs:
+        if remote_only and not job.get("remote", False):
+            continue
+        if seniorities and not matcher.seniority_ok(job.get("seniority", "")):
+            continue
+        if matcher.excludes and matcher.excluded((job.get("title") or "").lower()):
+            continue
+        candidates.append(job)
+
+    keyword_terms = [(kw, set(words(kw))) for kw in keywords]
+    terms = set().union(*(t for _, t in keyword_terms))
+    index = BM25Index(candidates)
+    best = sum(index.idf(term) for term in terms)
+
+    results = []
+    for doc, score, found in index.search(terms, top_k):
+        score = round(score / best * 100, 1)
+        # Scores only fall from here, so the top k above min_score are kept
+        if score < min_score:
+            break
+        job = index.jobs[doc]
+        job["preliminary_relevance_score"] = score
+        job["matched_keywords"] = [kw for kw, t in keyword_terms if t and t <= found]
         results.append(job)
+    return results
+
+
+def best_first(jobs, top_k=0):
+    """Jobs by preliminary_relevance_score, best first; ties keep input order.
+
+    With top_k, only the top_k best are kept while the rest stream past; the
+    result is the same as sorting everything and truncating.
+    """
+    if top_k > 0:
+        return heapq.nsmallest(top_k, jobs, key=lambda j: -j.get("preliminary_relevance_score", 0))
+    return sorted(jobs, key=lambda j: j.get("preliminary_relevance_score", 0), reverse=True)
+
+
+def split_option(value):
+    """A profile option as a list: comma-separated text or a JSON list."""
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(v).strip() for v in value or () if str(v).strip()]
+
+
+def load_profiles(path):
+    """Read candidate profiles from a JSON file.
+
+    The file holds a list of profiles, or {"profiles": [...]}. Each profile
+    has a unique "name" and the filter options as keys: keywords, seniority,
+    exclude_keywords (comma-separated or lists), remote_only, min_score and
+    top_k.
+    """
+    try:
+        with open(path) as fh:
+            data = json.load(fh)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error reading profiles {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    entries = data.get("profiles") if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not all(isinstance(p, dict) for p in entries):
+        print(f"Error: {path} must hold a list of profile objects", file=sys.stderr)
+        sys.exit(1)
+    if not entries:
+        print(f"Error: no profiles in {path}", file=sys.stderr)
+        sys.exit(1)
+    profiles = []
+    for n, entry in enumerate(entries, 1):
+        name = str(entry.get("name", "")).strip()
+        if not name or not PROFILE_NAME_RE.match(name):
+            print(f"Error: profile {n} needs a name of letters, digits, '.', '_' or '-'", file=sys.stderr)
+            sys.exit(1)
+        if any(p["name"] == name for p in profiles):
+            print(f"Error: duplicate profile name '{name}'", file=sys.stderr)
+            sys.exit(1)
+        profiles.append({
+            "name": name,
+            "keywords": split_option(entry.get("keywords")),
+            "seniorities": split_option(entry.get("seniority")),
+            "exclude_kw": split_option(entry.get("exclude_keywords")),
+            "remote_only": bool(entry.get("remote_only", False)),
+            "min_score": float(entry.get("min_score", 0)),
+            "top_k": int(entry.get("top_k", 0)),
+        })
+    return profiles
+
+
+class HitMatrix:
+    """Keyword hits of a batch of jobs for many profiles, found in one scan per job.
+
+    Every profile's keywords and exclusions are pooled and given one bit
+    each. Row i holds job i's masks: pooled keywords in its title, pooled
+    keywords anywhere in its text, and exclusions in its title, along with
+    the seniority and remote flags the profiles filter on.
+    """
+
+    def __init__(self, jobs, keywords, exclude_keywords):
+        self.patterns = sorted({kw.lower().strip() for kw in keywords} - {""})
+        self.bits = {p: 1 << i for i, p in enumerate(self.patterns)}
+        self.excludes = sorted({kw.lower() for kw in exclude_keywords})
+        self.exclude_bits = {p: 1 << i for i, p in enumerate(self.excludes)}
+        matcher = KeywordMatcher(self.patterns)
+        self.jobs = []
+        self.title_hits = []
+        self.text_hits = []
+        self.excluded = []
+        self.seniority = []
+        self.remote = []
+        for job in jobs:
+            title, full_text = job_texts(job)
+            if matcher.regex is None:
+                in_title = [p for p in self.patterns if p in title]
+                found = [p for p in self.patterns if p in full_text]
+            else:
+                in_title, found = matcher.hits(title, full_text)
+            self.jobs.append(job)
+            self.title_hits.append(self.mask(in_title))
+            self.text_hits.append(self.mask(found))
+            self.excluded.append(sum(bit for p, bit in self.exclude_bits.items() if p in title))
+            self.seniority.append((job.get("seniority", "") or "").lower())
+            self.remote.append(bool(job.get("remote", False)))
+
+    def mask(self, patterns):
+        bits = self.bits
+        return sum(bits[p] for p in patterns)
+
+    def rank(self, profile):
+        """Return [(score, job index, matched keywords)] for one profile, best first.
+
+        Scores, filters and ties follow filter_jobs() with the profile's
+        options, sorted as filter-jobs.py sorts its JSON output.
+        """
+        keywords = profile["keywords"]
+        keyword_bits = [(kw, self.bits[kw.lower().strip()]) for kw in keywords]
+        wanted = sum({bit for _, bit in keyword_bits})
+        exclude_mask = sum(self.exclude_bits[kw.lower()] for kw in set(profile["exclude_kw"]))
+        seniorities = {s.lower() for s in profile["seniorities"]}
+        remote_only = profile["remote_only"]
+        min_score = profile["min_score"]
+        total_kw = len(keywords) * 3
+
+        ranked = []
+        for i in range(len(self.jobs)):
+            if remote_only and not self.remote[i]:
+                continue
+            if seniorities and self.seniority[i] not in seniorities:
+                continue
+            if not keywords:
+                score, matched = 50, []
+            elif self.excluded[i] & exclude_mask:
+                continue
+            elif not self.text_hits[i] & wanted:
+                score, matched = 0, []
+            else:
+                in_title = self.title_hits[i]
+                found = self.text_hits[i]
+                matched = []
+                hits = 0
+                for kw, bit in keyword_bits:
+                    if bit & in_title:
+                        hits += 3
+                        matched.append(kw)
+                    elif bit & found:
+                        hits += 1
+                        matched.append(kw)
+                score = min(round(hits / total_kw * 100, 1), 100)
+            if score < min_score:
+                continue
+            ranked.append((score, i, matched))
+        ranked.sort(key=lambda r: r[0], reverse=True)
+        return ranked[:profile["top_k"]] if profile["top_k"] > 0 else ranked
+
+
+def score_profiles(jobs, profiles):
+    """Score jobs against every profile. Yields (profile name, ranked jobs).
+
+    Profiles are ranked one at a time, as they are consumed. Each ranked job
+    is a copy carrying that profile's preliminary_relevance_score and
+    matched_keywords.
+    """
+    matrix = HitMatrix(jobs, [kw for p in profiles for kw in p["keywords"]],
+                       [kw for p in profiles for kw in p["exclude_kw"]])
+    for profile in profiles:
+        ranked = []
+        for score, i, matched in matrix.rank(profile):
+            job = matrix.jobs[i].copy()
+            job["preliminary_relevance_score"] = score
+            job["matched_keywords"] = matched
+            ranked.append(job)
+        yield profile["name"], ranked
+
+
+def write_profile_results(results, fmt, output_dir=""):
+    """Write each profile's ranked jobs to OUTPUT_DIR/<name>.<fmt>, or all to stdout.
+
+    On stdout, JSON is one object keyed by profile name and NDJSON one
+    {"profile", "jobs"} object per line. Returns the number of jobs written.
+    """
+    written = 0
+    if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    elif fmt == "json":
+        sys.stdout.write("{")
+    n = -1
+    for n, (name, jobs) in enumerate(results):
+        written += len(jobs)
+        if output_dir:
+            with open(Path(output_dir) / f"{name}.{fmt}", "w") as fh:
+                write_jobs(jobs, fh, fmt)
+        elif fmt == "ndjson":
+            sys.stdout.write(json.dumps({"profile": name, "jobs": jobs}, default=json_default) + "\n")
+        else:
+            # Same text as json.dump() of the whole object with indent=2
+            ranked = json.dumps(jobs, indent=2, default=json_default).replace("\n", "\n  ")
+            sys.stdout.write(f"{',' if n else ''}\n  {json.dumps(name)}: {ranked}")
+    if not output_dir and fmt == "json":
+        sys.stdout.write("\n}" if n >= 0 else "}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filter and score job listings")
+    parser.add_argument("--keywords", default="",
+                        help="Comma-separated keywords to match (e.g., 'product,design,UX')")
+    parser.add_argument("--seniority", default="",
+                        help="Comma-separated seniority levels to include (e.g., 'senior,director')")
+    parser.add_argument("--remote-only", action="store_true",
+                        help="Only include remote positions")
+    parser.add_argument("--exclude-keywords", default="",
+                        help="Comma-separated keywords to exclude")
+    parser.add_argument("--min-score", type=float, default=0,
+                        help="Minimum relevance score to include (0-100)")
+    parser.add_argument("--format", default="json", choices=FORMATS,
+                        help="Input/output format: JSON array (default), one job per line, or a binary columns file")
+    parser.add_argument("--rank", default="keyword", choices=RANKERS,
+                        help="Scoring: keyword hit count (default) or BM25F relevance over the batch")
+    parser.add_argument("--top-k", type=int, default=0,
+                        help="Keep only the K best-scoring jobs, best first (bounded memory)")
+    parser.add_argument("--profiles", default="",
+                        help="JSON file of candidate profiles to score every job against in one pass "
+                             "(replaces the single-profile options above)")
+    parser.add_argument("--output-dir", default="",
+                        help="With --profiles, write each profile's ranked jobs to DIR/<name>.json|ndjson")
+    RunStats.add_arguments(parser)
+    args = parser.parse_args()
+    run_stats = RunStats.from_args("filter-jobs", args)
+
+    keywords = [k.strip() for k in args.keywords.split(",") if k.strip()] if args.keywords else []
+    seniorities = [s.strip() for s in args.seniority.split(",") if s.strip()] if args.seniority else []
+    exclude_kw = [k.strip() for k in args.exclude_keywords.split(",") if k.strip()] if args.exclude_keywords else []
+
+    if args.profiles:
+        if args.rank == "bm25":
+            print("--profiles scores with --rank keyword only", file=sys.stderr)
+            sys.exit(1)
+        if args.format == "columns" and not args.output_dir:
+            print("--profiles with --format columns needs --output-dir", file=sys.stderr)
+            sys.exit(1)
+        profiles = load_profiles(args.profiles)
+        with run_stats.phase("transform"):
+            results = score_profiles(read_jobs(sys.stdin, args.format, run_stats), profiles)
+        with run_stats.phase("serialize"):
+            written = write_profile_results(run_stats.timed(results, "transform"), args.format,
+                                            args.output_dir)
+        run_stats.count("items_out", written)
+        run_stats.count("profiles", len(profiles))
+        run_stats.report()
+        return
+
+    if args.rank == "bm25":
+        if not any(words(kw) for kw in keywords):
+            print("--rank bm25 needs --keywords with at least one word of two or more letters",
+                  file=sys.stderr)
+            sys.exit(1)
+        with run_stats.phase("transform"):
+            results = rank_bm25(read_jobs(sys.stdin, args.format, run_stats), keywords, seniorities,
+                                exclude_kw, args.remote_only, args.min_score, args.top_k)
+        write_jobs(results, sys.stdout, args.format, run_stats)
+        run_stats.report()
+        return
+
+    results = filter_jobs(read_jobs(sys.stdin, args.format, run_stats), keywords, seniorities,
+                          exclude_kw, args.remote_only, args.min_score)
 
-    # Sort by score descending
-    results.sort(key=lambda j: j.get("preliminary_relevance_score", 0), reverse=True)
+    if args.format != "ndjson" or args.top_k > 0:
+        # Sort by score descending
+        with run_stats.phase("transform"):
+            results = best_first(results, args.top_k)
 
-    json.dump(results, sys.stdout, indent=2, default=str)
+    write_jobs(results, sys.stdout, args.format, run_stats)
+    run_stats.report()
 
 
 if __name__ == "__main__":
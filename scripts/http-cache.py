@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Fetch through the shared HTTP response cache, or inspect and trim it.
+
+Usage:
+    python3 scripts/http-cache.py curl -s -w "\\n%{http_code}" https://api.lever.co/v0/postings/acme
+    python3 scripts/http-cache.py stats
+    python3 scripts/http-cache.py --http-cache-max-mb 100 evict
+    python3 scripts/http-cache.py clear
+
+curl takes the subset of curl options the scanners use (-s, -L, -w, -X, -H,
+-d, -o, --max-redirs) and prints what curl would, but goes through
+httpcache.HTTPCache: a fresh response is printed from disk, a stale one is
+revalidated. It exits 7, like curl, when no response arrives. The scan-*.sh,
+search-*.sh and fetch-rss.sh scripts call it instead of curl when
+JOB_MATCHER_HTTP_CACHE=1 is set.
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+
+from httpcache import HTTPCache, add_cache_arguments, cache_from_args, source_type
+from httppool import HTTPPool
+
+# curl's exit code for "failed to connect"
+NO_RESPONSE = 7
+CURL_MAX_REDIRS = 50
+
+
+def header_dict(values):
+    headers = {}
+    for value in values:
+        name, _, content = value.partition(":")
+        headers[name.strip()] = content.strip()
+    return headers
+
+
+def write_out(template, status):
+    """Expand the -w template: %{http_code} and backslash escapes."""
+    return (template.replace("%{http_code}", f"{status:03d}")
+            .replace("\\n", "\n").replace("\\t", "\t").replace("\\r", "\r"))
+
+
+def curl(args):
+    try:
+        cache = cache_from_args(args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    method = args.request or ("POST" if args.data is not None else "GET")
+    pool = HTTPPool(per_host=1, timeout=args.max_time, retries=1, cache=cache)
+    response = pool.request(args.url, method, args.data, header_dict(args.header),
+                            args.max_redirs if args.location else 0)
+    pool.close()
+    if cache is not None:
+        cache.close()
+    if not response.status:
+        if not args.silent:
+            print(f"curl: ({NO_RESPONSE}) {response.error}", file=sys.stderr)
+        sys.stdout.write(write_out(args.write_out, 0))
+        sys.exit(NO_RESPONSE)
+    if args.output:
+        with open(args.output, "wb") as fh:
+            fh.write(response.body)
+    else:
+        sys.stdout.buffer.write(response.body)
+        sys.stdout.flush()
+    sys.stdout.write(write_out(args.write_out, response.status))
+
+
+def open_cache(args):
+    return HTTPCache(args.http_cache, args.http_cache_max_mb)
+
+
+def stats(args):
+    cache = open_cache(args)
+    by_source = Counter()
+    total = 0
+    oldest = None
+    for meta_path in cache.path.glob("*.json"):
+        try:
+            with open(meta_path) as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        by_source[source_type(meta.get("url", ""))] += 1
+        total += meta.get("size", 0)
+        oldest = min(oldest or meta.get("fetched", 0), meta.get("fetched", 0))
+    print(json.dumps({
+        "entries": sum(by_source.values()),
+        "bytes": total,
+        "by_source": dict(by_source),
+        "oldest_hours": round((time.time() - oldest) / 3600, 1) if oldest else None,
+    }))
+
+
+def evict(args):
+    cache = open_cache(args)
+    cache.evict()
+    print(json.dumps(cache.summary()))
+
+
+def clear(args):
+    open_cache(args).clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch through or manage the HTTP response cache")
+    add_cache_arguments(parser)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("curl", help="Fetch a URL like curl, through the cache")
+    fetch.add_argument("url")
+    fetch.add_argument("-s", "--silent", action="store_true")
+    fetch.add_argument("-L", "--location", action="store_true", help="Follow redirects")
+    fetch.add_argument("--max-redirs", type=int, default=CURL_MAX_REDIRS)
+    fetch.add_argument("-w", "--write-out", default="", help="Printed after the body; knows %%{http_code}")
+    fetch.add_argument("-X", "--request", default="", help="Method (default GET, or POST with -d)")
+    fetch.add_argument("-H", "--header", action="append", default=[], help="'Name: value' header")
+    fetch.add_argument("-d", "--data", default=None, help="Request body")
+    fetch.add_argument("-o", "--output", default="", help="Write the body to this file")
+    fetch.add_argument("-m", "--max-time", type=float, default=30, help="Socket timeout in seconds")
+    fetch.set_defaults(run=curl)
+    commands.add_parser("stats", help="Entries and bytes by source type").set_defaults(run=stats)
+    commands.add_parser("evict", help="Trim to --http-cache-max-mb").set_defaults(run=evict)
+    commands.add_parser("clear", help="Remove every entry").set_defaults(run=clear)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
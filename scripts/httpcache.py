@@ -0,0 +1,216 @@
+"""On-disk HTTP response cache shared by the fetch scripts, with revalidation.
+
+Each cached response is two files in the cache directory, named by the
+SHA-256 of its key (method, URL and, for POSTs, a hash of the request body):
+
+    KEY.body    the response body, decompressed
+    KEY.json    {"url", "final_url", "method", "status", "content_type",
+                 "etag", "last_modified", "fetched", "size"}
+
+Plain files keep the layout usable from mcp-fetch-server.mjs and the shell
+scanners (through http-cache.py curl). Writes go through a temporary file
+and os.replace, so concurrent runs never read half an entry.
+
+A response younger than its source type's TTL (see SOURCE_TTLS) is served
+without a request. An older one is revalidated with If-None-Match /
+If-Modified-Since; a 304 is answered from disk and restarts the TTL, so a
+repeated run costs headers only. The body file's mtime records last use;
+evict() removes least recently used entries beyond max_mb.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "data" / "http-cache"
+DEFAULT_MAX_MB = 512
+
+# Seconds a response is served without revalidating, per source type
+SOURCE_TTLS = {"ats": 4 * 3600, "api": 3600, "rss": 1800, "other": 3600}
+ATS_HOSTS = ("boards-api.greenhouse.io", "api.ashbyhq.com", "api.lever.co", "apply.workable.com")
+API_HOSTS = ("remotive.com", "remoteok.com", "jobicy.com", "himalayas.app", "www.themuse.com")
+RSS_PATH = re.compile(r"(\.rss|\.xml|/feed|/rss)/?$")
+DURATION = re.compile(r"(\d+(?:\.\d+)?)([smhd]?)")
+UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def source_type(url):
+    """The TTL class of a URL: ats, api, rss or other."""
+    parts = urlsplit(url)
+    if RSS_PATH.search(parts.path):
+        return "rss"
+    if parts.hostname in ATS_HOSTS:
+        return "ats"
+    if parts.hostname in API_HOSTS:
+        return "api"
+    return "other"
+
+
+def parse_ttls(spec):
+    """SOURCE_TTLS with overrides from "ats=6h,rss=20m" (bare numbers are seconds)."""
+    ttls = dict(SOURCE_TTLS)
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, value = item.partition("=")
+        match = DURATION.fullmatch(value.strip())
+        if name.strip() not in SOURCE_TTLS or not match:
+            raise ValueError(f"bad TTL '{item}' (expected one of {', '.join(SOURCE_TTLS)} = e.g. 30m, 4h)")
+        ttls[name.strip()] = float(match[1]) * UNITS[match[2]]
+    return ttls
+
+
+def cache_key(url, method="GET", body=None):
+    key = f"{method.upper()} {url}"
+    if body:
+        data = body.encode() if isinstance(body, str) else body
+        key += " " + hashlib.sha256(data).hexdigest()
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class HTTPCache:
+    """Cached 200 responses by request, with validators and fetch time."""
+
+    def __init__(self, path=DEFAULT_DIR, max_mb=DEFAULT_MAX_MB, ttls=None):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.ttls = ttls or dict(SOURCE_TTLS)
+        self.stats = Counter()
+        self.lock = threading.Lock()
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def files(self, key):
+        return self.path / f"{key}.json", self.path / f"{key}.body"
+
+    def lookup(self, url, method="GET", body=None):
+        """The stored metadata for a request (with its "key"), or None."""
+        key = cache_key(url, method, body)
+        meta_path, body_path = self.files(key)
+        try:
+            with open(meta_path) as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not body_path.exists():
+            return None
+        meta["key"] = key
+        return meta
+
+    def is_fresh(self, meta, url):
+        return time.time() - meta.get("fetched", 0) < self.ttls.get(source_type(url), SOURCE_TTLS["other"])
+
+    def validators(self, meta):
+        """Conditional request headers for a stored response."""
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def read(self, meta):
+        """The stored body, marking the entry used; None if it has gone."""
+        _, body_path = self.files(meta["key"])
+        try:
+            data = body_path.read_bytes()
+            os.utime(body_path)
+        except OSError:
+            return None
+        return data
+
+    def store(self, url, method, body, final_url, headers, data):
+        """Save a 200 response; headers are lowercased."""
+        key = cache_key(url, method, body)
+        meta_path, body_path = self.files(key)
+        write_atomic(body_path, data)
+        write_atomic(meta_path, json.dumps({
+            "url": url,
+            "final_url": final_url,
+            "method": method.upper(),
+            "status": 200,
+            "content_type": headers.get("content-type", ""),
+            "etag": headers.get("etag", ""),
+            "last_modified": headers.get("last-modified", ""),
+            "fetched": time.time(),
+            "size": len(data),
+        }).encode())
+        self.count("stored")
+
+    def revalidated(self, meta, headers):
+        """Restart the TTL of an entry a 304 confirmed, taking any new validators."""
+        meta = dict(meta)
+        key = meta.pop("key")
+        meta["fetched"] = time.time()
+        for field, header in (("etag", "etag"), ("last_modified", "last-modified")):
+            if headers.get(header):
+                meta[field] = headers[header]
+        write_atomic(self.files(key)[0], json.dumps(meta).encode())
+
+    def entries(self):
+        """(key, size, last used) for every complete entry."""
+        found = []
+        for body_path in self.path.glob("*.body"):
+            try:
+                st = body_path.stat()
+            except OSError:
+                continue
+            found.append((body_path.stem, st.st_size, st.st_mtime))
+        return found
+
+    def evict(self):
+        """Drop least recently used entries until the bodies fit in max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_bytes:
+                break
+            for file in self.files(key):
+                try:
+                    file.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+            self.count("evicted")
+
+    def clear(self):
+        for file in list(self.path.glob("*.json")) + list(self.path.glob("*.body")):
+            file.unlink(missing_ok=True)
+
+    def summary(self):
+        """Counts for a stats line: served fresh, revalidated by a 304, stored, evicted."""
+        return {key: self.stats[key] for key in ("fresh", "revalidated", "stored", "evicted")}
+
+    def close(self):
+        self.evict()
+
+
+def write_atomic(path, data):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def add_cache_arguments(parser):
+    """The --http-cache options shared by the fetch scripts."""
+    parser.add_argument("--http-cache", default=str(DEFAULT_DIR), help="Response cache directory")
+    parser.add_argument("--no-http-cache", action="store_true", help="Fetch everything, ignoring the cache")
+    parser.add_argument("--http-cache-ttl", default="",
+                        help="Freshness per source type, e.g. 'ats=4h,api=1h,rss=30m,other=1h' (the defaults)")
+    parser.add_argument("--http-cache-max-mb", type=float, default=DEFAULT_MAX_MB,
+                        help="Evict least recently used responses beyond this size")
+
+
+def cache_from_args(args):
+    """An HTTPCache for the parsed options, or None with --no-http-cache."""
+    if args.no_http_cache:
+        return None
+    return HTTPCache(args.http_cache, args.http_cache_max_mb, parse_ttls(args.http_cache_ttl))
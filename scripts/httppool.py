@@ -0,0 +1,218 @@
+"""Keep-alive HTTP client shared by the Python fetch scripts.
+
+HTTPPool keeps idle connections per host and reuses them, caps concurrent
+requests per host (optionally also spacing them min_interval apart), and
+retries connection errors, timeouts, 429 and 5xx responses with exponential
+backoff. It can follow redirects. It is safe to call from many threads.
+
+With a cache (httpcache.HTTPCache), GET and POST responses are served from
+disk while fresh and revalidated with their ETag / Last-Modified after; a
+304 comes back as the cached 200 response.
+
+Requests can be pointed at a local stand-in server with base_url; per-host
+limits still apply to the original host names, so a test run behaves like
+the real one.
+"""
+
+import gzip
+import http.client
+import random
+import threading
+import time
+from collections import Counter, namedtuple
+from urllib.parse import urljoin, urlsplit
+
+
+USER_AGENT = "JobMatcher/2.0 (job search tool)"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_RETRY_AFTER = 30
+
+Response = namedtuple("Response", "url status headers body error")
+
+
+def cached_response(meta, data):
+    headers = {"content-type": meta.get("content_type", ""), "x-cache": "hit"}
+    return Response(meta.get("final_url") or meta["url"], 200, headers, data, None)
+
+
+class HostSlot:
+    """Concurrency limit and idle keep-alive connections for one host."""
+
+    def __init__(self, limit, min_interval=0):
+        self.semaphore = threading.BoundedSemaphore(limit)
+        self.idle = []
+        self.lock = threading.Lock()
+        self.min_interval = min_interval
+        self.next_start = 0.0
+
+    def wait_turn(self):
+        """Sleep until min_interval has passed since the previous request started."""
+        if not self.min_interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def take(self, address):
+        with self.lock:
+            for i, (addr, conn) in enumerate(self.idle):
+                if addr == address:
+                    del self.idle[i]
+                    return conn
+        return None
+
+    def give(self, address, conn):
+        with self.lock:
+            self.idle.append((address, conn))
+
+    def close(self):
+        with self.lock:
+            for _, conn in self.idle:
+                conn.close()
+            self.idle = []
+
+
+class HTTPPool:
+    """Pooled HTTP/1.1 client with per-host limits, timeouts and retries."""
+
+    def __init__(self, per_host=4, timeout=20, retries=3, backoff=0.5, base_url="", min_interval=0,
+                 cache=None):
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.base = urlsplit(base_url) if base_url else None
+        self.slots = {}
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.cache = cache
+
+    def slot(self, host):
+        with self.lock:
+            if host not in self.slots:
+                self.slots[host] = HostSlot(self.per_host, self.min_interval)
+            return self.slots[host]
+
+    def connect(self, scheme, netloc):
+        self.count("connections")
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def request(self, url, method="GET", body=None, headers=None, max_redirects=0):
+        """Send one request, retrying transient failures. Never raises.
+
+        Follows up to max_redirects redirects; Response.url is the final URL.
+        Returns a Response; status is 0 and error is set if no response
+        arrived after the last retry, or if there were too many redirects.
+        """
+        if self.cache is None or method not in ("GET", "POST"):
+            return self.fetch(url, method, body, headers, max_redirects)
+        meta = self.cache.lookup(url, method, body)
+        send_headers = headers
+        if meta is not None:
+            data = self.cache.read(meta) if self.cache.is_fresh(meta, url) else None
+            if data is not None:
+                self.cache.count("fresh")
+                return cached_response(meta, data)
+            send_headers = {**(headers or {}), **self.cache.validators(meta)}
+        response = self.fetch(url, method, body, send_headers, max_redirects)
+        if response.status == 304 and meta is not None:
+            data = self.cache.read(meta)
+            if data is not None:
+                self.cache.revalidated(meta, response.headers)
+                self.cache.count("revalidated")
+                return cached_response(meta, data)
+            # Evicted since the lookup: fetch it again unconditionally
+            response = self.fetch(url, method, body, headers, max_redirects)
+        if response.status == 200:
+            self.cache.store(url, method, body, response.url, response.headers, response.body)
+        return response
+
+    def fetch(self, url, method, body, headers, max_redirects):
+        """request() without the cache."""
+        for _ in range(max_redirects + 1):
+            response = self.request_once(url, method, body, headers)
+            location = response.headers.get("location")
+            if not max_redirects or response.status not in REDIRECT_STATUSES or not location:
+                return response
+            url = urljoin(url, location)
+            if response.status not in (307, 308):
+                method, body = "GET", None
+        return Response(url, 0, response.headers, b"", "too many redirects")
+
+    def request_once(self, url, method, body, headers):
+        """Send one request without following redirects."""
+        parts = urlsplit(url)
+        target = self.base or parts
+        address = (target.scheme, target.netloc)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        send_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip"}
+        send_headers.update(headers or {})
+        if isinstance(body, str):
+            body = body.encode()
+        slot = self.slot(parts.netloc)
+
+        response = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.count("retries")
+                time.sleep(self.retry_delay(attempt, response))
+            with slot.semaphore:
+                slot.wait_turn()
+                response = self.send(slot, address, method, path, body, send_headers, url)
+            if response.status and response.status not in RETRY_STATUSES:
+                break
+        self.count("requests")
+        self.count("bytes", len(response.body))
+        return response
+
+    def send(self, slot, address, method, path, body, headers, url):
+        """One attempt on a pooled connection (a fresh one if the idle one went stale)."""
+        conn = slot.take(address)
+        reused = conn is not None
+        if conn is None:
+            conn = self.connect(*address)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            if reused:
+                # Server closed the idle connection; retry once on a new one
+                return self.send(slot, address, method, path, body, headers, url)
+            return Response(url, 0, {}, b"", str(e) or type(e).__name__)
+        if resp.will_close:
+            conn.close()
+        else:
+            slot.give(address, conn)
+        resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+        if resp_headers.get("content-encoding") == "gzip":
+            try:
+                data = gzip.decompress(data)
+            except (OSError, EOFError) as e:
+                return Response(url, 0, resp_headers, b"", f"bad gzip body: {e}")
+        return Response(url, resp.status, resp_headers, data, None)
+
+    def retry_delay(self, attempt, response):
+        """Exponential backoff with jitter, or the server's Retry-After if given."""
+        retry_after = response.headers.get("retry-after", "") if response else ""
+        if retry_after.isdigit():
+            return min(int(retry_after), MAX_RETRY_AFTER)
+        return self.backoff * (2 ** (attempt - 1)) * (1 + random.random() / 2)
+
+    def close(self):
+        with self.lock:
+            slots = list(self.slots.values())
+        for slot in slots:
+            slot.close()
@@ -0,0 +1,258 @@
+"""Binary columnar job files, read through mmap with fields decoded on first use.
+
+A JSON job list makes every stage parse every description, the bulk of the
+bytes, even when it only looks at company and title. In a columns file:
+
+    b"JOBCOLS1", uint32 header length, JSON header, padding to 8 bytes
+    a uint8 flags column
+    one uint32 column per coded field: an index into the header's "values"
+    a uint64 start and a uint32 length column per heap field
+    the heap: every heap entry, in row order
+
+Coded fields are the small, repetitive ones (source, company, location,
+seniority, salary, tags, ...), stored once per distinct value. Heap fields
+(id, title, description_text, urls, ...) are stored as b"s" + UTF-8 text, or
+b"j" + JSON for values that are not strings; an empty entry means "absent".
+Keys outside the schema go in the "extra" heap field as one JSON object, and
+rows that are not normalized jobs at all are kept whole there (flags 1).
+
+ColumnFile maps the file (or reads it, when stdin is a pipe) and yields
+ColumnJob records, jobrecord.Job subclasses whose fields are decoded when a
+stage reads them. Heap text is decoded on each access rather than kept, so
+it stays in the mapped file; writing a ColumnJob back to a columns file
+copies the heap entries a stage did not replace as raw bytes.
+"""
+
+import json
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+from jobrecord import FIELDS, Job, job_record
+
+MAGIC = b"JOBCOLS1"
+VERSION = 2
+HEAP_FIELDS = ("id", "source_id", "title", "description_text", "description_simhash", "url", "apply_url",
+               "extra")
+CODED_FIELDS = tuple(f for f in FIELDS if f not in HEAP_FIELDS)
+# Row flag: the row is a whole JSON object in the extra field, not a Job
+WHOLE_ROW = 1
+
+
+def encode(value):
+    """Heap entry bytes for one value."""
+    if isinstance(value, str):
+        return b"s" + value.encode("utf-8", "surrogatepass")
+    return b"j" + json.dumps(value, default=str).encode()
+
+
+def decode(entry):
+    """Value of a heap entry (bytes or memoryview); absent entries are None."""
+    if not entry:
+        return None
+    if entry[0] == 0x73:  # "s"
+        return str(entry[1:], "utf-8", "surrogatepass")
+    return json.loads(str(entry[1:], "utf-8"))
+
+
+def column_bytes(column):
+    data = column.tobytes()
+    return data + b"\0" * (-len(data) % 8)
+
+
+def write_columns(jobs, stream):
+    """Write jobs (Jobs, ColumnJobs or dicts) to a binary stream as a columns file.
+
+    Heap entries are spooled to a temporary file as rows arrive, so only the
+    fixed-width columns are held in memory. Returns the number of rows written.
+    """
+    values = []
+    value_ids = {}
+    coded = {field: array("I") for field in CODED_FIELDS}
+    starts = {field: array("Q") for field in HEAP_FIELDS}
+    lengths = {field: array("I") for field in HEAP_FIELDS}
+    flags = array("B")
+
+    def code(value):
+        key = json.dumps(value, default=str)
+        index = value_ids.get(key)
+        if index is None:
+            index = value_ids[key] = len(values)
+            values.append(json.loads(key))
+        return index
+
+    absent = code(None)
+    with tempfile.TemporaryFile() as heap:
+        size = 0
+
+        def put(field, entry):
+            nonlocal size
+            starts[field].append(size)
+            lengths[field].append(len(entry))
+            heap.write(entry)
+            size += len(entry)
+
+        for job in jobs:
+            job = job_record(job)
+            if not isinstance(job, Job):
+                flags.append(WHOLE_ROW)
+                for field in CODED_FIELDS:
+                    coded[field].append(absent)
+                for field in HEAP_FIELDS:
+                    put(field, encode(job) if field == "extra" else b"")
+                continue
+            flags.append(0)
+            for field in CODED_FIELDS:
+                coded[field].append(code(getattr(job, field)))
+            for field in HEAP_FIELDS:
+                raw = job.raw_entry(field) if isinstance(job, ColumnJob) else None
+                if raw is not None:
+                    put(field, raw)
+                elif field == "extra":
+                    put(field, encode(job.extra) if job.extra else b"")
+                else:
+                    put(field, encode(getattr(job, field)))
+
+        header = json.dumps({
+            "version": VERSION,
+            "byteorder": sys.byteorder,
+            "rows": len(flags),
+            "coded_fields": CODED_FIELDS,
+            "heap_fields": HEAP_FIELDS,
+            "values": values,
+        }, default=str).encode()
+        prefix = MAGIC + struct.pack("<I", len(header)) + header
+        stream.write(prefix + b"\0" * (-len(prefix) % 8))
+        stream.write(column_bytes(flags))
+        for field in CODED_FIELDS:
+            stream.write(column_bytes(coded[field]))
+        for field in HEAP_FIELDS:
+            stream.write(column_bytes(starts[field]))
+            stream.write(column_bytes(lengths[field]))
+        heap.seek(0)
+        shutil.copyfileobj(heap, stream)
+    stream.flush()
+    return len(flags)
+
+
+class ColumnFile:
+    """Read-only view of a columns file from a binary stream."""
+
+    def __init__(self, stream):
+        try:
+            self.buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            # Pipes and empty files cannot be mapped
+            self.buffer = stream.read()
+        view = memoryview(self.buffer)
+        self.rows = 0
+        if not len(view):
+            return
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError("not a job columns file")
+        (size,) = struct.unpack_from("<I", view, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(str(view[start:start + size], "utf-8"))
+        if header.get("version") != VERSION or header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"unsupported columns file (version {header.get('version')}, "
+                             f"{header.get('byteorder')} endian)")
+        if tuple(header["coded_fields"]) != CODED_FIELDS or tuple(header["heap_fields"]) != HEAP_FIELDS:
+            raise ValueError("columns file has a different field layout")
+        self.rows = rows = header["rows"]
+        self.values = header["values"]
+        # Lists and objects are decoded afresh per row, since stages mutate them
+        self.mutable = {i: json.dumps(v) for i, v in enumerate(self.values) if isinstance(v, (list, dict))}
+
+        pos = start + size
+        pos += -pos % 8
+        self.flags = view[pos:pos + rows]
+        pos += rows + (-rows % 8)
+        self.coded = {}
+        for field in CODED_FIELDS:
+            self.coded[field] = view[pos:pos + 4 * rows].cast("I")
+            pos += 4 * rows + (-4 * rows % 8)
+        self.starts = {}
+        self.lengths = {}
+        for field in HEAP_FIELDS:
+            self.starts[field] = view[pos:pos + 8 * rows].cast("Q")
+            pos += 8 * rows
+            self.lengths[field] = view[pos:pos + 4 * rows].cast("I")
+            pos += 4 * rows + (-4 * rows % 8)
+        self.heap = view[pos:]
+
+    def __len__(self):
+        return self.rows
+
+    def value(self, row, field):
+        """Decode one field of one row."""
+        if field in self.coded:
+            index = self.coded[field][row]
+            text = self.mutable.get(index)
+            return self.values[index] if text is None else json.loads(text)
+        return decode(self.raw(row, field))
+
+    def raw(self, row, field):
+        """The undecoded heap entry of a field, as a memoryview."""
+        start = self.starts[field][row]
+        return self.heap[start:start + self.lengths[field][row]]
+
+    def jobs(self):
+        """Yield each row as a ColumnJob, or a plain dict for whole-JSON rows."""
+        for row in range(self.rows):
+            if self.flags[row] == WHOLE_ROW:
+                yield self.value(row, "extra")
+            else:
+                yield ColumnJob(self, row)
+
+
+class ColumnJob(Job):
+    """A Job backed by a row of a ColumnFile; fields decode on first access."""
+
+    __slots__ = ("columns", "row")
+
+    def __init__(self, columns, row):
+        self.columns = columns
+        self.row = row
+
+    def __getattr__(self, name):
+        # Only reached for slots not yet filled
+        if name in FIELDS or name == "extra":
+            value = self.columns.value(self.row, name)
+            if name in HEAP_FIELDS and type(value) is str:
+                # Immutable and cheap to decode again: leave it in the map
+                return value
+            setattr(self, name, value)
+            return value
+        raise AttributeError(name)
+
+    def loaded(self, field):
+        """Check whether a field has been decoded (or set) already."""
+        try:
+            Job.__dict__[field].__get__(self)
+        except AttributeError:
+            return False
+        return True
+
+    def raw_entry(self, field):
+        """Undecoded heap entry of a field a stage has not replaced, else None."""
+        if field in HEAP_FIELDS and not self.loaded(field):
+            return self.columns.raw(self.row, field)
+        return None
+
+    def copy(self):
+        """Shallow copy that keeps unread fields undecoded."""
+        job = ColumnJob(self.columns, self.row)
+        for field in FIELDS:
+            if self.loaded(field):
+                setattr(job, field, getattr(self, field))
+        if self.loaded("extra"):
+            job.extra = dict(self.extra) if self.extra else None
+        return job
+
+
+def read_columns(stream):
+    """Yield the jobs of a columns file read from a binary stream."""
+    yield from ColumnFile(stream).jobs()
@@ -0,0 +1,127 @@
+"""Compact in-memory records for normalized jobs.
+
+A normalized job as a dict costs a 21-entry hash table per job, and every
+job carries its own copy of strings like "greenhouse", "GUARANTEED" or the
+company name. Job keeps the schema fields in __slots__ instead, and interns
+the categorical ones, so a batch of 100k jobs holds one copy of each
+distinct value.
+
+Job behaves like the dict it replaces (job["title"], job.get(...),
+job[key] = value, setdefault, copy), so the scripts work on either. Keys
+outside the schema, such as preliminary_relevance_score or
+alternate_sources, go in a small overflow dict. Jobs become plain dicts
+again only when written out (see json_default()), with their keys in the
+same order, so the output is byte-identical.
+"""
+
+import sys
+from itertools import islice
+
+
+# The unified schema, in output order
+FIELDS = (
+    "id", "source", "source_id", "title", "company", "location", "remote", "work_mode",
+    "employment_type", "seniority", "salary_min", "salary_max", "salary_currency", "posted_date",
+    "description_text", "url", "apply_url", "departments", "tags", "verification_status",
+    "description_simhash",
+)
+FIELD_SET = frozenset(FIELDS)
+# Fields with few distinct values across a batch
+CATEGORICAL = ("source", "company", "location", "work_mode", "employment_type", "seniority",
+               "salary_currency", "verification_status")
+
+
+class Job:
+    """One normalized job: schema fields in slots, anything else in extra."""
+
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, *values, extra=None):
+        for field, value in zip(FIELDS, values):
+            setattr(self, field, value)
+        self.extra = extra
+
+    def __getitem__(self, key):
+        if key in FIELD_SET:
+            return getattr(self, key)
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key in FIELD_SET:
+            setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in FIELD_SET or (self.extra is not None and key in self.extra)
+
+    def __iter__(self):
+        yield from FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return len(FIELDS) + len(self.extra or ())
+
+    def __repr__(self):
+        return f"Job({self.to_dict()!r})"
+
+    def get(self, key, default=None):
+        if key in FIELD_SET:
+            return getattr(self, key)
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        """Shallow copy, like dict(job)."""
+        return Job(*(getattr(self, field) for field in FIELDS),
+                   extra=dict(self.extra) if self.extra else None)
+
+    def to_dict(self):
+        job = {field: getattr(self, field) for field in FIELDS}
+        if self.extra:
+            job.update(self.extra)
+        return job
+
+
+def job_record(job):
+    """Return a normalized job dict as a Job.
+
+    Only dicts that start with exactly the schema fields, in order, are
+    converted, so that writing the Job back out gives the same JSON. Anything
+    else (a partial job, other key orders, non-dicts) is returned unchanged.
+    """
+    if not isinstance(job, dict) or len(job) < len(FIELDS) or tuple(islice(job, len(FIELDS))) != FIELDS:
+        return job
+    values = list(job.values())
+    record = Job(*values[:len(FIELDS)])
+    for field in CATEGORICAL:
+        value = getattr(record, field)
+        if type(value) is str:
+            setattr(record, field, sys.intern(value))
+    if len(values) > len(FIELDS):
+        record.extra = dict(islice(job.items(), len(FIELDS), None))
+    return record
+
+
+def json_default(obj):
+    """json.dumps default= hook: Jobs as plain dicts, anything else as str()."""
+    if isinstance(obj, Job):
+        return obj.to_dict()
+    return str(obj)
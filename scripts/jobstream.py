@@ -0,0 +1,119 @@
+"""Read and write job lists as a JSON array or as NDJSON (one job per line).
+
+JSON arrays stay the default so existing pipelines keep working. With
+--format ndjson each stage reads and writes a job at a time, so piped
+stages run concurrently instead of waiting for the whole payload.
+
+The readers and write_jobs() take an optional runstats.RunStats, which
+times reading, parsing and serialization and counts jobs in and out.
+
+read_jobs() yields normalized jobs as jobrecord.Job records; write_jobs()
+turns them back into plain JSON objects.
+
+--format columns reads and writes the binary jobcolumns format instead, in
+which stages only decode the fields they use.
+"""
+
+import json
+import sys
+
+from jobcolumns import read_columns, write_columns
+from jobrecord import job_record, json_default
+
+
+# Formats for job lists on stdin/stdout
+TEXT_FORMATS = ("json", "ndjson")
+FORMATS = TEXT_FORMATS + ("columns",)
+
+
+def parse_error(message):
+    """Report malformed input the way the scripts always have, and exit."""
+    print(f"Error parsing JSON: {message}", file=sys.stderr)
+    sys.exit(1)
+
+
+def parse_document(raw):
+    """Parse raw text as one JSON document. Returns None if empty."""
+    if not raw.strip():
+        return None
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError as e:
+        parse_error(e)
+
+
+def read_document(stream, stats=None):
+    """Parse the whole of stream as one JSON document. Returns None if empty."""
+    if stats is None:
+        return parse_document(stream.read())
+    with stats.phase("read"):
+        raw = stream.read()
+    with stats.phase("parse"):
+        return parse_document(raw)
+
+
+def read_lines(stream, stats=None):
+    """Yield one parsed JSON value per non-blank line of stream."""
+    if stats is not None:
+        yield from stats.timed(read_lines(stats.timed(stream, "read")), "parse")
+        return
+    for lineno, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            parse_error(f"line {lineno}: {e}")
+
+
+def release_each(items):
+    """Yield the items of a list, dropping the list's reference to each as it goes."""
+    items.reverse()
+    while items:
+        yield items.pop()
+
+
+def read_column_file(stream):
+    """Yield the jobs of a jobcolumns file on a (text or binary) stream."""
+    try:
+        yield from read_columns(getattr(stream, "buffer", stream))
+    except ValueError as e:
+        print(f"Error reading columns: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def read_jobs(stream, fmt="json", stats=None):
+    """Yield jobs from a JSON array, NDJSON or columns stream, as compact Job records."""
+    if fmt == "ndjson":
+        jobs = read_lines(stream, stats)
+    elif fmt == "columns":
+        jobs = read_column_file(stream)
+        if stats is not None:
+            jobs = stats.timed(jobs, "read")
+    else:
+        document = read_document(stream, stats)
+        # Let each parsed dict be freed once it has become a Job
+        jobs = release_each(document) if isinstance(document, list) else document or ()
+    for job in jobs:
+        if stats is not None:
+            stats.count("items_in")
+        yield job_record(job)
+
+
+def write_jobs(jobs, stream, fmt="json", stats=None):
+    """Write jobs as a pretty-printed JSON array, as NDJSON or as a columns file."""
+    if stats is not None:
+        # Producing a lazy job is the stage's own work; the rest is serialization
+        with stats.phase("serialize"):
+            write_jobs(stats.timed(jobs, "transform", "items_out"), stream, fmt)
+        return
+    if fmt == "columns":
+        write_columns(jobs, getattr(stream, "buffer", stream))
+        return
+    if fmt == "ndjson":
+        for job in jobs:
+            stream.write(json.dumps(job, default=json_default))
+            stream.write("\n")
+        stream.flush()
+        return
+    json.dump(list(jobs), stream, indent=2, default=json_default)
@@ -0,0 +1,25 @@
+"""Import the hyphenated pipeline scripts (normalize-jobs.py etc.) as modules.
+
+The scripts are named for the command line, so `import normalize-jobs` is not
+possible. load_script("normalize-jobs") imports it once under the module
+name normalize_jobs and returns the cached module on later calls.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def load_script(name):
+    """Import scripts/<name>.py and return the module."""
+    module_name = name.replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -6,14 +6,17 @@
  * Implements MCP stdio transport (Content-Length framing) directly.
  *
  * Provides:
- *   fetch_url  — HTTP GET/POST with optional output_file for large responses
+ *   fetch_url  — HTTP GET/POST with optional output_file for large responses,
+ *                through the response cache in data/http-cache/ (httpcache.py)
  *   verify_url — Check if a job listing URL is still live
  */
 
 import * as https from "node:https";
 import * as http from "node:http";
+import * as crypto from "node:crypto";
 import * as fs from "node:fs";
 import * as path from "node:path";
+import { fileURLToPath } from "node:url";
 
 // ─── MCP Protocol Layer (Content-Length framing over stdio) ───────────────────
 
@@ -142,9 +145,16 @@ const TOOLS = [
           type: "string",
           description:
             "File path to write the response body to. When set, the tool " +
-            "returns only { status_code, content_length, output_file } " +
+            "returns only { status_code, content_length, output_file, cache } " +
             "instead of the full body.",
         },
+        cache: {
+          type: "boolean",
+          description:
+            "Serve fresh responses from data/http-cache/ and revalidate " +
+            "stale ones with ETag/Last-Modified (default: true)",
+          default: true,
+        },
       },
       required: ["url"],
     },
@@ -232,6 +242,135 @@ function httpRequest(url, options = {}) {
   });
 }
 
+// ─── Response cache (same layout as scripts/httpcache.py) ────────────────────
+
+const CACHE_DIR = path.join(
+  path.dirname(fileURLToPath(import.meta.url)), "..", "data", "http-cache"
+);
+const CACHE_MAX_BYTES = 512 * 1024 * 1024;
+// Seconds a response is served without revalidating, per source type
+const SOURCE_TTLS = { ats: 4 * 3600, api: 3600, rss: 1800, other: 3600 };
+const ATS_HOSTS = ["boards-api.greenhouse.io", "api.ashbyhq.com", "api.lever.co", "apply.workable.com"];
+const API_HOSTS = ["remotive.com", "remoteok.com", "jobicy.com", "himalayas.app", "www.themuse.com"];
+
+function sourceType(url) {
+  const parsed = new URL(url);
+  if (/(\.rss|\.xml|\/feed|\/rss)\/?$/.test(parsed.pathname)) return "rss";
+  if (ATS_HOSTS.includes(parsed.hostname)) return "ats";
+  if (API_HOSTS.includes(parsed.hostname)) return "api";
+  return "other";
+}
+
+function sha256(text) {
+  return crypto.createHash("sha256").update(text).digest("hex");
+}
+
+function cacheFiles(url, method, body) {
+  let key = `${method} ${url}`;
+  if (body) key += " " + sha256(body);
+  const base = path.join(CACHE_DIR, sha256(key));
+  return { meta: `${base}.json`, body: `${base}.body` };
+}
+
+function writeAtomic(file, data) {
+  const tmp = `${file}.${process.pid}.tmp`;
+  fs.writeFileSync(tmp, data);
+  fs.renameSync(tmp, file);
+}
+
+function readCached(files) {
+  try {
+    const meta = JSON.parse(fs.readFileSync(files.meta, "utf-8"));
+    const body = fs.readFileSync(files.body, "utf-8");
+    const now = new Date();
+    fs.utimesSync(files.body, now, now);
+    return { meta, body };
+  } catch {
+    return null;
+  }
+}
+
+function evictCache() {
+  const entries = [];
+  let total = 0;
+  for (const name of fs.readdirSync(CACHE_DIR)) {
+    if (!name.endsWith(".body")) continue;
+    try {
+      const st = fs.statSync(path.join(CACHE_DIR, name));
+      entries.push({ base: path.join(CACHE_DIR, name.slice(0, -5)), size: st.size, used: st.mtimeMs });
+      total += st.size;
+    } catch {
+      // Removed by another process meanwhile
+    }
+  }
+  entries.sort((a, b) => a.used - b.used);
+  for (const entry of entries) {
+    if (total <= CACHE_MAX_BYTES) break;
+    fs.rmSync(`${entry.base}.json`, { force: true });
+    fs.rmSync(`${entry.base}.body`, { force: true });
+    total -= entry.size;
+  }
+}
+
+/**
+ * httpRequest() through the cache: a response younger than its source
+ * type's TTL is served from disk, an older one is revalidated and a 304
+ * answered from disk. Only 200 responses are stored.
+ */
+async function cachedRequest(url, options = {}) {
+  const method = (options.method || "GET").toUpperCase();
+  if (method !== "GET" && method !== "POST") return httpRequest(url, options);
+  fs.mkdirSync(CACHE_DIR, { recursive: true });
+  const files = cacheFiles(url, method, options.body);
+  const cached = readCached(files);
+  const headers = { ...(options.headers || {}) };
+  if (cached) {
+    const { meta, body } = cached;
+    const fromCache = (cache) => ({
+      statusCode: 200,
+      headers: { "content-type": meta.content_type },
+      body,
+      finalUrl: meta.final_url || url,
+      originalUrl: url,
+      cache,
+    });
+    if (Date.now() / 1000 - meta.fetched < SOURCE_TTLS[sourceType(url)]) {
+      return fromCache("fresh");
+    }
+    if (meta.etag) headers["If-None-Match"] = meta.etag;
+    if (meta.last_modified) headers["If-Modified-Since"] = meta.last_modified;
+    const result = await httpRequest(url, { ...options, headers });
+    if (result.statusCode === 304) {
+      meta.fetched = Date.now() / 1000;
+      if (result.headers.etag) meta.etag = result.headers.etag;
+      if (result.headers["last-modified"]) meta.last_modified = result.headers["last-modified"];
+      writeAtomic(files.meta, JSON.stringify(meta));
+      return fromCache("revalidated");
+    }
+    return storeResponse(url, method, files, result);
+  }
+  return storeResponse(url, method, files, await httpRequest(url, options));
+}
+
+function storeResponse(url, method, files, result) {
+  if (result.statusCode !== 200) return { ...result, cache: "miss" };
+  const data = Buffer.from(result.body, "utf-8");
+  writeAtomic(files.body, data);
+  writeAtomic(files.meta, JSON.stringify({
+    url,
+    final_url: result.finalUrl,
+    method,
+    status: 200,
+    content_type: result.headers["content-type"] || "",
+    etag: result.headers.etag || "",
+    last_modified: result.headers["last-modified"] || "",
+    fetched: Date.now() / 1000,
+    size: data.length,
+  }));
+  evictCache();
+  return { ...result, cache: "miss" };
+}
+
 // ─── Tool: fetch_url ─────────────────────────────────────────────────────────
 
 async function fetchUrl(args) {
@@ -242,9 +381,11 @@ async function fetchUrl(args) {
     body,
     timeout = 30000,
     output_file,
+    cache = true,
   } = args;
 
-  const result = await httpRequest(url, { method, headers, body, timeout });
+  const request = cache ? cachedRequest : httpRequest;
+  const result = await request(url, { method, headers, body, timeout });
 
   if (output_file) {
     const dir = path.dirname(output_file);
@@ -255,6 +396,7 @@ async function fetchUrl(args) {
       content_length: Buffer.byteLength(result.body),
       output_file,
       final_url: result.finalUrl,
+      cache: result.cache || "off",
     });
   }
 
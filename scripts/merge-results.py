@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Merge score-sorted result files and deduplicate them in one pass.
+
+Usage:
+    python3 scripts/merge-results.py data/ats-scan-results.json data/api-search-results.json \\
+        data/rss-scan-results.json --output data/merged-results.json
+    python3 scripts/merge-results.py data/tmp-results/*.json --simhash --top-k 100
+    python3 scripts/merge-results.py --format ndjson results/*.ndjson --output -
+
+Takes any number of result files, such as the per-source files the agents
+write or per-company partial files, each already sorted by
+preliminary_relevance_score as filter-jobs.py leaves it. The files are
+k-way merged with heapq.merge, and the merged stream goes straight into
+deduplicate-jobs.py's dedup. The result is written once, ranked as
+deduplicate-jobs.py ranks it. The old way concatenated the files into one
+JSON array and parsed it again in deduplicate-jobs.py; this skips that
+round trip.
+
+The output is that of deduplicate-jobs.py over the merged stream. Ties on
+score keep file order, then position within the file. So when each source
+priority comes from one file, as with the skill's ATS, API and RSS results,
+it is byte-identical to concatenating the files and piping them through
+deduplicate-jobs.py. With several files of one priority, such as
+per-company ATS files, their jobs reach the dedup interleaved by score
+rather than file by file; which record is kept first can differ, as it does
+when the files are concatenated in another order. A file that is not sorted
+is still merged and deduplicated, only in that different order, and is
+listed on stderr. Missing, empty or unparseable JSON files are skipped with a
+warning, so a failed agent does not stop the merge.
+"""
+
+import argparse
+import heapq
+import json
+import sys
+from contextlib import ExitStack
+
+from jobrecord import job_record
+from jobstream import FORMATS, read_jobs, release_each, write_jobs
+from loader import load_script
+from runstats import RunStats
+
+deduplicate_jobs = load_script("deduplicate-jobs")
+
+
+def merge_key(job):
+    """Merge order: relevance score descending."""
+    return -job.get("preliminary_relevance_score", 0)
+
+
+def load_json_file(path, stats):
+    """The jobs in a JSON array file, or None (with a warning) if there are none to read."""
+    try:
+        with open(path) as fh:
+            with stats.phase("read"):
+                raw = fh.read()
+    except OSError as e:
+        print(f"Skipping {path}: {e.strerror}", file=sys.stderr)
+        return None
+    if not raw.strip():
+        print(f"Skipping {path}: empty", file=sys.stderr)
+        return None
+    try:
+        with stats.phase("parse"):
+            document = json.loads(raw)
+    except json.JSONDecodeError as e:
+        print(f"Skipping {path}: {e}", file=sys.stderr)
+        return None
+    if not isinstance(document, list):
+        print(f"Skipping {path}: not a JSON array", file=sys.stderr)
+        return None
+    return document
+
+
+def open_input(path, fmt, stack, stats):
+    """Iterate the jobs of one result file, or return None if it is skipped."""
+    if fmt == "json":
+        document = load_json_file(path, stats)
+        if document is None:
+            return None
+        stats.count("items_in", len(document))
+        return (job_record(job) for job in release_each(document))
+    try:
+        fh = stack.enter_context(open(path, "rb" if fmt == "columns" else "r"))
+    except OSError as e:
+        print(f"Skipping {path}: {e.strerror}", file=sys.stderr)
+        return None
+    return read_jobs(fh, fmt, stats)
+
+
+def checked(jobs, path, unsorted):
+    """Pass jobs through, adding path to unsorted the first time the score rises."""
+    last = None
+    for job in jobs:
+        key = merge_key(job)
+        if last is not None and key < last and path not in unsorted:
+            unsorted.append(path)
+        last = key
+        yield job
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge score-sorted result files and deduplicate them")
+    parser.add_argument("files", nargs="+", help="Result files, each sorted by relevance score")
+    parser.add_argument("--output", default="data/merged-results.json",
+                        help="Where to write the merged results ('-' for stdout)")
+    parser.add_argument("--format", default="json", choices=FORMATS,
+                        help="Format of the input and output files")
+    parser.add_argument("--metric", default="ratio", choices=deduplicate_jobs.METRICS,
+                        help="String similarity used by deduplication")
+    parser.add_argument("--simhash", action="store_true",
+                        help="Also merge near-duplicate descriptions (see deduplicate-jobs.py)")
+    parser.add_argument("--max-distance", type=int, default=deduplicate_jobs.DEFAULT_MAX_DISTANCE,
+                        help="Most differing SimHash bits for --simhash")
+    parser.add_argument("--top-k", type=int, default=0,
+                        help="Write only the K best deduplicated jobs")
+    RunStats.add_arguments(parser)
+    args = parser.parse_args()
+    if not 0 <= args.max_distance <= deduplicate_jobs.MAX_DISTANCE:
+        print(f"Error: --max-distance must be between 0 and {deduplicate_jobs.MAX_DISTANCE}", file=sys.stderr)
+        sys.exit(1)
+    run_stats = RunStats.from_args("merge-results", args)
+    max_distance = args.max_distance if args.simhash else None
+
+    unsorted = []
+    with ExitStack() as stack:
+        inputs = []
+        for path in args.files:
+            jobs = open_input(path, args.format, stack, run_stats)
+            if jobs is not None:
+                inputs.append(checked(jobs, path, unsorted))
+        with run_stats.phase("transform"):
+            merged = heapq.merge(*inputs, key=merge_key)
+            unique, total = deduplicate_jobs.deduplicate(merged, args.metric, run_stats, max_distance)
+
+    stats = {
+        "files": len(inputs),
+        "skipped": len(args.files) - len(inputs),
+        "total_input": total,
+        "total_output": len(unique),
+        "duplicates_removed": total - len(unique),
+    }
+    if args.top_k > 0:
+        stats["written"] = min(args.top_k, len(unique))
+    if unsorted:
+        stats["unsorted_files"] = unsorted
+    print(f"Merge stats: {json.dumps(stats)}", file=sys.stderr)
+
+    with run_stats.phase("transform"):
+        unique = deduplicate_jobs.ranked(unique, args.top_k)
+    if args.output == "-":
+        write_jobs(unique, sys.stdout, args.format, run_stats)
+    else:
+        with open(args.output, "w") as fh:
+            write_jobs(unique, fh, args.format, run_stats)
+    run_stats.report()
+
+
+if __name__ == "__main__":
+    main()
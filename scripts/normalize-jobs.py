@@ -4,17 +4,32 @@
 Usage:
     cat api_output.json | python3 normalize-jobs.py --source greenhouse
     python3 normalize-jobs.py --source remotive < api_output.json
+    python3 normalize-jobs.py --source lever --format ndjson < postings.ndjson
+    python3 normalize-jobs.py --source greenhouse --max-text-length 5000 < board.json
 
-Reads JSON from stdin, writes normalized JSON array to stdout.
+Reads JSON from stdin, writes normalized JSON array to stdout. With
+--format ndjson, reads one JSON value per line (a compact API response or a
+single raw listing) and writes one normalized job per line.
 """
 
 import argparse
 import json
+import re
+import sqlite3
 import sys
 import hashlib
 from datetime import datetime
+from functools import lru_cache, partial
+from html import unescape
 from html.parser import HTMLParser
 from io import StringIO
+from pathlib import Path
+
+from jobrecord import job_record
+from jobstream import FORMATS, read_document, read_lines, write_jobs
+from normcache import DEFAULT_MAX_MB, NormalizeCache
+from runstats import RunStats
+from simhash import simhash_hex
 
 
 class HTMLStripper(HTMLParser):
@@ -45,50 +60,154 @@ class HTMLStripper(HTMLParser):
         return self.result.getvalue().strip()
 
 
-def strip_html(html_string):
-    """Remove HTML tags from a string."""
-    if not html_string:
-        return ""
+# Tags strip_html_fast() removes itself. Any other markup (script/style,
+# comments, declarations, unusual tags) is left to HTMLStripper.
+TAG_SPACE = "[ \t\n\r\f]"
+TAG_ATTR = (TAG_SPACE + "+[a-zA-Z_:][-a-zA-Z0-9_:.]*(?:" + TAG_SPACE + "*=" + TAG_SPACE
+            + "*(?:\"[^\"<>]*\"|'[^'<>]*'|[^ \t\n\r\f\"'=<>`]+))?")
+SIMPLE_TAG = re.compile(
+    "<[a-zA-Z][a-zA-Z0-9:-]*(?:" + TAG_ATTR + ")*" + TAG_SPACE + "*/?>"
+    "|</[a-zA-Z][-.a-zA-Z0-9:_]*" + TAG_SPACE + "*>"
+)
+OTHER_MARKUP = re.compile("<[a-zA-Z/!?]")
+CDATA_TAG = re.compile("<(?:script|style)", re.IGNORECASE)
+ENTITY_END = re.compile(r"[\s;]")
+# Joins text runs for one unescape() pass: it ends an entity name and no
+# character reference decodes to it
+RUN_BREAK = "\x00"
+
+# Default cap for strip_html() output, set by --max-text-length (0 = no cap)
+MAX_TEXT_LENGTH = 0
+
+
+def strip_html_parser(html_string):
+    """Remove HTML tags with HTMLStripper, the reference implementation."""
     stripper = HTMLStripper()
     try:
-        stripper.feed(str(html_string))
+        stripper.feed(html_string)
     except Exception:
-        return str(html_string)
+        return html_string
     return stripper.get_text()
 
 
+def strip_html_fast(html_string, final=True):
+    """Remove simple HTML tags in one regex split; None if HTMLStripper is needed.
+
+    Matches HTMLStripper exactly, including its quirk of holding back final
+    text that ends in what may be a cut-off entity. Pass final=False for a
+    prefix of a longer document that ends just before a '<'.
+    """
+    if (RUN_BREAK in html_string or html_string.endswith("<")
+            or CDATA_TAG.search(html_string)):
+        return None
+    runs = SIMPLE_TAG.split(html_string)
+    text = RUN_BREAK.join(runs)
+    if "<" in text and OTHER_MARKUP.search(text):
+        return None
+    last = runs[-1]
+    if final and "&" in last:
+        tail = last.rfind("<") + 1
+        amp = last.rfind("&", max(tail, len(last) - 34))
+        if amp >= 0 and not ENTITY_END.search(last, amp):
+            text = text[:len(text) - len(last) + tail]
+    if "&" in text:
+        text = unescape(text)
+    return text.replace(RUN_BREAK, "").strip()
+
+
+def strip_html_head(html_string, max_length):
+    """Strip only as much of html_string as needed for max_length characters.
+
+    Returns None if the whole document has to be stripped after all.
+    """
+    window = 2 * max_length
+    while True:
+        cut = html_string.find("<", window)
+        if cut < 0:
+            return None
+        text = strip_html_fast(html_string[:cut], final=False)
+        if text is None or len(text) >= max_length:
+            return text
+        window = 2 * cut
+
+
+def strip_html(html_string, max_length=None):
+    """Remove HTML tags from a string.
+
+    With max_length (default MAX_TEXT_LENGTH; 0 means no cap), the text is
+    cut to that many characters and long documents are only partly parsed.
+    """
+    if not html_string:
+        return ""
+    html_string = str(html_string)
+    if max_length is None:
+        max_length = MAX_TEXT_LENGTH
+    text = strip_html_head(html_string, max_length) if max_length else None
+    if text is None:
+        text = strip_html_fast(html_string)
+    if text is None:
+        text = strip_html_parser(html_string)
+    if max_length and len(text) > max_length:
+        text = text[:max_length].rstrip()
+    return text
+
+
 def make_id(source, *parts):
     """Generate a deterministic ID from source + key fields."""
     key = f"{source}:" + ":".join(str(p) for p in parts if p)
     return hashlib.md5(key.encode()).hexdigest()[:12]
 
 
+def finish_job(job):
+    """Add the description fingerprint dedup --simhash uses, and return the job as a Job."""
+    job["description_simhash"] = simhash_hex(job["description_text"])
+    return job_record(job)
+
+
+# Titles, companies and locations repeat across boards; distinct values seen
+# per process are memoized up to this many
+CLASSIFIER_CACHE_SIZE = 16384
+
+# Seniority levels in precedence order, each with the title substrings that
+# imply it. A title is checked against one regex per level, since a
+# substring of one level's word can belong to a higher level ("cto" in
+# "director").
+SENIORITY_WORDS = (
+    ("executive", ["chief", "cto", "ceo", "cfo", "coo", "c-suite", "vp ", "vice president"]),
+    ("director", ["director", "head of", "head,", "principal"]),
+    ("senior", ["senior", "sr.", "sr ", "lead", "staff", "manager"]),
+    ("junior", ["junior", "jr.", "jr ", "entry", "associate", "intern", "graduate"]),
+)
+SENIORITY_PATTERNS = tuple((level, re.compile("|".join(map(re.escape, words))))
+                           for level, words in SENIORITY_WORDS)
+# None of these words overlaps another, so one scan finds all that occur
+WORK_MODE_RE = re.compile("remote|hybrid|onsite|office")
+
+
+@lru_cache(maxsize=CLASSIFIER_CACHE_SIZE)
 def infer_seniority(title):
     """Infer seniority level from job title."""
     title_lower = (title or "").lower()
-    if any(w in title_lower for w in ["chief", "cto", "ceo", "cfo", "coo", "c-suite", "vp ", "vice president"]):
-        return "executive"
-    if any(w in title_lower for w in ["director", "head of", "head,", "principal"]):
-        return "director"
-    if any(w in title_lower for w in ["senior", "sr.", "sr ", "lead", "staff", "manager"]):
-        return "senior"
-    if any(w in title_lower for w in ["junior", "jr.", "jr ", "entry", "associate", "intern", "graduate"]):
-        return "junior"
+    for level, pattern in SENIORITY_PATTERNS:
+        if pattern.search(title_lower):
+            return level
     return "mid"
 
 
+@lru_cache(maxsize=CLASSIFIER_CACHE_SIZE)
+def location_work_mode(location_str):
+    """Work mode implied by a location string alone."""
+    found = set(WORK_MODE_RE.findall((location_str or "").lower()))
+    if "remote" in found:
+        return "hybrid" if len(found) > 1 else "remote"
+    return "hybrid" if "hybrid" in found else "onsite"
+
+
 def infer_work_mode(location_str, remote_flag=None):
     """Infer work mode from location string and/or remote flag."""
     if remote_flag is True:
         return "remote"
-    loc = (location_str or "").lower()
-    if "remote" in loc and ("hybrid" in loc or "onsite" in loc or "office" in loc):
-        return "hybrid"
-    if "remote" in loc:
-        return "remote"
-    if "hybrid" in loc:
-        return "hybrid"
-    return "onsite"
+    return location_work_mode(location_str)
 
 
 def normalize_greenhouse(data):
@@ -104,7 +223,7 @@ def normalize_greenhouse(data):
         posted = job.get("updated_at") or job.get("first_published_at", "")
         # Greenhouse content is in job.content (HTML)
         content = strip_html(job.get("content", ""))
-        results.append({
+        results.append(finish_job({
             "id": make_id("greenhouse", job.get("id")),
             "source": "greenhouse",
             "source_id": str(job.get("id", "")),
@@ -125,7 +244,7 @@ def normalize_greenhouse(data):
             "departments": departments,
             "tags": [],
             "verification_status": "GUARANTEED",
-        })
+        }))
     return results
 
 
@@ -148,7 +267,7 @@ def normalize_lever(data):
         description = job.get("descriptionPlain", "") or strip_html(job.get("description", ""))
         if desc_parts:
             description += "\n" + "\n".join(desc_parts)
-        results.append({
+        results.append(finish_job({
             "id": make_id("lever", job.get("id")),
             "source": "lever",
             "source_id": str(job.get("id", "")),
@@ -169,7 +288,7 @@ def normalize_lever(data):
             "departments": [d for d in [department, team] if d],
             "tags": [categories.get("allLocations", "")],
             "verification_status": "GUARANTEED",
-        })
+        }))
     return results
 
 
@@ -181,7 +300,7 @@ def normalize_workable(data):
         location = job.get("location", "") or job.get("city", "") or ""
         if job.get("country"):
             location = f"{location}, {job['country']}" if location else job["country"]
-        results.append({
+        results.append(finish_job({
             "id": make_id("workable", job.get("shortcode") or job.get("id")),
             "source": "workable",
             "source_id": str(job.get("shortcode", "") or job.get("id", "")),
@@ -202,7 +321,7 @@ def normalize_workable(data):
             "departments": [job.get("department", "")] if job.get("department") else [],
             "tags": [],
             "verification_status": "GUARANTEED",
-        })
+        }))
     return results
 
 
@@ -226,7 +345,7 @@ def normalize_ashby(data):
         department = job.get("department", "") or ""
         if isinstance(department, dict):
             department = department.get("name", "") or ""
-        results.append({
+        results.append(finish_job({
             "id": make_id("ashby", job.get("id")),
             "source": "ashby",
             "source_id": str(job.get("id", "")),
@@ -247,7 +366,7 @@ def normalize_ashby(data):
             "departments": [department] if department else [],
             "tags": [t.get("name", "") if isinstance(t, dict) else str(t) for t in (job.get("tags", []) or [])],
             "verification_status": "GUARANTEED",
-        })
+        }))
     return results
 
 
@@ -260,7 +379,7 @@ def normalize_remotive(data):
         salary_min = None
         salary_max = None
         # Remotive sometimes includes salary as a range string
-        results.append({
+        results.append(finish_job({
             "id": make_id("remotive", job.get("id")),
             "source": "remotive",
             "source_id": str(job.get("id", "")),
@@ -281,7 +400,7 @@ def normalize_remotive(data):
             "departments": [job.get("category", "")] if job.get("category") else [],
             "tags": job.get("tags", []) or [],
             "verification_status": "API_ACTIVE",
-        })
+        }))
     return results
 
 
@@ -304,7 +423,7 @@ def normalize_remoteok(data):
                 salary_max = int(job["salary_max"])
             except (ValueError, TypeError):
                 pass
-        results.append({
+        results.append(finish_job({
             "id": make_id("remoteok", job.get("id")),
             "source": "remoteok",
             "source_id": str(job.get("id", "")),
@@ -325,7 +444,7 @@ def normalize_remoteok(data):
             "departments": [],
             "tags": job.get("tags", []) or [],
             "verification_status": "API_ACTIVE",
-        })
+        }))
     return results
 
 
@@ -354,7 +473,7 @@ def normalize_jobicy(data):
                     pass
         if salary_min or salary_max:
             salary_currency = job.get("salaryCurrency", "USD")
-        results.append({
+        results.append(finish_job({
             "id": make_id("jobicy", job.get("id")),
             "source": "jobicy",
             "source_id": str(job.get("id", "")),
@@ -375,7 +494,7 @@ def normalize_jobicy(data):
             "departments": job.get("jobIndustry") if isinstance(job.get("jobIndustry"), list) else [job.get("jobIndustry", "")] if job.get("jobIndustry") else [],
             "tags": job.get("jobIndustry", []) if isinstance(job.get("jobIndustry"), list) else [job.get("jobIndustry", "")] if job.get("jobIndustry") else [],
             "verification_status": "API_ACTIVE",
-        })
+        }))
     return results
 
 
@@ -400,7 +519,7 @@ def normalize_himalayas(data):
                 pass
         if salary_min or salary_max:
             salary_currency = "USD"
-        results.append({
+        results.append(finish_job({
             "id": make_id("himalayas", job.get("id") or job.get("slug")),
             "source": "himalayas",
             "source_id": str(job.get("id", "") or job.get("slug", "")),
@@ -421,7 +540,7 @@ def normalize_himalayas(data):
             "departments": [job.get("category", "")] if job.get("category") else [],
             "tags": job.get("tags", []) or [],
             "verification_status": "API_ACTIVE",
-        })
+        }))
     return results
 
 
@@ -439,7 +558,7 @@ def normalize_themuse(data):
         level_names = [lv.get("name", "") for lv in levels if isinstance(lv, dict)]
         categories = job.get("categories", [])
         cat_names = [c.get("name", "") for c in categories if isinstance(c, dict)]
-        results.append({
+        results.append(finish_job({
             "id": make_id("themuse", job.get("id")),
             "source": "themuse",
             "source_id": str(job.get("id", "")),
@@ -460,7 +579,7 @@ def normalize_themuse(data):
             "departments": cat_names,
             "tags": [],
             "verification_status": "API_ACTIVE",
-        })
+        }))
     return results
 
 
@@ -469,7 +588,7 @@ def normalize_rss(data):
     items = data.get("items", []) if isinstance(data, dict) else data
     results = []
     for item in items:
-        results.append({
+        results.append(finish_job({
             "id": make_id("rss", item.get("link") or item.get("title")),
             "source": "rss",
             "source_id": item.get("guid", "") or item.get("link", ""),
@@ -490,7 +609,7 @@ def normalize_rss(data):
             "departments": [item.get("category", "")] if item.get("category") else [],
             "tags": item.get("categories", []) or [],
             "verification_status": "UNVERIFIED",
-        })
+        }))
     return results
 
 
@@ -508,35 +627,162 @@ NORMALIZERS = {
 }
 
 
+# Top-level keys that mark a whole API response rather than a single listing
+PAYLOAD_KEYS = ("jobs", "results", "items")
+
+
+def payload_key(source):
+    """Top-level key holding the listings in a source's API response object."""
+    return "results" if source == "themuse" else "items" if source == "rss" else "jobs"
+
+
+def payload_records(data, source):
+    """Return the raw listings the source's normalizer iterates over.
+
+    Returns None for shapes where that is not a plain list of listings.
+    """
+    if isinstance(data, dict):
+        records = data.get(payload_key(source))
+        return records if isinstance(records, list) else None
+    if not isinstance(data, list):
+        return None
+    if source == "remoteok":
+        # element[0] is metadata, unless it is the only element
+        return data[1:] if len(data) > 1 else None
+    return data
+
+
+def with_records(data, records, source):
+    """Rebuild an API response around a different list of listings."""
+    if isinstance(data, dict):
+        return dict(data, **{payload_key(source): records})
+    if source == "remoteok":
+        return data[:1] + records
+    return records
+
+
+def split_payload(data, size, source):
+    """Split an API response into smaller responses of at most size listings.
+
+    Normalizing the pieces in order yields the same jobs as normalizing the
+    whole response, so they can be handed to separate worker processes.
+    """
+    records = payload_records(data, source)
+    if records is None or len(records) <= size:
+        return [data]
+    # RemoteOK pieces each keep element[0], the metadata the normalizer skips
+    return [with_records(data, records[i:i + size], source) for i in range(0, len(records), size)]
+
+
+def cache_salt():
+    """Version string for cached output: this file's code, simhash.py and the text cap."""
+    source = Path(__file__).resolve()
+    code = hashlib.sha256(source.read_bytes() + (source.parent / "simhash.py").read_bytes()).hexdigest()[:16]
+    return f"{code}:{MAX_TEXT_LENGTH}"
+
+
+def normalize_cached(source, data, cache):
+    """Normalize an API response, serving unchanged listings from cache."""
+    normalizer = NORMALIZERS[source]
+    records = payload_records(data, source)
+    if not records or not all(isinstance(r, dict) for r in records):
+        return normalizer(data)
+
+    keys = [cache.key(source, record) for record in records]
+    cached = cache.get_many(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    fresh = normalizer(with_records(data, [records[i] for i in missing], source)) if missing else []
+    if len(fresh) != len(missing):
+        # Not one job per listing; cannot tell which job came from where
+        return normalizer(data)
+
+    cache.put_many((keys[i], job) for i, job in zip(missing, fresh))
+    cache.commit()
+    cache.hits += len(records) - len(missing)
+    cache.misses += len(missing)
+    fresh_jobs = dict(zip(missing, fresh))
+    return [fresh_jobs[i] if i in fresh_jobs else job_record(json.loads(cached[key]))
+            for i, key in enumerate(keys)]
+
+
+def normalize_counted(normalizer, stats, data):
+    """Run normalizer as the transform phase, counting the listings it was given."""
+    stats.count("items_in", listing_count(data))
+    with stats.phase("transform"):
+        return normalizer(data)
+
+
+def normalize_line(normalizer, value):
+    """Normalize one NDJSON value: a whole API response or a single raw listing."""
+    if isinstance(value, list) or any(key in value for key in PAYLOAD_KEYS):
+        return normalizer(value)
+    return normalizer([value])
+
+
+def listing_count(data):
+    """Number of raw listings in an API response or NDJSON line."""
+    if isinstance(data, dict):
+        records = next((data[key] for key in PAYLOAD_KEYS if isinstance(data.get(key), list)), None)
+        return len(records) if records is not None else 1
+    return len(data) if isinstance(data, list) else 0
+
+
+def normalize_stream(normalizer, stream, fmt, company="", stats=None):
+    """Yield normalized jobs from stdin-style input in the given format."""
+    if stats is not None:
+        normalizer = partial(normalize_counted, normalizer, stats)
+    if fmt == "ndjson":
+        batches = (normalize_line(normalizer, value) for value in read_lines(stream, stats))
+    else:
+        data = read_document(stream, stats)
+        batches = [normalizer(data)] if data is not None else []
+    for results in batches:
+        for job in results:
+            # Backfill company name from --company flag if not in API data
+            if company and not job["company"]:
+                job["company"] = company
+            yield job
+
+
 def main():
     parser = argparse.ArgumentParser(description="Normalize job listings to a unified schema")
     parser.add_argument("--source", required=True, choices=list(NORMALIZERS.keys()),
                         help="Source API format")
     parser.add_argument("--company", default="",
                         help="Company name (used for ATS sources where company isn't in the API response)")
+    parser.add_argument("--format", default="json", choices=FORMATS,
+                        help="Input/output format: JSON array (default) or one job per line; columns reads "
+                             "JSON and writes a binary columns file")
+    parser.add_argument("--max-text-length", type=int, default=0,
+                        help="Truncate stripped HTML text to this many characters (default: no cap)")
+    parser.add_argument("--cache", default="",
+                        help="SQLite file caching normalized listings across runs (e.g., data/normalize-cache.db)")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_MB,
+                        help="Evict least recently used listings beyond this cache size")
+    RunStats.add_arguments(parser)
     args = parser.parse_args()
 
-    raw = sys.stdin.read()
-    if not raw.strip():
-        json.dump([], sys.stdout, indent=2)
-        return
-
-    try:
-        data = json.loads(raw)
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON: {e}", file=sys.stderr)
-        sys.exit(1)
+    global MAX_TEXT_LENGTH
+    MAX_TEXT_LENGTH = args.max_text_length
 
     normalizer = NORMALIZERS[args.source]
-    results = normalizer(data)
-
-    # Backfill company name from --company flag if not in API data
-    if args.company:
-        for job in results:
-            if not job["company"]:
-                job["company"] = args.company
-
-    json.dump(results, sys.stdout, indent=2, default=str)
+    cache = None
+    if args.cache:
+        try:
+            cache = NormalizeCache(args.cache, args.cache_max_mb, cache_salt())
+        except sqlite3.Error as e:
+            print(f"Error opening cache {args.cache}: {e}", file=sys.stderr)
+            sys.exit(1)
+        normalizer = partial(normalize_cached, args.source, cache=cache)
+
+    run_stats = RunStats.from_args("normalize-jobs", args)
+    jobs = normalize_stream(normalizer, sys.stdin, args.format, args.company, run_stats)
+    write_jobs(jobs, sys.stdout, args.format, run_stats)
+
+    if cache:
+        cache.close()
+        print(f"Cache stats: {json.dumps(cache.stats())}", file=sys.stderr)
+    run_stats.report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+"""Persistent cache of normalized listings, keyed by the raw record's content.
+
+ATS boards return mostly the same listings day to day. Each raw listing is
+hashed (with the source and the normalizer version), and a listing whose
+hash is already cached is served without normalizing it again. Rows also
+carry the normalized job id from make_id(), so a changed listing replaces
+its stale version instead of piling up next to it.
+
+The cache is one SQLite file. Least recently used rows are evicted when it
+grows past its size cap.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+
+from jobrecord import json_default
+
+
+DEFAULT_MAX_MB = 256
+# SQLite's default limit on host parameters is 999
+BATCH = 500
+
+
+def record_hash(salt, source, record):
+    """Content hash of one raw API listing."""
+    raw = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{salt}\0{source}\0{raw}".encode()).hexdigest()
+
+
+class NormalizeCache:
+    """SQLite-backed map from raw-listing hash to normalized job JSON."""
+
+    def __init__(self, path, max_mb=DEFAULT_MAX_MB, salt=""):
+        self.conn = sqlite3.connect(str(path), timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS listings ("
+            "key TEXT PRIMARY KEY, job_id TEXT, job TEXT, size INTEGER, used REAL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS listings_job_id ON listings (job_id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS listings_used ON listings (used)")
+        self.conn.commit()
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def key(self, source, record):
+        return record_hash(self.salt, source, record)
+
+    def get_many(self, keys):
+        """Return {key: job JSON text} for the cached keys, marking them used."""
+        found = {}
+        distinct = list(dict.fromkeys(keys))
+        for i in range(0, len(distinct), BATCH):
+            chunk = distinct[i:i + BATCH]
+            marks = ",".join("?" * len(chunk))
+            rows = self.conn.execute(f"SELECT key, job FROM listings WHERE key IN ({marks})", chunk)
+            found.update(rows)
+        if found:
+            now = time.time()
+            self.conn.executemany("UPDATE listings SET used = ? WHERE key = ?",
+                                  [(now, key) for key in found])
+        return found
+
+    def put_many(self, items):
+        """Store (key, job) pairs, dropping older versions of the same job id."""
+        now = time.time()
+        rows = []
+        for key, job in items:
+            text = json.dumps(job, default=json_default)
+            rows.append((key, job.get("id", ""), text, len(text), now))
+        self.conn.executemany("DELETE FROM listings WHERE job_id = ? AND key != ?",
+                              [(job_id, key) for key, job_id, _, _, _ in rows if job_id])
+        self.conn.executemany("INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?)", rows)
+
+    def commit(self):
+        self.conn.commit()
+
+    def evict(self):
+        """Delete least recently used rows until the cache fits max_bytes."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM listings").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM listings ORDER BY used"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM listings WHERE key = ?", doomed)
+        self.evicted += len(doomed)
+
+    def close(self):
+        """Evict down to the size cap, commit and close."""
+        self.evict()
+        self.conn.commit()
+        self.conn.close()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evicted": self.evicted}
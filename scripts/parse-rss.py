@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 """Parse RSS/Atom XML from stdin and output JSON.
 
-Standalone version of the inline parser from fetch-rss.sh.
-Used in Desktop mode where MCP fetches raw XML and we need to
-convert it before piping to normalize-jobs.py.
+Used by fetch-rss.sh, and in Desktop mode where MCP fetches raw XML and we
+need to convert it before piping to normalize-jobs.py.
 
 Usage:
     cat feed.xml | python3 parse-rss.py [--feed-url URL]
+    cat feed.xml | python3 parse-rss.py --format ndjson
+    cat feed.xml | python3 parse-rss.py --normalize [--format ndjson]
 
-Output: JSON with {feed_url, fetched_at, item_count, items: [{title, link, pubDate, ...}]}
+Output: JSON with {feed_url, fetched_at, item_count, items: [{title, link, pubDate, ...}]}.
+With --format ndjson, one item per line as soon as it is parsed. With
+--normalize, the items as jobs in the unified schema (normalize-jobs.py
+--source rss output), as a JSON array or one job per line.
+
+The feed is read in a single streaming pass (RSS items and Atom entries
+together, in document order) and each item is discarded once converted, so
+memory does not grow with the size of the feed.
 """
 
 import sys
@@ -16,98 +24,122 @@ import json
 import argparse
 import xml.etree.ElementTree as ET
 from datetime import datetime
+from io import StringIO
 
+import jobstream
+from loader import load_script
+from runstats import RunStats
 
-def parse_rss_xml(xml_input, feed_url=""):
-    items = []
+ATOM = "{http://www.w3.org/2005/Atom}"
 
-    try:
-        root = ET.fromstring(xml_input)
-    except ET.ParseError as e:
-        return {"items": [], "error": str(e)}
 
-    # Handle RSS 2.0
-    for item in root.findall(".//item"):
-        entry = {
-            "title": "",
-            "link": "",
-            "pubDate": "",
-            "description": "",
-            "category": "",
-            "company": "",
-            "author": "",
-            "location": "",
-        }
-        for child in item:
-            tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-            text = (child.text or "").strip()
-            if tag == "title":
-                entry["title"] = text
-            elif tag == "link":
-                entry["link"] = text
-            elif tag == "pubDate":
-                entry["pubDate"] = text
-            elif tag == "description":
-                entry["description"] = text
-            elif tag == "category":
-                if entry["category"]:
-                    entry["category"] += ", " + text
-                else:
-                    entry["category"] = text
-            elif tag in ("author", "creator"):
-                entry["author"] = text
-            elif tag in ("region", "location"):
-                entry["location"] = text
-        # Extract company from "Title at Company" pattern
-        if " at " in entry["title"] and not entry["company"]:
-            parts = entry["title"].rsplit(" at ", 1)
-            if len(parts) == 2:
-                entry["company"] = parts[1].strip()
-        items.append(entry)
-
-    # Handle Atom feeds
-    ns = {"atom": "http://www.w3.org/2005/Atom"}
-    for entry_el in root.findall(".//atom:entry", ns):
-        entry = {
-            "title": "",
-            "link": "",
-            "pubDate": "",
-            "description": "",
-            "category": "",
-            "company": "",
-            "author": "",
-            "location": "",
-        }
-        title_el = entry_el.find("atom:title", ns)
-        if title_el is not None:
-            entry["title"] = (title_el.text or "").strip()
-        link_el = entry_el.find("atom:link", ns)
-        if link_el is not None:
-            entry["link"] = link_el.get("href", "")
-        published_el = entry_el.find("atom:published", ns) or entry_el.find(
-            "atom:updated", ns
-        )
-        if published_el is not None:
-            entry["pubDate"] = (published_el.text or "").strip()
-        summary_el = entry_el.find("atom:summary", ns) or entry_el.find(
-            "atom:content", ns
-        )
-        if summary_el is not None:
-            entry["description"] = (summary_el.text or "").strip()
-        cat_el = entry_el.find("atom:category", ns)
-        if cat_el is not None:
-            entry["category"] = cat_el.get("term", "") or (
-                cat_el.text or ""
-            ).strip()
-        author_el = entry_el.find("atom:author/atom:name", ns)
-        if author_el is not None:
-            entry["author"] = (author_el.text or "").strip()
-        if " at " in entry["title"] and not entry["company"]:
-            parts = entry["title"].rsplit(" at ", 1)
-            if len(parts) == 2:
-                entry["company"] = parts[1].strip()
-        items.append(entry)
+def empty_entry():
+    return {
+        "title": "",
+        "link": "",
+        "pubDate": "",
+        "description": "",
+        "category": "",
+        "company": "",
+        "author": "",
+        "location": "",
+    }
+
+
+def add_company(entry):
+    """Extract company from "Title at Company" pattern."""
+    if " at " in entry["title"] and not entry["company"]:
+        parts = entry["title"].rsplit(" at ", 1)
+        if len(parts) == 2:
+            entry["company"] = parts[1].strip()
+    return entry
+
 
+def rss_entry(item):
+    """Convert an RSS 2.0 <item> element."""
+    entry = empty_entry()
+    for child in item:
+        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+        text = (child.text or "").strip()
+        if tag == "title":
+            entry["title"] = text
+        elif tag == "link":
+            entry["link"] = text
+        elif tag == "pubDate":
+            entry["pubDate"] = text
+        elif tag == "description":
+            entry["description"] = text
+        elif tag == "category":
+            if entry["category"]:
+                entry["category"] += ", " + text
+            else:
+                entry["category"] = text
+        elif tag in ("author", "creator"):
+            entry["author"] = text
+        elif tag in ("region", "location"):
+            entry["location"] = text
+    return add_company(entry)
+
+
+def first_child(element, *tags):
+    """Return the first child found among tags, tried in order."""
+    for tag in tags:
+        child = element.find(ATOM + tag)
+        if child is not None:
+            return child
+    return None
+
+
+def atom_entry(entry_el):
+    """Convert an Atom <entry> element."""
+    entry = empty_entry()
+    title_el = entry_el.find(ATOM + "title")
+    if title_el is not None:
+        entry["title"] = (title_el.text or "").strip()
+    link_el = entry_el.find(ATOM + "link")
+    if link_el is not None:
+        entry["link"] = link_el.get("href", "")
+    published_el = first_child(entry_el, "published", "updated")
+    if published_el is not None:
+        entry["pubDate"] = (published_el.text or "").strip()
+    summary_el = first_child(entry_el, "summary", "content")
+    if summary_el is not None:
+        entry["description"] = (summary_el.text or "").strip()
+    cat_el = entry_el.find(ATOM + "category")
+    if cat_el is not None:
+        entry["category"] = cat_el.get("term", "") or (cat_el.text or "").strip()
+    author_el = entry_el.find(f"{ATOM}author/{ATOM}name")
+    if author_el is not None:
+        entry["author"] = (author_el.text or "").strip()
+    return add_company(entry)
+
+
+def iter_items(source):
+    """Yield feed items from a file-like object in one pass.
+
+    Each <item> or Atom <entry> below the root is converted when its end tag
+    is read, then cleared and detached so the tree never holds more than one.
+    Raises ET.ParseError on malformed XML, after yielding the items before it.
+    """
+    parents = []
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            continue
+        parents.pop()
+        if not parents:
+            break
+        if element.tag == "item":
+            yield rss_entry(element)
+        elif element.tag == ATOM + "entry":
+            yield atom_entry(element)
+        else:
+            continue
+        element.clear()
+        parents[-1].remove(element)
+
+
+def feed_result(items, feed_url=""):
     return {
         "feed_url": feed_url,
         "fetched_at": datetime.utcnow().isoformat() + "Z",
@@ -116,13 +148,66 @@ def parse_rss_xml(xml_input, feed_url=""):
     }
 
 
-if __name__ == "__main__":
+def parse_rss_xml(xml_input, feed_url=""):
+    try:
+        items = list(iter_items(StringIO(xml_input)))
+    except ET.ParseError as e:
+        return {"items": [], "error": str(e)}
+    return feed_result(items, feed_url)
+
+
+def stream_items(source):
+    """Yield items, reporting a parse error on stderr instead of raising."""
+    try:
+        yield from iter_items(source)
+    except ET.ParseError as e:
+        print(f"Error parsing XML: {e}", file=sys.stderr)
+
+
+def normalized_jobs(items):
+    normalize_rss = load_script("normalize-jobs").normalize_rss
+    for item in items:
+        yield from normalize_rss([item])
+
+
+def main():
     parser = argparse.ArgumentParser(description="Parse RSS/Atom XML to JSON")
     parser.add_argument(
         "--feed-url", default="", help="Original feed URL (for metadata)"
     )
+    parser.add_argument(
+        "--format", default="json", choices=jobstream.FORMATS,
+        help="Feed JSON document (default) or one item per line; columns (with --normalize) "
+             "writes a binary columns file",
+    )
+    parser.add_argument(
+        "--normalize", action="store_true",
+        help="Output jobs in the unified schema instead of feed items",
+    )
+    RunStats.add_arguments(parser)
     args = parser.parse_args()
+    run_stats = RunStats.from_args("parse-rss", args)
+    if args.format == "columns" and not args.normalize:
+        print("--format columns needs --normalize", file=sys.stderr)
+        sys.exit(1)
+
+    if args.normalize:
+        items = run_stats.timed(stream_items(sys.stdin.buffer), "parse", "items_in")
+        jobstream.write_jobs(normalized_jobs(items), sys.stdout, args.format, run_stats)
+    elif args.format == "ndjson":
+        items = run_stats.timed(stream_items(sys.stdin.buffer), "parse", "items_in")
+        jobstream.write_jobs(items, sys.stdout, "ndjson", run_stats)
+    else:
+        try:
+            items = list(run_stats.timed(iter_items(sys.stdin.buffer), "parse", "items_in"))
+            result = feed_result(items, args.feed_url)
+        except ET.ParseError as e:
+            result = {"items": [], "error": str(e)}
+        run_stats.count("items_out", len(result["items"]))
+        with run_stats.phase("serialize"):
+            print(json.dumps(result, indent=2))
+    run_stats.report()
 
-    xml_input = sys.stdin.read()
-    result = parse_rss_xml(xml_input, args.feed_url)
-    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
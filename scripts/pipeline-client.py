@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Run a pipeline stage in the warm pipeline daemon, or locally if none is running.
+
+Usage:
+    python3 scripts/pipeline-client.py normalize-jobs --source greenhouse --company IDEO < in.json |
+        python3 scripts/pipeline-client.py filter-jobs --keywords "design,product"
+    python3 scripts/pipeline-client.py deduplicate-jobs < all.json > unique.json
+    python3 scripts/pipeline-client.py --stats
+    python3 scripts/pipeline-client.py --shutdown
+
+Replace `scripts/STAGE.py` with `scripts/pipeline-client.py STAGE` and
+nothing else changes: the arguments, stdin, stdout, stderr and exit status
+are those of the script. Stages run in pipeline-daemon.py, so only this
+small client starts per call. With no daemon listening on the socket
+($JOB_MATCHER_DAEMON_SOCKET, default $TMPDIR/job-matcher-UID.sock) the client
+execs the script itself.
+
+Wire format, one request per connection: the client sends a JSON header
+line ({"script", "args", "cwd"} or {"command": "stats"/"shutdown"}) and then
+stdin until it shuts down writing; the daemon answers with a JSON header
+line ({"exit", "stdout", "stderr"}, the last two byte counts) followed by
+that much stdout and stderr.
+"""
+
+import json
+import os
+import socket
+import sys
+
+SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+# Stages the daemon serves; anything else runs locally
+STAGES = ("normalize-jobs", "filter-jobs", "deduplicate-jobs", "convert-jobs", "parse-rss")
+CHUNK = 1 << 16
+
+
+def default_socket():
+    # TMPDIR rather than tempfile.gettempdir(): importing tempfile costs more than a request
+    return os.environ.get("JOB_MATCHER_DAEMON_SOCKET") or os.path.join(
+        os.environ.get("TMPDIR") or "/tmp", f"job-matcher-{os.getuid()}.sock")
+
+
+def read_header(stream):
+    """The JSON header line of a message, or None at end of stream."""
+    line = stream.readline()
+    return json.loads(line) if line else None
+
+
+def connect(path):
+    """A connected socket, or None if no daemon is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def send(sock, header, stdin=None):
+    """Send a request and return (header, stdout bytes, stderr bytes)."""
+    sock.sendall(json.dumps(header).encode() + b"\n")
+    if stdin is not None:
+        while True:
+            data = stdin.read(CHUNK)
+            if not data:
+                break
+            sock.sendall(data)
+    sock.shutdown(socket.SHUT_WR)
+    with sock.makefile("rb") as stream:
+        reply = read_header(stream)
+        if reply is None:
+            raise OSError("daemon closed the connection")
+        out = stream.read(reply.get("stdout", 0))
+        err = stream.read(reply.get("stderr", 0))
+    return reply, out, err
+
+
+def run_locally(script, args):
+    path = os.path.join(SCRIPTS, f"{script}.py")
+    os.execv(sys.executable, [sys.executable, path] + args)
+
+
+def main():
+    argv = sys.argv[1:]
+    if not argv or argv[0] in ("-h", "--help"):
+        print(__doc__.strip(), file=sys.stderr)
+        sys.exit(0 if argv else 1)
+    path = default_socket()
+
+    if argv[0] in ("--stats", "--shutdown"):
+        sock = connect(path)
+        if sock is None:
+            print(f"No pipeline daemon on {path}", file=sys.stderr)
+            sys.exit(1)
+        _, out, _ = send(sock, {"command": argv[0][2:]})
+        sys.stdout.buffer.write(out)
+        return
+
+    script, args = os.path.basename(argv[0]).removesuffix(".py"), argv[1:]
+    sock = connect(path) if script in STAGES else None
+    if sock is None:
+        run_locally(script, args)
+    stdin = None if sys.stdin is None or sys.stdin.isatty() else sys.stdin.buffer
+    try:
+        reply, out, err = send(sock, {"script": script, "args": args, "cwd": os.getcwd()}, stdin)
+    except OSError as e:
+        print(f"Pipeline daemon failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        sock.close()
+    sys.stdout.buffer.write(out)
+    sys.stdout.flush()
+    sys.stderr.buffer.write(err)
+    sys.stderr.flush()
+    sys.exit(reply.get("exit", 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Keep the pipeline stages loaded and serve them over a Unix socket.
+
+Usage:
+    python3 scripts/pipeline-daemon.py &
+    python3 scripts/pipeline-daemon.py --socket /tmp/jm.sock --idle-timeout 1800 &
+    python3 scripts/pipeline-client.py normalize-jobs --source lever < lever.json
+
+A pipeline stage started from the shell pays for interpreter startup,
+imports and regex compilation on every call, which is more than the
+work on a typical scan file. The daemon imports normalize-jobs,
+filter-jobs, deduplicate-jobs, convert-jobs and parse-rss once, and runs
+their main() for each pipeline-client.py request with that request's
+arguments, working directory and stdin. The memoized classifiers and
+normalizers stay warm between requests.
+
+Each connection's stdin is read on its own thread, so both ends of
+`client A | client B` can connect at once. The stages then run one at a
+time, since each takes over sys.stdin, stdout and stderr. Per-stage request
+latency (whole request received to reply sent, so it includes waiting for
+another stage to finish) is kept for the last --window
+requests. `pipeline-client.py --stats` returns it as percentiles, and it is
+printed as a `Daemon stats` line on exit.
+"""
+
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from collections import defaultdict, deque
+
+from loader import SCRIPTS_DIR, load_script
+
+client = load_script("pipeline-client")
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of a sorted list."""
+    return ordered[max(0, -(-len(ordered) * p // 100) - 1)]
+
+
+class Latencies:
+    """Recent request latencies per stage."""
+
+    def __init__(self, window):
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.counts = defaultdict(int)
+
+    def add(self, name, seconds):
+        self.samples[name].append(seconds)
+        self.counts[name] += 1
+
+    def report(self):
+        report = {}
+        for name, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            entry = {"requests": self.counts[name]}
+            for p in PERCENTILES:
+                entry[f"p{p}_ms"] = round(percentile(ordered, p) * 1000, 2)
+            entry["max_ms"] = round(ordered[-1] * 1000, 2)
+            report[name] = entry
+        return report
+
+
+def run_stage(module, script, args, cwd, data):
+    """Run module.main() as `script args` would. Returns (exit code, stdout, stderr)."""
+    stdin = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+    out = io.BytesIO()
+    err = io.BytesIO()
+    stdout = io.TextIOWrapper(out, encoding="utf-8", write_through=True)
+    stderr = io.TextIOWrapper(err, encoding="utf-8", write_through=True)
+    saved = sys.stdin, sys.stdout, sys.stderr, sys.argv, os.getcwd()
+    sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+    sys.argv = [str(SCRIPTS_DIR / f"{script}.py")] + list(args)
+    code = 0
+    try:
+        os.chdir(cwd)
+        module.main()
+    except SystemExit as e:
+        if isinstance(e.code, str):
+            print(e.code, file=stderr)
+            code = 1
+        else:
+            code = e.code or 0
+    except Exception:
+        traceback.print_exc(file=stderr)
+        code = 1
+    finally:
+        stdout.flush()
+        stderr.flush()
+        sys.stdin, sys.stdout, sys.stderr, sys.argv = saved[:4]
+        os.chdir(saved[4])
+    return code, out.getvalue(), err.getvalue()
+
+
+def reply(conn, code, out=b"", err=b""):
+    header = {"exit": code, "stdout": len(out), "stderr": len(err)}
+    conn.sendall(json.dumps(header).encode() + b"\n" + out + err)
+
+
+class Daemon:
+    """Accepts connections and runs their requests, one stage at a time."""
+
+    def __init__(self, server, window):
+        self.server = server
+        self.stages = {name: load_script(name) for name in client.STAGES}
+        self.latencies = Latencies(window)
+        self.run_lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.last_request = time.monotonic()
+
+    def handle(self, conn):
+        with conn:
+            try:
+                self.serve_one(conn)
+            except OSError as e:
+                print(f"Client connection failed: {e}", file=sys.__stderr__)
+
+    def serve_one(self, conn):
+        with conn.makefile("rb") as stream:
+            header = client.read_header(stream)
+            data = stream.read()
+        start = time.perf_counter()
+        if header is None:
+            return
+        command = header.get("command")
+        if command == "stats":
+            with self.run_lock:
+                report = self.latencies.report()
+            reply(conn, 0, json.dumps(report).encode() + b"\n")
+            return
+        if command == "shutdown":
+            reply(conn, 0)
+            self.stopping.set()
+            self.server.shutdown(socket.SHUT_RDWR)
+            return
+        script = header.get("script")
+        module = self.stages.get(script)
+        if module is None:
+            reply(conn, 1, err=f"Unknown stage: {script}\n".encode())
+            return
+        with self.run_lock:
+            code, out, err = run_stage(module, script, header.get("args", []), header.get("cwd", "/"), data)
+            self.last_request = time.monotonic()
+        reply(conn, code, out, err)
+        with self.run_lock:
+            self.latencies.add(script, time.perf_counter() - start)
+
+    def serve(self, idle_timeout):
+        """Accept until shutdown, or until idle_timeout seconds pass without a request."""
+        self.server.settimeout(1 if idle_timeout else None)
+        while not self.stopping.is_set():
+            try:
+                conn, _ = self.server.accept()
+            except socket.timeout:
+                if time.monotonic() - self.last_request > idle_timeout:
+                    break
+                continue
+            except OSError:
+                break
+            conn.settimeout(None)
+            self.last_request = time.monotonic()
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+
+def listen(path):
+    """Bind the socket, replacing a stale one; exits if a daemon already answers."""
+    if os.path.exists(path):
+        probe = client.connect(path)
+        if probe is not None:
+            probe.close()
+            print(f"Error: a pipeline daemon is already listening on {path}", file=sys.stderr)
+            sys.exit(1)
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen(64)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the pipeline stages over a Unix socket")
+    parser.add_argument("--socket", default=client.default_socket(), help="Socket path")
+    parser.add_argument("--idle-timeout", type=float, default=0,
+                        help="Exit after this many seconds without a request (0: never)")
+    parser.add_argument("--window", type=int, default=10000, help="Latencies kept per stage for percentiles")
+    args = parser.parse_args()
+
+    server = listen(args.socket)
+    daemon = Daemon(server, args.window)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Pipeline daemon listening on {args.socket}", file=sys.stderr)
+    try:
+        daemon.serve(args.idle_timeout)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        try:
+            os.unlink(args.socket)
+        except FileNotFoundError:
+            pass
+        with daemon.run_lock:
+            report = daemon.latencies.report()
+        print(f"Daemon stats: {json.dumps(report)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""Normalize, filter and deduplicate pre-fetched scan files in one process.
+
+Usage:
+    python3 scripts/run-pipeline.py --keywords "product,design" --seniority "senior,director"
+    python3 scripts/run-pipeline.py --manifest data/tmp-scans/manifest.json \\
+        --keywords "data,ML" --exclude-keywords "intern" --output data/merged-results.json
+
+Reads the files listed in data/tmp-scans/manifest.json. Without a manifest,
+source and company are inferred from file names in --scan-dir:
+greenhouse-{slug}.json, lever-{slug}.json, workable-{slug}.json,
+ashby-{slug}.json, api-{source}-{params}.json and rss-{name}.json.
+
+Equivalent to piping every file through normalize-jobs.py | filter-jobs.py
+and the combined results through deduplicate-jobs.py, without a separate
+interpreter, JSON parse and serialization per file.
+
+With --workers N, files (and files larger than --chunk-mb, split into pieces
+of --chunk-size listings) are normalized and filtered in a pool of N
+processes. Results are combined in file order, so the output is the same as
+a serial run; per-worker throughput is reported on stderr.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from jobstream import write_jobs
+from loader import SCRIPTS_DIR, load_script
+
+normalize_jobs = load_script("normalize-jobs")
+filter_jobs = load_script("filter-jobs")
+deduplicate_jobs = load_script("deduplicate-jobs")
+
+DATA_DIR = SCRIPTS_DIR.parent / "data"
+ATS_SOURCES = ("greenhouse", "lever", "workable", "ashby")
+MANIFEST_SECTIONS = ("ats_files", "api_files", "rss_files")
+
+
+def load_company_names(data_dir=DATA_DIR):
+    """Map ATS slugs to company names from target-companies(.local).json."""
+    for name in ("target-companies.local.json", "target-companies.json"):
+        path = data_dir / name
+        if path.exists():
+            with open(path) as fh:
+                companies = json.load(fh).get("companies", [])
+            return {c.get("slug", ""): c.get("name", "") for c in companies}
+    return {}
+
+
+def manifest_entries(manifest_path):
+    """Return (path, source, company) for each file listed in a manifest."""
+    with open(manifest_path) as fh:
+        manifest = json.load(fh)
+    base = Path(manifest_path).parent
+    entries = []
+    for section in MANIFEST_SECTIONS:
+        for item in manifest.get(section, []):
+            entries.append((base / item["path"], item.get("source", ""), item.get("company", "")))
+    return entries
+
+
+def infer_entry(path, company_names):
+    """Infer (source, company) from a scan file name, or None if unrecognised."""
+    parts = path.stem.split("-", 2)
+    if parts[0] in ATS_SOURCES and len(parts) > 1:
+        slug = path.stem[len(parts[0]) + 1:]
+        return parts[0], company_names.get(slug) or slug
+    if parts[0] == "api" and len(parts) > 1 and parts[1] in normalize_jobs.NORMALIZERS:
+        return parts[1], ""
+    if parts[0] == "rss":
+        return "rss", ""
+    return None
+
+
+def scan_dir_entries(scan_dir, company_names):
+    """Return (path, source, company) for recognised JSON files in scan_dir.
+
+    Files are ordered ATS, then API, then RSS, as the skill's agents merge them.
+    """
+    groups = {"ats": [], "api": [], "rss": []}
+    for path in sorted(Path(scan_dir).glob("*.json")):
+        if path.name == "manifest.json":
+            continue
+        inferred = infer_entry(path, company_names)
+        if inferred is None:
+            print(f"Skipping {path.name}: unrecognised file name", file=sys.stderr)
+            continue
+        source, company = inferred
+        group = "ats" if source in ATS_SOURCES else "rss" if source == "rss" else "api"
+        groups[group].append((path, source, company))
+    return groups["ats"] + groups["api"] + groups["rss"]
+
+
+def process_payload(data, source, company, criteria):
+    """Normalize and filter one parsed API payload. Returns (normalized_count, matches)."""
+    jobs = normalize_jobs.NORMALIZERS[source](data)
+    # Backfill company name if not in API data
+    if company:
+        for job in jobs:
+            if not job["company"]:
+                job["company"] = company
+    return len(jobs), list(filter_jobs.filter_jobs(jobs, **criteria))
+
+
+def process_file(path, source, company, criteria):
+    """Normalize and filter one scan file. Returns (normalized_count, matches)."""
+    with open(path) as fh:
+        raw = fh.read()
+    if not raw.strip():
+        return 0, []
+    return process_payload(json.loads(raw), source, company, criteria)
+
+
+def run_task(task):
+    """Run one unit of work: a scan file, or a parsed piece of a large one.
+
+    Returns (pid, normalized_count, matches, seconds, error). Used both in
+    worker processes and for serial runs, so both share one code path.
+    """
+    kind, target, source, company, criteria = task
+    start = time.perf_counter()
+    try:
+        if kind == "file":
+            count, matches = process_file(target, source, company, criteria)
+        else:
+            count, matches = process_payload(target, source, company, criteria)
+    except (OSError, json.JSONDecodeError) as e:
+        return os.getpid(), 0, [], time.perf_counter() - start, str(e)
+    return os.getpid(), count, matches, time.perf_counter() - start, None
+
+
+def build_tasks(entries, criteria, chunk_bytes, chunk_size):
+    """Turn scan entries into (entry_index, task) pairs.
+
+    Files above chunk_bytes are parsed here and split into pieces of
+    chunk_size listings so one big board can use several workers.
+    """
+    tasks = []
+    for n, (path, source, company) in enumerate(entries):
+        if source not in normalize_jobs.NORMALIZERS:
+            print(f"Skipping {path}: unknown source '{source}'", file=sys.stderr)
+            continue
+        try:
+            large = chunk_bytes and os.path.getsize(path) > chunk_bytes
+            if large:
+                with open(path) as fh:
+                    data = json.load(fh)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+            continue
+        if large:
+            for piece in normalize_jobs.split_payload(data, chunk_size, source):
+                tasks.append((n, ("payload", piece, source, company, criteria)))
+        else:
+            tasks.append((n, ("file", str(path), source, company, criteria)))
+    return tasks
+
+
+def run_tasks(entries, tasks, workers):
+    """Run tasks serially or in a process pool, combining matches in file order.
+
+    Returns (normalized_count, matches, worker_stats).
+    """
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(run_task, [task for _, task in tasks]))
+    else:
+        outcomes = [run_task(task) for _, task in tasks]
+
+    by_entry = defaultdict(list)
+    normalized = 0
+    workers_seen = defaultdict(lambda: {"tasks": 0, "jobs": 0, "seconds": 0.0})
+    for (n, _), (pid, count, matches, seconds, error) in zip(tasks, outcomes):
+        if error:
+            print(f"Skipping {entries[n][0]}: {error}", file=sys.stderr)
+            continue
+        normalized += count
+        by_entry[n].extend(matches)
+        worker = workers_seen[pid]
+        worker["tasks"] += 1
+        worker["jobs"] += count
+        worker["seconds"] += seconds
+
+    matched = []
+    for n in sorted(by_entry):
+        # Sort each file's matches by score, as filter-jobs.py does per file
+        by_entry[n].sort(key=lambda j: j.get("preliminary_relevance_score", 0), reverse=True)
+        matched.extend(by_entry[n])
+
+    worker_stats = []
+    for pid, worker in sorted(workers_seen.items()):
+        seconds = worker["seconds"]
+        worker_stats.append({
+            "pid": pid,
+            "tasks": worker["tasks"],
+            "jobs": worker["jobs"],
+            "seconds": round(seconds, 3),
+            "jobs_per_sec": round(worker["jobs"] / seconds, 1) if seconds else 0,
+        })
+    return normalized, matched, worker_stats
+
+
+def split_list(value):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+def add_filter_arguments(parser):
+    """Add the filter-jobs.py options to an argument parser."""
+    parser.add_argument("--keywords", default="",
+                        help="Comma-separated keywords to match (e.g., 'product,design,UX')")
+    parser.add_argument("--seniority", default="",
+                        help="Comma-separated seniority levels to include (e.g., 'senior,director')")
+    parser.add_argument("--remote-only", action="store_true",
+                        help="Only include remote positions")
+    parser.add_argument("--exclude-keywords", default="",
+                        help="Comma-separated keywords to exclude")
+    parser.add_argument("--min-score", type=float, default=0,
+                        help="Minimum relevance score to include (0-100)")
+
+
+def filter_criteria(args):
+    """Build filter_jobs() keyword arguments from parsed options."""
+    return {
+        "keywords": split_list(args.keywords),
+        "seniorities": split_list(args.seniority),
+        "exclude_kw": split_list(args.exclude_keywords),
+        "remote_only": args.remote_only,
+        "min_score": args.min_score,
+    }
+
+
+def resolve_entries(args):
+    """Pick the files to process from --manifest or --scan-dir."""
+    manifest = Path(args.manifest) if args.manifest else Path(args.scan_dir) / "manifest.json"
+    if manifest.exists():
+        return manifest_entries(manifest)
+    if args.manifest:
+        print(f"Manifest not found: {manifest}", file=sys.stderr)
+        sys.exit(1)
+    return scan_dir_entries(args.scan_dir, load_company_names())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run normalize → filter → dedup over scan files")
+    parser.add_argument("--manifest", default="",
+                        help="Manifest listing the scan files (default: SCAN_DIR/manifest.json if present)")
+    parser.add_argument("--scan-dir", default="data/tmp-scans",
+                        help="Directory of scan files to infer sources from when there is no manifest")
+    parser.add_argument("--output", default="data/merged-results.json",
+                        help="Where to write the deduplicated results ('-' for stdout)")
+    parser.add_argument("--metric", default="ratio", choices=deduplicate_jobs.METRICS,
+                        help="String similarity used by deduplication")
+    parser.add_argument("--simhash", action="store_true",
+                        help="Also merge near-duplicate descriptions (see deduplicate-jobs.py)")
+    parser.add_argument("--max-distance", type=int, default=deduplicate_jobs.DEFAULT_MAX_DISTANCE,
+                        help="Most differing SimHash bits for --simhash")
+    parser.add_argument("--top-k", type=int, default=0,
+                        help="Write only the K best deduplicated jobs")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for normalize + filter (default: 1, no pool)")
+    parser.add_argument("--chunk-mb", type=float, default=4,
+                        help="With --workers, split files larger than this many MB")
+    parser.add_argument("--chunk-size", type=int, default=500,
+                        help="Listings per piece when splitting a large file")
+    add_filter_arguments(parser)
+    args = parser.parse_args()
+    if not 0 <= args.max_distance <= deduplicate_jobs.MAX_DISTANCE:
+        print(f"Error: --max-distance must be between 0 and {deduplicate_jobs.MAX_DISTANCE}", file=sys.stderr)
+        sys.exit(1)
+
+    criteria = filter_criteria(args)
+    entries = resolve_entries(args)
+
+    chunk_bytes = int(args.chunk_mb * 1024 * 1024) if args.workers > 1 else 0
+    tasks = build_tasks(entries, criteria, chunk_bytes, args.chunk_size)
+    start = time.perf_counter()
+    normalized, matched, worker_stats = run_tasks(entries, tasks, args.workers)
+    elapsed = time.perf_counter() - start
+
+    unique, total = deduplicate_jobs.deduplicate(matched, args.metric,
+                                                 max_distance=args.max_distance if args.simhash else None)
+    stats = {
+        "files": len(entries),
+        "normalized": normalized,
+        "matched": total,
+        "total_output": len(unique),
+        "duplicates_removed": total - len(unique),
+    }
+    if args.top_k > 0:
+        stats["written"] = min(args.top_k, len(unique))
+    # Re-sort by relevance score if available, then by source priority
+    unique = deduplicate_jobs.ranked(unique, args.top_k)
+    print(f"Pipeline stats: {json.dumps(stats)}", file=sys.stderr)
+    if args.workers > 1:
+        throughput = {
+            "workers": args.workers,
+            "tasks": len(tasks),
+            "seconds": round(elapsed, 3),
+            "jobs_per_sec": round(normalized / elapsed, 1) if elapsed else 0,
+            "per_worker": worker_stats,
+        }
+        print(f"Worker stats: {json.dumps(throughput)}", file=sys.stderr)
+
+    if args.output == "-":
+        write_jobs(unique, sys.stdout)
+    else:
+        with open(args.output, "w") as fh:
+            write_jobs(unique, fh)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Per-phase timing, counters and profiling behind the scripts' --stats and --profile.
+
+A run is split into the phases read, parse, transform and serialize. Phases
+nest: the stages stream, so pulling the next output job (transform) may read
+and parse more input first. Time is charged to the innermost phase only, so
+the phase times add up to the run's wall time less interpreter startup.
+
+--stats prints one JSON line to stderr when the script finishes:
+    Run stats: {"script": ..., "phases": {...}, "items_in": ..., "items_out": ...,
+                "items_per_sec": ..., "peak_rss_mb": ..., ...}
+--profile FILE also runs cProfile over the transform phase, the hot loop,
+and tracemalloc over the whole run. The cProfile data goes to FILE (read it
+with `python3 -m pstats FILE`). The live allocation sites at the largest
+traced size seen after a transform step go to FILE.tracemalloc.txt.
+
+When neither option is given, RunStats does nothing and wraps nothing.
+"""
+
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PHASES = ("read", "parse", "transform", "serialize")
+HOT_PHASE = "transform"
+TRACEMALLOC_TOP = 25
+# Retake the allocation snapshot when traced memory grows by this factor
+SNAPSHOT_GROWTH = 1.1
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class RunStats:
+    """Phase timer and counters for one script run."""
+
+    def __init__(self, script, enabled=False, profile_path=""):
+        self.script = script
+        self.profile_path = profile_path
+        self.enabled = enabled or bool(profile_path)
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.counts = Counter()
+        self.stack = []
+        self.start = self.mark = time.perf_counter()
+        self.profiler = cProfile.Profile() if profile_path else None
+        self.snapshot = None
+        self.snapshot_size = 0
+        if profile_path:
+            tracemalloc.start()
+
+    @staticmethod
+    def add_arguments(parser):
+        """Add --stats and --profile to a script's argument parser."""
+        parser.add_argument("--stats", action="store_true",
+                            help="Print per-phase timings, item counts and peak memory as JSON to stderr")
+        parser.add_argument("--profile", default="", metavar="FILE",
+                            help="Write cProfile data for the transform loop to FILE and "
+                                 "tracemalloc top allocations to FILE.tracemalloc.txt")
+
+    @classmethod
+    def from_args(cls, script, args):
+        return cls(script, args.stats, args.profile)
+
+    def _switch(self, old, new):
+        """Charge time since the last switch to old, and profile only the hot phase."""
+        now = time.perf_counter()
+        if old is not None:
+            self.times[old] += now - self.mark
+        self.mark = now
+        if self.profiler and (old == HOT_PHASE) != (new == HOT_PHASE):
+            if new == HOT_PHASE:
+                self.profiler.enable()
+            else:
+                self.profiler.disable()
+                self.snapshot_if_grown()
+
+    def snapshot_if_grown(self):
+        """Keep an allocation snapshot from near the traced peak."""
+        current = tracemalloc.get_traced_memory()[0]
+        if current > self.snapshot_size * SNAPSHOT_GROWTH:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def enter(self, name):
+        self._switch(self.stack[-1] if self.stack else None, name)
+        self.stack.append(name)
+
+    def leave(self):
+        name = self.stack.pop()
+        self._switch(name, self.stack[-1] if self.stack else None)
+
+    def phase(self, name):
+        """Context manager timing a block as phase name."""
+        return self._phase(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _phase(self, name):
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.leave()
+
+    def timed(self, iterable, name, count=None):
+        """Charge each step of iterable to phase name, counting items under count."""
+        if not self.enabled:
+            return iterable
+        return self._timed(iterable, name, count)
+
+    def _timed(self, iterable, name, count):
+        iterator = iter(iterable)
+        while True:
+            self.enter(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.leave()
+            if count:
+                self.counts[count] += 1
+            yield item
+
+    def count(self, key, n=1):
+        if self.enabled:
+            self.counts[key] += n
+
+    def report(self):
+        """Print the stats line and write any profile output."""
+        if not self.enabled:
+            return
+        wall = time.perf_counter() - self.start
+        items_in = self.counts.pop("items_in", 0)
+        items_out = self.counts.pop("items_out", 0)
+        stats = {
+            "script": self.script,
+            "wall_seconds": round(wall, 4),
+            "phases": {name: round(seconds, 4) for name, seconds in self.times.items()},
+            "items_in": items_in,
+            "items_out": items_out,
+            "items_per_sec": round(items_in / wall, 1) if wall else 0,
+            **self.counts,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        if self.profiler:
+            self.profiler.dump_stats(self.profile_path)
+            stats["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+            self.write_allocations(f"{self.profile_path}.tracemalloc.txt")
+            tracemalloc.stop()
+        print(f"Run stats: {json.dumps(stats)}", file=sys.stderr)
+
+    def write_allocations(self, path):
+        snapshot = self.snapshot or tracemalloc.take_snapshot()
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                           tracemalloc.Filter(False, cProfile.__file__)])
+        peak = tracemalloc.get_traced_memory()[1]
+        with open(path, "w") as fh:
+            fh.write(f"# {self.script}: {self.snapshot_size / 1e6:.1f} MB traced at snapshot, "
+                     f"peak {peak / 1e6:.1f} MB\n")
+            for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]:
+                fh.write(f"{stat}\n")
@@ -12,6 +12,11 @@
 
 set -euo pipefail
 
+# JOB_MATCHER_HTTP_CACHE=1 sends requests through the shared response cache (http-cache.py)
+if [ "${JOB_MATCHER_HTTP_CACHE:-}" = "1" ]; then
+  curl() { python3 "$(dirname "$0")/http-cache.py" curl "$@"; }
+fi
+
 SLUG="${1:-}"
 
 if [ -z "$SLUG" ]; then
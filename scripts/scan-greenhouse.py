@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Scan a Greenhouse board in two phases: list without content, fetch bodies for matches.
+
+Usage:
+    python3 scripts/scan-greenhouse.py stripe --company Stripe \\
+        --keywords "product,design" --seniority "senior,director" --exclude-keywords "intern"
+    python3 scripts/scan-greenhouse.py gitlab --keywords "data" --min-score 40 --format ndjson
+    python3 scripts/scan-greenhouse.py acme --keywords "design" --base-url http://127.0.0.1:8000
+
+Gives the same jobs as
+
+    scan-greenhouse.sh SLUG --content | normalize-jobs.py --source greenhouse --company NAME |
+        filter-jobs.py [filter options]
+
+without downloading every posting's HTML. The board is listed without
+content and normalized; jobs that filter-jobs.py would drop whatever their
+description says (remote, seniority, an excluded word in the title, or a
+best-case score under --min-score) are dropped there. The rest are fetched
+one by one from /v1/boards/SLUG/jobs/ID over keep-alive connections,
+normalized with their content and filtered as usual. Bytes downloaded and
+HTML stripping then grow with the matches, not the board.
+
+A job whose content cannot be fetched is scored on its title alone and
+counted in the stats line. Both phases go through the response cache in
+data/http-cache/ (see httpcache.py), so a rescan fetches only new or
+changed postings.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from httpcache import add_cache_arguments, cache_from_args
+from httppool import HTTPPool
+from jobstream import TEXT_FORMATS, write_jobs
+from loader import load_script
+
+normalize_jobs = load_script("normalize-jobs")
+filter_jobs = load_script("filter-jobs")
+run_pipeline = load_script("run-pipeline")
+
+BOARD_URL = "https://boards-api.greenhouse.io/v1/boards/{slug}/jobs"
+JOB_URL = "https://boards-api.greenhouse.io/v1/boards/{slug}/jobs/{id}"
+
+
+def fetch_json(pool, url):
+    """GET url and parse it as JSON. Returns (value, error message)."""
+    response = pool.request(url)
+    if response.status != 200:
+        return None, f"HTTP {response.status}" if response.status else response.error
+    try:
+        return json.loads(response.body), ""
+    except ValueError as e:
+        return None, f"bad JSON: {e}"
+
+
+def with_content(listing, job):
+    """The board listing with the content and departments of its single-job response."""
+    merged = dict(listing)
+    if isinstance(job, dict):
+        for key in ("content", "departments", "offices"):
+            if key in job:
+                merged[key] = job[key]
+    return merged
+
+
+def scan(pool, slug, criteria, workers=8):
+    """Return (raw listings with content for the candidates, stats)."""
+    board, error = fetch_json(pool, BOARD_URL.format(slug=quote(slug)))
+    if error or not isinstance(board, dict) or not isinstance(board.get("jobs"), list):
+        raise RuntimeError(error or "unexpected board response")
+    listings = [job for job in board["jobs"] if isinstance(job, dict)]
+    # One normalized job per listing, so the survivors map back to listings
+    normalized = normalize_jobs.normalize_greenhouse(listings)
+    kept = {id(job) for job in filter_jobs.title_prefilter(normalized, **criteria)}
+    candidates = [listing for listing, job in zip(listings, normalized) if id(job) in kept]
+
+    def fetch(listing):
+        url = JOB_URL.format(slug=quote(slug), id=quote(str(listing.get("id", ""))))
+        job, error = fetch_json(pool, url)
+        if error:
+            print(f"Greenhouse {slug} job {listing.get('id')}: {error}", file=sys.stderr)
+            return listing, False
+        return with_content(listing, job), True
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        fetched = list(executor.map(fetch, candidates))
+    stats = {
+        "listed": len(listings),
+        "candidates": len(candidates),
+        "content_failed": sum(1 for _, ok in fetched if not ok),
+    }
+    return [listing for listing, _ in fetched], stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Two-phase Greenhouse board scan")
+    parser.add_argument("slug", help="Greenhouse board slug")
+    parser.add_argument("--company", default="", help="Company name to fill in if the API omits it")
+    parser.add_argument("--format", default="json", choices=TEXT_FORMATS,
+                        help="Output format: JSON array (default) or one job per line")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent job content requests")
+    parser.add_argument("--per-host", type=int, default=8, help="Concurrent requests per host")
+    parser.add_argument("--timeout", type=float, default=20, help="Socket timeout in seconds")
+    parser.add_argument("--retries", type=int, default=3, help="Retries for errors, 429 and 5xx")
+    parser.add_argument("--base-url", default="",
+                        help="Send every request to this server instead (e.g., bench/ats-stand-in.py)")
+    run_pipeline.add_filter_arguments(parser)
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    criteria = run_pipeline.filter_criteria(args)
+    try:
+        cache = cache_from_args(args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    pool = HTTPPool(args.per_host, args.timeout, args.retries, base_url=args.base_url, cache=cache)
+    start = time.perf_counter()
+    try:
+        listings, stats = scan(pool, args.slug, criteria, args.workers)
+    except RuntimeError as e:
+        print(f"Greenhouse {args.slug}: {e}", file=sys.stderr)
+        write_jobs([], sys.stdout, args.format)
+        return
+    finally:
+        pool.close()
+        if cache is not None:
+            cache.close()
+
+    jobs = normalize_jobs.normalize_greenhouse(listings)
+    for job in jobs:
+        if args.company and not job["company"]:
+            job["company"] = args.company
+    results = filter_jobs.filter_jobs(jobs, **criteria)
+    if args.format != "ndjson":
+        results = filter_jobs.best_first(results)
+    results = list(results)
+
+    stats.update({
+        "matched": len(results),
+        "requests": pool.stats["requests"],
+        "bytes": pool.stats["bytes"],
+        "seconds": round(time.perf_counter() - start, 3),
+    })
+    if cache is not None:
+        stats["cache"] = cache.summary()
+    print(f"Scan stats: {json.dumps(stats)}", file=sys.stderr)
+    write_jobs(results, sys.stdout, args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,11 @@
 
 set -euo pipefail
 
+# JOB_MATCHER_HTTP_CACHE=1 sends requests through the shared response cache (http-cache.py)
+if [ "${JOB_MATCHER_HTTP_CACHE:-}" = "1" ]; then
+  curl() { python3 "$(dirname "$0")/http-cache.py" curl "$@"; }
+fi
+
 LIMIT="200"
 
 while [[ $# -gt 0 ]]; do
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Threshold-aware string similarity used by deduplicate-jobs.py.
+
+Callers only need a yes/no answer against a fixed threshold, so similar()
+rejects pairs with cheap upper bounds before doing any alignment work:
+
+    1. length ratio       2 * min(len_a, len_b) / (len_a + len_b)
+    2. character multiset 2 * shared_chars / (len_a + len_b)
+    3. bit-parallel LCS   2 * lcs / (len_a + len_b), abandoned early once
+                          the threshold is out of reach
+
+Each bound is >= SequenceMatcher.ratio(), so a rejection never changes a
+decision. With the default "ratio" metric, pairs that survive all three are
+settled by difflib itself; "lcs" accepts on the LCS bound alone and "jaccard"
+compares token sets.
+"""
+
+import re
+from difflib import SequenceMatcher
+
+
+METRICS = ("ratio", "lcs", "jaccard")
+
+
+def lcs_length(a, b, needed=0):
+    """Length of the longest common subsequence of a and b.
+
+    Bit-parallel over the characters of the longer string (Hyyro, 2004). If
+    the result cannot reach `needed`, returns early with an upper bound that
+    is already below it.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+    masks = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    v = full
+    for step, ch in enumerate(b, 1):
+        u = v & masks.get(ch, 0)
+        v = ((v + u) | (v - u)) & full
+        # Each remaining character can add at most one to the LCS
+        if needed and not step % 8:
+            bound = len(a) - bin(v).count("1") + len(b) - step
+            if bound < needed:
+                return bound
+    return len(a) - bin(v).count("1")
+
+
+def char_overlap(a, b):
+    """Number of characters a and b share, counted as multisets."""
+    return sum(min(a.count(ch), b.count(ch)) for ch in set(a))
+
+
+def token_set(text):
+    """Split text into its set of lowercase alphanumeric tokens."""
+    return set(re.findall(r'[a-z0-9]+', (text or "").lower()))
+
+
+def jaccard(a, b):
+    """Token-set Jaccard similarity of two strings."""
+    tokens_a = token_set(a)
+    tokens_b = token_set(b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+def similar(a, b, threshold, metric="ratio"):
+    """Check whether a and b reach threshold under the given metric."""
+    if not a or not b:
+        return False
+    if metric == "jaccard":
+        return jaccard(a, b) >= threshold
+    if a == b:
+        return True
+
+    # Same arithmetic as SequenceMatcher.ratio(), so bounds compare exactly
+    total = len(a) + len(b)
+    if 2.0 * min(len(a), len(b)) / total < threshold:
+        return False
+    if 2.0 * char_overlap(a, b) / total < threshold:
+        return False
+    needed = threshold * total / 2
+    if 2.0 * lcs_length(a, b, needed) / total < threshold:
+        return False
+    if metric == "lcs":
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= threshold
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Verify many job listing URLs concurrently, with a cache of recent verdicts.
+
+Usage:
+    python3 scripts/verify-urls.py < data/merged-results.json > data/verified-results.json
+    python3 scripts/verify-urls.py "https://jobs.example.com/1" "https://jobs.example.com/2"
+
+Applies the checks in verify-url.sh to every job whose verification_status
+is not GUARANTEED, and sets verification_status to VERIFIED, EXPIRED or
+UNVERIFIABLE (with the reason in verification_reason). EXPIRED jobs are
+dropped unless --keep-expired is given. With URL arguments instead of stdin,
+prints one {url, status, http_code, reason} object per line.
+
+Each URL is fetched once, following redirects: the final status, the final
+URL and the page body all come from that one GET. Requests run in a thread
+pool, at most --per-host at a time and --min-interval seconds apart per host.
+VERIFIED and EXPIRED verdicts are kept in --cache for --ttl hours, so a re-run
+only fetches new URLs; UNVERIFIABLE ones are retried every run.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import jobstream
+from httppool import HTTPPool
+from loader import SCRIPTS_DIR
+
+DATA_DIR = SCRIPTS_DIR.parent / "data"
+DEFAULT_CACHE = DATA_DIR / "verify-cache.json"
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+MAX_REDIRECTS = 5
+
+# In priority order: the first phrase present is the one reported
+EXPIRED_PHRASES = [
+    "no longer available",
+    "no longer accepting",
+    "position has been filled",
+    "position filled",
+    "this job has been closed",
+    "this job is closed",
+    "this role has been filled",
+    "this posting has expired",
+    "this listing has expired",
+    "applications are closed",
+    "applications are no longer being accepted",
+    "this job has expired",
+    "this opportunity is closed",
+    "this position is no longer available",
+    "job not found",
+    "the position you are looking for is no longer",
+    "this role is no longer open",
+]
+# One pass over the body finds every phrase, overlapping ones included
+PHRASE_RE = re.compile(b"(?=(" + b"|".join(re.escape(p.encode()) for p in EXPIRED_PHRASES) + b"))")
+PHRASE_INDEX = {p.encode(): i for i, p in enumerate(EXPIRED_PHRASES)}
+CAREERS_PAGE_RE = re.compile(r"/careers/?$|/jobs/?$|/openings/?$")
+CACHED_STATUSES = ("VERIFIED", "EXPIRED")
+
+
+def expired_phrase(body):
+    """Return the highest-priority expired phrase in body (ASCII case-insensitive), or None."""
+    found = {PHRASE_INDEX[m.group(1)] for m in PHRASE_RE.finditer(body.lower())}
+    return EXPIRED_PHRASES[min(found)] if found else None
+
+
+def verdict(url, status, reason, http_code):
+    return {"url": url, "status": status, "http_code": http_code, "reason": reason}
+
+
+def classify(url, response):
+    """Turn one followed GET into a verify-url.sh verdict."""
+    code = response.status
+    if code in (404, 410):
+        return verdict(url, "EXPIRED", f"HTTP {code} response", code)
+    if code in (0, 403):
+        return verdict(url, "UNVERIFIABLE", "Connection failed or access denied", code)
+    if code not in (200, 301, 302):
+        return verdict(url, "UNVERIFIABLE", "Unexpected HTTP status", code)
+    if not response.body.rstrip(b"\n"):
+        return verdict(url, "UNVERIFIABLE", "Empty response body", code)
+    phrase = expired_phrase(response.body)
+    if phrase:
+        return verdict(url, "EXPIRED", f"Page contains: {phrase}", code)
+    if response.url != url and CAREERS_PAGE_RE.search(response.url):
+        return verdict(url, "EXPIRED", f"Redirected to generic careers page: {response.url}", code)
+    return verdict(url, "VERIFIED", "Page loads with no expired indicators", code)
+
+
+def verify_url(pool, url):
+    response = pool.request(url, headers={"User-Agent": USER_AGENT}, max_redirects=MAX_REDIRECTS)
+    return classify(url, response)
+
+
+class VerdictCache:
+    """JSON file of recent verdicts keyed by URL, each stamped with its check time."""
+
+    def __init__(self, path, ttl_hours):
+        self.path = Path(path)
+        self.ttl = ttl_hours * 3600
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path) as fh:
+                    self.entries = json.load(fh)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Ignoring unreadable verify cache {self.path}: {e}", file=sys.stderr)
+
+    def get(self, url, now):
+        entry = self.entries.get(url)
+        if entry and now - entry.get("checked_at", 0) < self.ttl:
+            return verdict(url, entry["status"], entry["reason"], entry["http_code"])
+        return None
+
+    def put(self, result, now):
+        if result["status"] in CACHED_STATUSES:
+            self.entries[result["url"]] = {"status": result["status"], "http_code": result["http_code"],
+                                           "reason": result["reason"], "checked_at": now}
+
+    def save(self, now):
+        """Write the cache back, dropping entries older than the TTL."""
+        live = {url: entry for url, entry in self.entries.items()
+                if now - entry.get("checked_at", 0) < self.ttl}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w") as fh:
+            json.dump(live, fh, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def verify_all(urls, pool, workers, cache=None):
+    """Verify distinct URLs concurrently. Returns ({url: verdict}, cached count)."""
+    now = time.time()
+    results = {}
+    pending = []
+    for url in dict.fromkeys(urls):
+        cached = cache.get(url, now) if cache else None
+        if cached:
+            results[url] = cached
+        else:
+            pending.append(url)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(lambda u: verify_url(pool, u), pending):
+            results[result["url"]] = result
+            if cache:
+                cache.put(result, now)
+    return results, len(results) - len(pending)
+
+
+def needs_check(job):
+    return job.get("verification_status") != "GUARANTEED" and job.get("url")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify job listing URLs concurrently")
+    parser.add_argument("urls", nargs="*", help="URLs to check (otherwise jobs are read from stdin)")
+    parser.add_argument("--format", choices=jobstream.FORMATS, default="json",
+                        help="Job input/output format (default: json)")
+    parser.add_argument("--keep-expired", action="store_true", help="Keep EXPIRED jobs in the output")
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE), help="Verdict cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Check every URL, ignoring the cache")
+    parser.add_argument("--ttl", type=float, default=24, help="Hours a cached verdict stays valid")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent requests overall")
+    parser.add_argument("--per-host", type=int, default=2, help="Concurrent requests per host")
+    parser.add_argument("--min-interval", type=float, default=0.5,
+                        help="Minimum seconds between request starts to one host")
+    parser.add_argument("--timeout", type=float, default=15, help="Socket timeout in seconds")
+    parser.add_argument("--retries", type=int, default=1, help="Retries for errors, 429 and 5xx")
+    parser.add_argument("--base-url", default="",
+                        help="Send every request to this server instead (e.g., a local stand-in)")
+    args = parser.parse_args()
+
+    jobs = None if args.urls else list(jobstream.read_jobs(sys.stdin, args.format))
+    urls = args.urls or [job["url"] for job in jobs if needs_check(job)]
+    cache = None if args.no_cache else VerdictCache(args.cache, args.ttl)
+    pool = HTTPPool(args.per_host, args.timeout, args.retries, 0.5, args.base_url, args.min_interval)
+    start = time.perf_counter()
+    results, cached = verify_all(urls, pool, args.workers, cache)
+    elapsed = time.perf_counter() - start
+    pool.close()
+    if cache:
+        cache.save(time.time())
+
+    if jobs is None:
+        for url in args.urls:
+            print(json.dumps(results[url]))
+    else:
+        kept = []
+        for job in jobs:
+            if needs_check(job):
+                result = results[job["url"]]
+                if result["status"] == "EXPIRED" and not args.keep_expired:
+                    continue
+                job["verification_status"] = result["status"]
+                job["verification_reason"] = result["reason"]
+            kept.append(job)
+        jobstream.write_jobs(kept, sys.stdout, args.format)
+
+    counts = {status.lower(): 0 for status in ("VERIFIED", "EXPIRED", "UNVERIFIABLE")}
+    for result in results.values():
+        counts[result["status"].lower()] += 1
+    stats = {"urls": len(results), "cached": cached, "fetched": len(results) - cached, **counts,
+             "connections": pool.stats["connections"], "seconds": round(elapsed, 3)}
+    print(f"Verify stats: {json.dumps(stats)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()